@@ -1,51 +1,210 @@
 import sys
+import time
+
+_STARTED = time.perf_counter()
+
+if __name__ == "__main__" and len(sys.argv) > 1:
+    from scaffolder.cli import main
+    sys.exit(main())
+
 import os
-import shutil
-import subprocess
-import textwrap
-import platform
-import webbrowser
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QComboBox, QLineEdit, QPushButton, QFileDialog, QCheckBox,
-    QMessageBox, QScrollArea, QGroupBox, QFrame, QMenuBar, QAction,
-    QTextBrowser
+    QMessageBox, QGroupBox, QFrame, QMenuBar, QAction,
+    QPlainTextEdit, QProgressBar, QTabWidget, QTreeWidget, QTreeWidgetItem, QToolButton, QListView
 )
 from PyQt5.QtGui import QFont, QPalette, QColor, QIcon
-from PyQt5.QtCore import Qt, QUrl
-
-TEMPLATES = {
-    "Python Script": "python_script",
-    "Flask Web App (Flask + SQLAlchemy)": "flask_sqlalchemy",
-    "FastAPI Web App": "fastapi",
-    "Django Web App": "django",
-    "Data Science Project (Jupyter)": "datascience",
-    "Machine Learning (scikit-learn)": "ml_sklearn",
-    "Tkinter Desktop App": "tkinter",
-    "PyQt5 Desktop App": "pyqt5",
-    "Kivy Mobile App": "kivy",
-    "Pygame Project": "pygame",
-    "CLI Tool (Click)": "cli_click",
-}
-
-EXTRA_FILES = ["README.md", "LICENSE", ".gitignore", "pyproject.toml", "Dockerfile", "setup.py", "Makefile"]
-ADDITIONAL_LIBS = [
-    "numpy", "pandas", "scipy", "scikit-learn", "matplotlib", "seaborn",
-    "plotly", "polars", "requests", "beautifulsoup4", "sqlalchemy",
-    "pillow", "pytest", "black", "flake8", "click", "uvicorn",
-    "fastapi", "jupyter", "ipython", "PyYAML", "h5py",
-    "statsmodels", "lightgbm", "xgboost", "bokeh", "altair", "plotnine",
-    "geoplotlib", "river", "gensim", "nltk", "spacy", "langchain",
-    "hydra", "dask", "duckdb", "cuPy", "scrapy", "paramiko", "lxml",
-    "httpx", "typer", "sphinx", "ruff", "glom", "rich", "textual",
-    "networkx", "python-igraph", "graph-tool", "pygame", "opencv",
-    "manim", "scikit-image", "bokeh"
-]
+from PyQt5.QtCore import Qt, QObject, QThread, QTimer, pyqtSignal, QAbstractListModel, QModelIndex
+
+# El motor (subprocess, hashlib, concurrent.futures...) se importa recién al generar
+from scaffolder.templates import REGISTRY, TEMPLATES, EXTRA_FILES, ADDITIONAL_LIBS
+
+# Segundos máximos hasta mostrar la ventana; con SCAFFOLDER_STARTUP_CHECK=1 la app se cierra tras medirlo
+STARTUP_BUDGET = float(os.environ.get("SCAFFOLDER_STARTUP_BUDGET", "0.5"))
+
+
+class GenerationWorker(QThread):
+    """Ejecuta la generación fuera del hilo de la interfaz y reporta el progreso"""
+    output = pyqtSignal(str)
+    planned = pyqtSignal(int)
+    step_started = pyqtSignal(str)
+    step_finished = pyqtSignal(str, float)
+    warning = pyqtSignal(str)
+    succeeded = pyqtSignal()
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, options, parent=None):
+        super().__init__(parent)
+        from scaffolder.engine import ProjectGenerator
+
+        self.options = options
+        self.generator = ProjectGenerator(
+            options,
+            on_output=self.output.emit,
+            on_step_start=self.step_started.emit,
+            on_step_finish=self.step_finished.emit,
+            on_warning=self.warning.emit,
+            on_plan=self.planned.emit,
+        )
+
+    def cancel(self):
+        self.generator.cancel()
+
+    def run(self):
+        from scaffolder.engine import GenerationCancelled
+
+        try:
+            self.generator.run()
+            self.succeeded.emit()
+        except GenerationCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(f"No se pudo generar el proyecto: {str(e)}\n\nDetalles: {type(e).__name__}")
+
+
+class PackageListModel(QAbstractListModel):
+    """Lista virtualizada de paquetes con casilla; solo guarda los nombres del resultado actual"""
+    selection_changed = pyqtSignal()
+
+    def __init__(self, index, parent=None):
+        super().__init__(parent)
+        from scaffolder.pkgindex import normalize_name
+
+        self.package_index = index
+        self.normalize = normalize_name
+        self.names = []
+        self.selected = {}
+
+    def set_query(self, query):
+        self.set_results(query, self.package_index.search(query))
+
+    def set_results(self, query, names):
+        if not query.strip():
+            seen = {self.normalize(name) for name in names}
+            names = names + [name for key, name in self.selected.items() if key not in seen]
+        elif not names:
+            names = [query.strip()]
+        self.beginResetModel()
+        self.names = names
+        self.endResetModel()
+
+    def selected_names(self):
+        return list(self.selected.values())
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.names)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        name = self.names[index.row()]
+        if role == Qt.DisplayRole:
+            info = self.package_index.info(name)
+            if info and info.get("version"):
+                return f"{name}  {info['version']}" + ("" if info.get("wheel") else "  (sin wheel)")
+            return name
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if self.normalize(name) in self.selected else Qt.Unchecked
+        if role == Qt.ToolTipRole:
+            info = self.package_index.info(name)
+            if not info:
+                return f"{name}: sin datos de versión en el índice local"
+            wheel = "publica wheels" if info.get("wheel") else "solo código fuente (se compila al instalar)"
+            return f"{name} {info.get('version') or '?'}: {wheel}"
+        return None
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid():
+            return False
+        name = self.names[index.row()]
+        if value == Qt.Checked:
+            self.selected[self.normalize(name)] = name
+        else:
+            self.selected.pop(self.normalize(name), None)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        self.selection_changed.emit()
+        return True
+
+
+class PackageSearcher(QObject):
+    """Busca en el índice de paquetes en un hilo propio para que escribir no trabe la interfaz.
+
+    Si llegan consultas mientras busca, al terminar atiende solo la última.
+    """
+    results = pyqtSignal(str, list)
+
+    def __init__(self, index, parent=None):
+        super().__init__(parent)
+        import threading
+
+        self.index = index
+        self._pending = None
+        self._condition = threading.Condition()
+        threading.Thread(target=self._run, name="scaffolder-search", daemon=True).start()
+
+    def search(self, query):
+        with self._condition:
+            self._pending = query
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None:
+                    self._condition.wait()
+                query, self._pending = self._pending, None
+            self.results.emit(query, self.index.search(query))
+
+
+class IndexLoader(QObject):
+    """Carga el índice local de paquetes y lo actualiza si está vencido, fuera del hilo de la interfaz.
+
+    Usa un hilo daemon para que una descarga lenta no demore el cierre de la aplicación.
+    """
+    status = pyqtSignal(str)
+    loaded = pyqtSignal()
+
+    def __init__(self, index, parent=None):
+        super().__init__(parent)
+        self.index = index
+
+    def start(self):
+        import threading
+
+        threading.Thread(target=self.run, name="scaffolder-index", daemon=True).start()
+
+    def run(self):
+        self.index.load()
+        self.loaded.emit()
+        if not self.index.needs_refresh():
+            self.status.emit(self._summary())
+            return
+        self.status.emit(f"{self._summary()} Actualizando desde {self.index.index_url}...")
+        try:
+            self.index.refresh()
+        except Exception as e:
+            self.status.emit(f"{self._summary()} No se pudo actualizar el índice: {e}")
+            return
+        self.loaded.emit()
+        self.status.emit(self._summary())
+
+    def _summary(self):
+        age = self.index.age()
+        if age is None:
+            return "Índice local vacío: solo se muestran las librerías sugeridas."
+        return f"{len(self.index)} paquetes en el índice local (actualizado hace {age / 86400:.0f} días)."
 
 
 class AboutDialog(QMessageBox):
     def __init__(self, parent=None):
         super().__init__(parent)
+        import platform
+
         self.setWindowTitle("Acerca de Python Port-Scaffolder")
         self.setTextFormat(Qt.RichText)
         self.setIcon(QMessageBox.Information)
@@ -81,6 +240,7 @@ class Scaffolder(QMainWindow):
         self.setWindowTitle("Python Port-Scaffolder")
         self.setMinimumSize(850, 700)
         self.setWindowIcon(QIcon("icon.ico"))
+        self.worker = None
         self._init_ui()
         self.apply_light_theme()
 
@@ -129,6 +289,13 @@ class Scaffolder(QMainWindow):
         self.type_combo.addItems(TEMPLATES.keys())
         self.type_combo.setMinimumHeight(30)
         type_layout.addWidget(self.type_combo, 1)
+        self.profile_label = QLabel("Perfil:")
+        type_layout.addWidget(self.profile_label)
+        self.profile_combo = QComboBox()
+        self.profile_combo.setMinimumHeight(30)
+        type_layout.addWidget(self.profile_combo)
+        self.type_combo.currentTextChanged.connect(self.update_profiles)
+        self.update_profiles(self.type_combo.currentText())
         config_layout.addLayout(type_layout)
 
         name_layout = QHBoxLayout()
@@ -161,6 +328,10 @@ class Scaffolder(QMainWindow):
         self.git_chk = QCheckBox("Inicializar repositorio Git")
         self.git_chk.setChecked(True)
         env_layout.addWidget(self.git_chk)
+        self.commit_chk = QCheckBox("Commit inicial")
+        self.commit_chk.setToolTip("Crea el primer commit con los archivos generados (sin el venv ni lo ignorado)")
+        self.git_chk.toggled.connect(self.commit_chk.setEnabled)
+        env_layout.addWidget(self.commit_chk)
         config_layout.addLayout(env_layout)
         
         config_group.setLayout(config_layout)
@@ -190,39 +361,58 @@ class Scaffolder(QMainWindow):
         libs_layout = QVBoxLayout()
         libs_layout.setSpacing(5)
         
-        self.lib_checks = []
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll_widget = QWidget()
-        scroll_layout = QVBoxLayout(scroll_widget)
-        scroll_layout.setSpacing(5)
-        
-        col_layout = QHBoxLayout()
-        left_col = QVBoxLayout()
-        right_col = QVBoxLayout()
-        
-        half = len(ADDITIONAL_LIBS) // 2
-        for i, lib in enumerate(ADDITIONAL_LIBS):
-            chk = QCheckBox(lib)
-            chk.setChecked(False)
-            self.lib_checks.append(chk)
-            if i < half:
-                left_col.addWidget(chk)
-            else:
-                right_col.addWidget(chk)
-                
-        col_layout.addLayout(left_col)
-        col_layout.addLayout(right_col)
-        scroll_layout.addLayout(col_layout)
-        
-        scroll.setWidget(scroll_widget)
-        libs_layout.addWidget(scroll)
+        self.package_model = None
+        self.libs_picker = None
+        self.libs_toggle = QToolButton()
+        self.libs_toggle.setCheckable(True)
+        self.libs_toggle.setArrowType(Qt.RightArrow)
+        self.libs_toggle.setToolButtonStyle(Qt.ToolButtonTextBesideIcon)
+        self.libs_toggle.setText("Mostrar librerías")
+        self.libs_toggle.toggled.connect(self.toggle_libs)
+        libs_layout.addWidget(self.libs_toggle)
+        libs_layout.addStretch(1)
+        self.libs_layout = libs_layout
         libs_group.setLayout(libs_layout)
         bottom_layout.addWidget(libs_group, 2)
         
         layout.addLayout(bottom_layout, 1)
 
-        gen_btn = QPushButton("Generar Proyecto")
+        progress_group = QGroupBox("Progreso")
+        progress_layout = QVBoxLayout()
+        progress_layout.setSpacing(5)
+
+        progress_row = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setMinimumHeight(25)
+        self.progress_bar.setValue(0)
+        progress_row.addWidget(self.progress_bar, 1)
+        self.cancel_btn = QPushButton("Cancelar")
+        self.cancel_btn.setMinimumHeight(25)
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel_generation)
+        progress_row.addWidget(self.cancel_btn)
+        progress_layout.addLayout(progress_row)
+
+        self.log_view = QPlainTextEdit()
+        self.log_view.setReadOnly(True)
+        self.log_view.setMaximumBlockCount(5000)
+        self.log_view.setFont(QFont("Consolas", 9))
+        self.log_view.setMinimumHeight(120)
+
+        self.timings_view = QTreeWidget()
+        self.timings_view.setHeaderLabels(["Paso", "Tiempo (s)", "% del total", "Detalle"])
+        self.timings_view.setRootIsDecorated(True)
+        self.timings_view.setColumnWidth(0, 280)
+
+        self.progress_tabs = QTabWidget()
+        self.progress_tabs.addTab(self.log_view, "Registro")
+        self.progress_tabs.addTab(self.timings_view, "Tiempos de la última ejecución")
+        progress_layout.addWidget(self.progress_tabs)
+
+        progress_group.setLayout(progress_layout)
+        layout.addWidget(progress_group)
+
+        self.gen_btn = gen_btn = QPushButton("Generar Proyecto")
         gen_btn.setMinimumHeight(40)
         gen_btn.setStyleSheet("""
             QPushButton {
@@ -237,12 +427,87 @@ class Scaffolder(QMainWindow):
             QPushButton:pressed {
                 background-color: #1a5ca0;
             }
+            QPushButton:disabled {
+                background-color: #9bbfe6;
+            }
         """)
         gen_btn.clicked.connect(self.generate_project)
         layout.addWidget(gen_btn)
 
         self.setCentralWidget(central)
 
+    def _build_package_picker(self):
+        """Crea el buscador de paquetes la primera vez que se despliega"""
+        from scaffolder.pkgindex import PackageIndex
+
+        picker = QWidget()
+        picker_layout = QVBoxLayout(picker)
+        picker_layout.setContentsMargins(0, 0, 0, 0)
+        picker_layout.setSpacing(5)
+
+        self.package_search = QLineEdit()
+        self.package_search.setPlaceholderText("Buscar paquetes (ej. requests, sklearn)...")
+        self.package_search.setClearButtonEnabled(True)
+        picker_layout.addWidget(self.package_search)
+
+        self.package_model = PackageListModel(PackageIndex(seed=ADDITIONAL_LIBS), self)
+        self.package_model.selection_changed.connect(self._update_libs_toggle)
+        self.package_model.set_query("")
+        view = QListView()
+        view.setModel(self.package_model)
+        view.setUniformItemSizes(True)
+        view.setLayoutMode(QListView.Batched)
+        picker_layout.addWidget(view, 1)
+
+        self.package_status = QLabel("Cargando índice de paquetes...")
+        self.package_status.setWordWrap(True)
+        self.package_status.setStyleSheet("color: #666;")
+        picker_layout.addWidget(self.package_status)
+
+        # Espera a que se deje de escribir un momento antes de filtrar
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(120)
+        self.search_timer.timeout.connect(self._run_package_search)
+        self.package_search.textChanged.connect(self.search_timer.start)
+
+        self.package_searcher = PackageSearcher(self.package_model.package_index, self)
+        self.package_searcher.results.connect(self._show_package_results)
+
+        self.index_loader = IndexLoader(self.package_model.package_index, self)
+        self.index_loader.status.connect(self.package_status.setText)
+        self.index_loader.loaded.connect(self._run_package_search)
+        self.index_loader.start()
+
+        self.libs_layout.takeAt(1)
+        self.libs_layout.addWidget(picker, 1)
+        self.libs_picker = picker
+
+    def _run_package_search(self):
+        self.package_searcher.search(self.package_search.text())
+
+    def _show_package_results(self, query, names):
+        # Descarta resultados de una consulta que el usuario ya cambió
+        if query == self.package_search.text():
+            self.package_model.set_results(query, names)
+
+    def selected_libs(self):
+        return self.package_model.selected_names() if self.package_model else []
+
+    def _update_libs_toggle(self):
+        if self.libs_toggle.isChecked():
+            self.libs_toggle.setText(f"Ocultar librerías ({len(self.selected_libs())} seleccionadas)")
+        else:
+            self.libs_toggle.setText(f"Mostrar librerías ({len(self.selected_libs())} seleccionadas)")
+
+    def toggle_libs(self, expanded):
+        if expanded and self.libs_picker is None:
+            self._build_package_picker()
+        if self.libs_picker is not None:
+            self.libs_picker.setVisible(expanded)
+        self.libs_toggle.setArrowType(Qt.DownArrow if expanded else Qt.RightArrow)
+        self._update_libs_toggle()
+
     def show_about(self):
         about_dialog = AboutDialog(self)
         about_dialog.exec_()
@@ -253,327 +518,29 @@ class Scaffolder(QMainWindow):
         if folder:
             self.dest_edit.setText(folder)
 
-    def create_project_structure(self, target_path, project_type):
-        """Crea la estructura del proyecto dinámicamente sin usar plantillas físicas"""
-        os.makedirs(target_path, exist_ok=True)
-        
-        os.makedirs(os.path.join(target_path, "src"), exist_ok=True)
-        os.makedirs(os.path.join(target_path, "tests"), exist_ok=True)
-        os.makedirs(os.path.join(target_path, "docs"), exist_ok=True)
-        
-        if project_type == "Python Script":
-            with open(os.path.join(target_path, "src", "main.py"), "w") as f:
-                f.write('#!/usr/bin/env python3\nprint("Hello, World!")\n')
-                
-        elif project_type == "Flask Web App (Flask + SQLAlchemy)":
-            os.makedirs(os.path.join(target_path, "src", "templates"), exist_ok=True)
-            os.makedirs(os.path.join(target_path, "src", "static", "css"), exist_ok=True)
-            os.makedirs(os.path.join(target_path, "src", "static", "js"), exist_ok=True)
-            os.makedirs(os.path.join(target_path, "src", "models"), exist_ok=True)
-            
-            with open(os.path.join(target_path, "src", "app.py"), "w") as f:
-                f.write(textwrap.dedent('''\
-                from flask import Flask, render_template
-                from flask_sqlalchemy import SQLAlchemy
-                
-                app = Flask(__name__)
-                app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///database.db'
-                db = SQLAlchemy(app)
-                
-                class User(db.Model):
-                    id = db.Column(db.Integer, primary_key=True)
-                    username = db.Column(db.String(80), unique=True, nullable=False)
-                    email = db.Column(db.String(120), unique=True, nullable=False)
-                
-                @app.route('/')
-                def home():
-                    return render_template('index.html')
-                
-                if __name__ == '__main__':
-                    app.run(debug=True)
-                '''))
-            
-            with open(os.path.join(target_path, "src", "templates", "index.html"), "w") as f:
-                f.write(textwrap.dedent('''\
-                <!DOCTYPE html>
-                <html>
-                <head>
-                    <title>Flask App</title>
-                    <link rel="stylesheet" href="{{ url_for('static', filename='css/style.css') }}">
-                </head>
-                <body>
-                    <h1>Welcome to your Flask App!</h1>
-                    <p>This is a generated Flask application with SQLAlchemy support.</p>
-                </body>
-                </html>
-                '''))
-                
-            with open(os.path.join(target_path, "src", "static", "css", "style.css"), "w") as f:
-                f.write("/* Add your CSS styles here */")
-                
-        elif project_type == "FastAPI Web App":
-            with open(os.path.join(target_path, "src", "main.py"), "w") as f:
-                f.write(textwrap.dedent('''\
-                from fastapi import FastAPI
-                
-                app = FastAPI()
-                
-                @app.get("/")
-                async def root():
-                    return {"message": "Hello World"}
-                
-                @app.get("/items/{item_id}")
-                async def read_item(item_id: int):
-                    return {"item_id": item_id}
-                '''))
-                
-        elif project_type == "Django Web App":
-            python_cmd = sys.executable
-            subprocess.run([python_cmd, "-m", "django", "startproject", os.path.basename(target_path), target_path])
-            
-        elif project_type == "PyQt5 Desktop App":
-            with open(os.path.join(target_path, "src", "main.py"), "w") as f:
-                f.write(textwrap.dedent('''\
-                import sys
-                from PyQt5.QtWidgets import QApplication, QMainWindow, QLabel, QPushButton
-                
-                class MainWindow(QMainWindow):
-                    def __init__(self):
-                        super().__init__()
-                        self.setWindowTitle("PyQt5 App")
-                        self.setGeometry(100, 100, 400, 300)
-                        
-                        self.label = QLabel("Hello, PyQt5!", self)
-                        self.label.move(150, 100)
-                        
-                        self.button = QPushButton("Click Me", self)
-                        self.button.move(150, 150)
-                        self.button.clicked.connect(self.on_button_click)
-                
-                    def on_button_click(self):
-                        self.label.setText("Button Clicked!")
-                
-                if __name__ == "__main__":
-                    app = QApplication(sys.argv)
-                    window = MainWindow()
-                    window.show()
-                    sys.exit(app.exec_())
-                '''))
-                
-        elif project_type == "Data Science Project (Jupyter)":
-            with open(os.path.join(target_path, "src", "analysis.ipynb"), "w") as f:
-                f.write('{"cells": [{"cell_type": "code","execution_count": null,"metadata": {},"outputs": [],"source": ["# Your data analysis code here"]}],"metadata": {"kernelspec": {"display_name": "Python 3","language": "python","name": "python3"},"language_info": {"codemirror_mode": {"name": "ipython","version": 3},"file_extension": ".py","mimetype": "text/x-python","name": "python","nbconvert_exporter": "python","pygments_lexer": "ipython3","version": "3.8.5"}},"nbformat": 4,"nbformat_minor": 4}')
-            with open(os.path.join(target_path, "src", "utils.py"), "w") as f:
-                f.write("# Utility functions for data processing\n")
-            with open(os.path.join(target_path, "src", "data_loader.py"), "w") as f:
-                f.write("# Functions for loading and preprocessing data\n")
-                
-        elif project_type == "Machine Learning (scikit-learn)":
-            with open(os.path.join(target_path, "src", "train.py"), "w") as f:
-                f.write(textwrap.dedent('''\
-                from sklearn.datasets import load_iris
-                from sklearn.model_selection import train_test_split
-                from sklearn.ensemble import RandomForestClassifier
-                from sklearn.metrics import accuracy_score
-                import joblib
-                
-                # Load data
-                data = load_iris()
-                X, y = data.data, data.target
-                
-                # Split data
-                X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-                
-                # Train model
-                model = RandomForestClassifier(n_estimators=100, random_state=42)
-                model.fit(X_train, y_train)
-                
-                # Evaluate
-                predictions = model.predict(X_test)
-                accuracy = accuracy_score(y_test, predictions)
-                print(f"Model Accuracy: {accuracy:.2f}")
-                
-                # Save model
-                joblib.dump(model, 'model.pkl')
-                '''))
-                
-        elif project_type == "Tkinter Desktop App":
-            with open(os.path.join(target_path, "src", "main.py"), "w") as f:
-                f.write(textwrap.dedent('''\
-                import tkinter as tk
-                from tkinter import messagebox
-                
-                class App(tk.Tk):
-                    def __init__(self):
-                        super().__init__()
-                        self.title("Tkinter App")
-                        self.geometry("300x200")
-                        
-                        self.label = tk.Label(self, text="Hello, Tkinter!")
-                        self.label.pack(pady=20)
-                        
-                        self.button = tk.Button(self, text="Click Me", command=self.on_button_click)
-                        self.button.pack()
-                
-                    def on_button_click(self):
-                        messagebox.showinfo("Info", "Button clicked!")
-                
-                if __name__ == "__main__":
-                    app = App()
-                    app.mainloop()
-                '''))
-                
-        elif project_type == "Kivy Mobile App":
-            with open(os.path.join(target_path, "src", "main.py"), "w") as f:
-                f.write(textwrap.dedent('''\
-                from kivy.app import App
-                from kivy.uix.button import Button
-                from kivy.uix.boxlayout import BoxLayout
-                
-                class MyApp(App):
-                    def build(self):
-                        layout = BoxLayout(orientation='vertical')
-                        btn = Button(text='Hello Kivy', size_hint=(0.5, 0.5),
-                                     pos_hint={'center_x': 0.5, 'center_y': 0.5})
-                        layout.add_widget(btn)
-                        return layout
-                
-                if __name__ == '__main__':
-                    MyApp().run()
-                '''))
-                
-        elif project_type == "Pygame Project":
-            with open(os.path.join(target_path, "src", "main.py"), "w") as f:
-                f.write(textwrap.dedent('''\
-                import pygame
-                import sys
-                
-                # Initialize pygame
-                pygame.init()
-                
-                # Screen dimensions
-                WIDTH, HEIGHT = 800, 600
-                screen = pygame.display.set_mode((WIDTH, HEIGHT))
-                pygame.display.set_caption("Pygame Project")
-                
-                # Colors
-                WHITE = (255, 255, 255)
-                RED = (255, 0, 0)
-                
-                # Game loop
-                clock = pygame.time.Clock()
-                running = True
-                
-                while running:
-                    for event in pygame.event.get():
-                        if event.type == pygame.QUIT:
-                            running = False
-                    
-                    # Fill the screen with white
-                    screen.fill(WHITE)
-                    
-                    # Draw a red circle
-                    pygame.draw.circle(screen, RED, (WIDTH//2, HEIGHT//2), 50)
-                    
-                    # Update the display
-                    pygame.display.flip()
-                    
-                    # Cap the frame rate
-                    clock.tick(60)
-                
-                pygame.quit()
-                sys.exit()
-                '''))
-                
-        elif project_type == "CLI Tool (Click)":
-            with open(os.path.join(target_path, "src", "cli.py"), "w") as f:
-                f.write(textwrap.dedent('''\
-                import click
-                
-                @click.group()
-                def cli():
-                    """Command Line Interface Tool"""
-                    pass
-                
-                @cli.command()
-                @click.argument('name')
-                def hello(name):
-                    """Print a greeting"""
-                    click.echo(f"Hello, {name}!")
-                
-                if __name__ == '__main__':
-                    cli()
-                '''))
-                
-        elif project_type == "Minimal CLI Tool (Typer)":
-            with open(os.path.join(target_path, "src", "cli.py"), "w") as f:
-                f.write(textwrap.dedent('''\
-                import typer
-                
-                app = typer.Typer()
-                
-                @app.command()
-                def hello(name: str):
-                    typer.echo(f"Hello, {name}")
-                
-                if __name__ == "__main__":
-                    app()
-                '''))
-                
-        else:
-            with open(os.path.join(target_path, "src", "main.py"), "w") as f:
-                f.write(f"# {project_type} Project\n\nprint('Hello, World!')")
-                
-        readme_content = f"# {os.path.basename(target_path)}\n\n" + \
-                         "## Project Description\n\n" + \
-                         f"This is a {project_type} project generated with Python Port-Scaffolder.\n\n" + \
-                         "## Getting Started\n\n" + \
-                         "### Prerequisites\n\n" + \
-                         "- Python 3.8+\n\n" + \
-                         "### Installation\n\n" + \
-                         "```bash\npip install -r requirements.txt\n```\n\n" + \
-                         "### Usage\n\n" + \
-                         "```bash\npython src/main.py\n```\n"
-                         
-        with open(os.path.join(target_path, "README.md"), "w") as f:
-            f.write(readme_content)
-            
-        gitignore_content = textwrap.dedent('''\
-        # Byte-compiled / optimized / DLL files
-        __pycache__/
-        *.py[cod]
-        
-        # Virtual environment
-        venv/
-        
-        # IDE files
-        .vscode/
-        .idea/
-        
-        # Logs and databases
-        *.log
-        *.sqlite3
-        
-        # OS generated files
-        .DS_Store
-        Thumbs.db
-        
-        # Build artifacts
-        build/
-        dist/
-        *.egg-info/
-        ''')
-        
-        with open(os.path.join(target_path, ".gitignore"), "w") as f:
-            f.write(gitignore_content)
+    def check_startup(self):
+        elapsed = time.perf_counter() - _STARTED
+        over = elapsed > STARTUP_BUDGET
+        if over or os.environ.get("SCAFFOLDER_STARTUP_CHECK"):
+            print(f"Inicio: {elapsed * 1000:.0f} ms (presupuesto: {STARTUP_BUDGET * 1000:.0f} ms)"
+                  + (" - EXCEDIDO" if over else ""), file=sys.stderr)
+        if os.environ.get("SCAFFOLDER_STARTUP_CHECK"):
+            QApplication.instance().exit(1 if over else 0)
+
+    def update_profiles(self, project_type):
+        """Muestra los perfiles de la plantilla elegida; sin perfiles el selector se oculta"""
+        profiles = REGISTRY.get(project_type).profiles if project_type in REGISTRY else ()
+        self.profile_combo.clear()
+        self.profile_combo.addItem("Estándar", None)
+        for profile in profiles:
+            self.profile_combo.addItem(profile.label, profile.id)
+        self.profile_label.setVisible(bool(profiles))
+        self.profile_combo.setVisible(bool(profiles))
 
     def generate_project(self):
         project_type = self.type_combo.currentText()
         name = self.name_edit.text().strip()
         dest = self.dest_edit.text().strip()
-        create_venv = self.venv_chk.isChecked()
-        create_req = self.req_chk.isChecked()
-        init_git = self.git_chk.isChecked()
 
         if not name:
             QMessageBox.warning(self, "Error", "Debes ingresar un nombre para el proyecto.")
@@ -584,141 +551,158 @@ class Scaffolder(QMainWindow):
             return
 
         target_path = os.path.join(dest, name)
+        overwrite = False
+        update = False
         
         if os.path.exists(target_path):
-            reply = QMessageBox.question(
-                self, "Carpeta Existente", 
-                f"La carpeta '{name}' ya existe. ¿Deseas sobrescribirla?",
-                QMessageBox.Yes | QMessageBox.No
-            )
-            if reply == QMessageBox.No:
+            box = QMessageBox(QMessageBox.Question, "Carpeta Existente",
+                              f"La carpeta '{name}' ya existe. ¿Deseas actualizarla o sobrescribirla?", parent=self)
+            box.setInformativeText("Actualizar solo escribe los archivos nuevos o cambiados, conserva el "
+                                   "entorno virtual y los archivos editados a mano, e instala lo que falte.")
+            update_btn = box.addButton("Actualizar", QMessageBox.AcceptRole)
+            overwrite_btn = box.addButton("Sobrescribir", QMessageBox.DestructiveRole)
+            box.addButton("Cancelar", QMessageBox.RejectRole)
+            box.setDefaultButton(update_btn)
+            box.exec_()
+            if box.clickedButton() is update_btn:
+                update = True
+            elif box.clickedButton() is overwrite_btn:
+                overwrite = True
+            else:
                 return
-            shutil.rmtree(target_path)
 
-        try:
-            self.create_project_structure(target_path, project_type)
-            
-            python_cmd = sys.executable
-            if create_venv:
-                venv_path = os.path.join(target_path, "venv")
-                subprocess.run([python_cmd, "-m", "venv", venv_path], check=True)
-                
-                if os.name == 'nt':
-                    python_cmd = os.path.join(venv_path, "Scripts", "python.exe")
-                else:
-                    python_cmd = os.path.join(venv_path, "bin", "python")
-            
-            libs = [chk.text() for chk in self.lib_checks if chk.isChecked()]
-            if create_req:
-                req_path = os.path.join(target_path, "requirements.txt")
-                with open(req_path, "w") as req_file:
-                    if project_type == "Flask Web App (Flask + SQLAlchemy)":
-                        req_file.write("flask\nflask_sqlalchemy\n")
-                    elif project_type == "FastAPI Web App":
-                        req_file.write("fastapi\nuvicorn\n")
-                    elif project_type == "Django Web App":
-                        req_file.write("django\n")
-                    elif project_type == "Data Science Project (Jupyter)":
-                        req_file.write("jupyter\npandas\nnumpy\nmatplotlib\n")
-                    elif project_type == "Machine Learning (scikit-learn)":
-                        req_file.write("scikit-learn\npandas\nnumpy\nmatplotlib\n")
-                    elif project_type == "PyQt5 Desktop App":
-                        req_file.write("pyqt5\n")
-                    elif project_type == "Kivy Mobile App":
-                        req_file.write("kivy\n")
-                    elif project_type == "Pygame Project":
-                        req_file.write("pygame\n")
-                    elif project_type == "CLI Tool (Click)":
-                        req_file.write("click\n")
-                    elif project_type == "Minimal CLI Tool (Typer)":
-                        req_file.write("typer\n")
-                    
-                    for lib in libs:
-                        req_file.write(f"{lib}\n")
-            
-            for chk in self.file_checks:
-                if chk.isChecked():
-                    fname = chk.text()
-                    fpath = os.path.join(target_path, fname)
-                    
-                    if not os.path.exists(fpath):
-                        if fname == "LICENSE":
-                            with open(fpath, "w") as f:
-                                f.write("MIT License\n\nCopyright (c) [year] [fullname]\n")
-                        elif fname == "pyproject.toml":
-                            with open(fpath, "w") as f:
-                                f.write("[build-system]\nrequires = [\"setuptools\"]\nbuild-backend = \"setuptools.build_meta\"\n")
-                        elif fname == "setup.py":
-                            with open(fpath, "w") as f:
-                                f.write(textwrap.dedent('''\
-                                from setuptools import setup, find_packages
-                                
-                                setup(
-                                    name='{}',
-                                    version='0.1.0',
-                                    packages=find_packages(),
-                                    install_requires=[],
-                                )
-                                '''.format(name)))
-                        elif fname == "Dockerfile":
-                            with open(fpath, "w") as f:
-                                f.write(textwrap.dedent('''\
-                                FROM python:3.9-slim
-                                
-                                WORKDIR /app
-                                
-                                COPY requirements.txt .
-                                RUN pip install --no-cache-dir -r requirements.txt
-                                
-                                COPY . .
-                                
-                                CMD ["python", "src/main.py"]
-                                '''))
-                        elif fname == "Makefile":
-                            with open(fpath, "w") as f:
-                                f.write(textwrap.dedent('''\
-                                .PHONY: run test clean
-                                
-                                run:
-                                \tpython src/main.py
-                                
-                                test:
-                                \tpytest tests/
-                                
-                                clean:
-                                \trm -rf __pycache__ .pytest_cache
-                                '''))
-                        else:
-                            open(fpath, 'a').close()
-            
-            if init_git:
-                try:
-                    subprocess.run(["git", "init", target_path], check=True)
-                except Exception:
-                    QMessageBox.warning(self, "Advertencia", "Git no está instalado. No se pudo inicializar el repositorio.")
-            
-            if create_req and create_venv:
-                try:
-                    subprocess.run([python_cmd, "-m", "pip", "install", "-r", "requirements.txt"], 
-                                  cwd=target_path, check=True)
-                except Exception as e:
-                    QMessageBox.warning(self, "Advertencia", 
-                                      f"No se pudieron instalar las dependencias: {str(e)}")
-            
-            QMessageBox.information(
-                self, 
-                "Proyecto Generado", 
-                f"Proyecto '{name}' ({project_type}) generado exitosamente en:\n{target_path}"
-            )
-            
-        except Exception as e:
-            QMessageBox.critical(
-                self, 
-                "Error", 
-                f"No se pudo generar el proyecto: {str(e)}\n\nDetalles: {type(e).__name__}"
-            )
-            if os.path.exists(target_path):
-                shutil.rmtree(target_path)
+        from scaffolder.engine import project_options
+
+        options = project_options(
+            name, dest, project_type,
+            libs=self.selected_libs(),
+            extra_files=[chk.text() for chk in self.file_checks if chk.isChecked()],
+            create_venv=self.venv_chk.isChecked(),
+            create_req=self.req_chk.isChecked(),
+            init_git=self.git_chk.isChecked(),
+            git_commit=self.git_chk.isChecked() and self.commit_chk.isChecked(),
+            profile=self.profile_combo.currentData(),
+            overwrite=overwrite,
+            update=update,
+        )
+
+        self.log_view.clear()
+        self.timings_view.clear()
+        self.progress_tabs.setCurrentWidget(self.log_view)
+        # Sin máximo la barra queda en modo "ocupado" hasta que el worker arma el grafo de pasos
+        self.progress_bar.setMaximum(0)
+        self.progress_bar.setValue(0)
+        self._warnings = []
+        self._run_start = time.perf_counter()
+
+        self.worker = GenerationWorker(options, self)
+        self.worker.planned.connect(self.progress_bar.setMaximum)
+        self.worker.output.connect(self.log_view.appendPlainText)
+        self.worker.step_started.connect(self.on_step_started)
+        self.worker.step_finished.connect(self.on_step_finished)
+        self.worker.warning.connect(self.on_generation_warning)
+        self.worker.succeeded.connect(self.on_generation_succeeded)
+        self.worker.failed.connect(self.on_generation_failed)
+        self.worker.cancelled.connect(self.on_generation_cancelled)
+        self.worker.finished.connect(self.on_worker_finished)
+
+        self.gen_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.worker.start()
+
+    def cancel_generation(self):
+        if self.worker is not None and self.worker.isRunning():
+            self.cancel_btn.setEnabled(False)
+            self.log_view.appendPlainText("Cancelando...")
+            self.worker.cancel()
+
+    def on_step_started(self, label):
+        self.log_view.appendPlainText(f"==> {label}")
+
+    def on_step_finished(self, label, elapsed):
+        self.log_view.appendPlainText(f"<== {label} ({elapsed:.2f} s)")
+        self.progress_bar.setValue(self.progress_bar.value() + 1)
+
+    def on_generation_warning(self, message):
+        self._warnings.append(message)
+        self.log_view.appendPlainText(f"ADVERTENCIA: {message}")
+
+    def on_generation_succeeded(self):
+        opts = self.worker.options
+        elapsed = time.perf_counter() - self._run_start
+        self.progress_bar.setValue(self.progress_bar.maximum())
+        action = "actualizado" if opts["update"] else "generado"
+        message = (f"Proyecto '{opts['name']}' ({opts['project_type']}) {action} exitosamente en:\n"
+                   f"{opts['target_path']}\n\nTiempo total: {elapsed:.2f} s")
+        if self._warnings:
+            message += "\n\nAdvertencias:\n" + "\n".join(self._warnings)
+        QMessageBox.information(self, "Proyecto Generado", message)
+
+    def on_generation_failed(self, message):
+        QMessageBox.critical(self, "Error", message)
+
+    def on_generation_cancelled(self):
+        self.log_view.appendPlainText("Generación cancelada.")
+        QMessageBox.information(self, "Cancelado", "La generación del proyecto fue cancelada.")
+
+    def show_timings(self, tracer):
+        """Llena el panel de tiempos con los pasos de la última ejecución; el más lento en negrita"""
+        self.timings_view.clear()
+        steps = tracer.by_category("step")
+        if not steps:
+            return
+        total = max(s["start"] + s["dur"] for s in steps) - min(s["start"] for s in steps)
+        slowest = max(steps, key=lambda s: s["dur"])
+        bold = QFont()
+        bold.setBold(True)
+        for step in steps:
+            details = []
+            descendants = tracer.descendants(step["id"])
+            for span in descendants:
+                args = span["args"]
+                if "files" in args:
+                    details.append(f"{args['files']} archivos, {args['bytes'] / 1024:.1f} KB")
+                if "backend" in args:
+                    details.append(f"instalador: {args['backend']}")
+            processes = [s for s in descendants if s["cat"] == "subprocess"]
+            if processes:
+                details.append(f"{len(processes)} procesos, {sum(p['dur'] for p in processes):.2f} s")
+            if "error" in step["args"]:
+                details.append(f"error: {step['args']['error']}")
+
+            item = QTreeWidgetItem([
+                step["args"].get("label", step["name"]),
+                f"{step['dur']:.2f}",
+                f"{step['dur'] / total * 100:.0f}%" if total else "",
+                "; ".join(details),
+            ])
+            item.setTextAlignment(1, Qt.AlignRight)
+            item.setTextAlignment(2, Qt.AlignRight)
+            if step is slowest:
+                for column in range(4):
+                    item.setFont(column, bold)
+            for proc in processes:
+                child = QTreeWidgetItem([proc["args"].get("cmd", proc["name"]), f"{proc['dur']:.2f}", "", ""])
+                child.setToolTip(0, proc["args"].get("cmd", ""))
+                child.setTextAlignment(1, Qt.AlignRight)
+                item.addChild(child)
+            self.timings_view.addTopLevelItem(item)
+
+    def on_worker_finished(self):
+        if self.progress_bar.maximum() == 0:
+            # Falló antes de armar el grafo: la barra sale del modo "ocupado"
+            self.progress_bar.setMaximum(1)
+        self.show_timings(self.worker.generator.tracer)
+        self.gen_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+        self.worker.deleteLater()
+        self.worker = None
+
+    def closeEvent(self, event):
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.cancel()
+            self.worker.wait()
+        super().closeEvent(event)
 
 
 if __name__ == "__main__":
@@ -728,4 +712,5 @@ if __name__ == "__main__":
     
     win = Scaffolder()
     win.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    QTimer.singleShot(0, win.check_startup)
+    sys.exit(app.exec_())
@@ -0,0 +1 @@
+"""Núcleo de generación de Python Port-Scaffolder, independiente de la interfaz gráfica"""
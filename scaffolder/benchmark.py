@@ -0,0 +1,264 @@
+"""Mide cuánto tarda cada plantilla en generarse, sin interfaz y sin red.
+
+    python -m scaffolder.benchmark --repeat 5 --output resultados.json
+    python -m scaffolder.benchmark --save-baseline
+    python -m scaffolder.benchmark --templates flask_sqlalchemy,fastapi
+"""
+import argparse
+import base64
+import contextlib
+import datetime
+import hashlib
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+from .engine import ProjectGenerator, project_options, wait_for_cleanups
+from .lock import canonical_name
+from .paths import cache_root
+from .templates import REGISTRY, create_project_structure, requirements_for
+
+DEFAULT_TOLERANCE = 0.2
+# Diferencias menores a esto se consideran ruido aunque superen la tolerancia
+MIN_DELTA = 0.01
+
+
+def baseline_path():
+    return os.path.join(cache_root(), "benchmarks", "baseline.json")
+
+
+def build_wheel(directory, name, version="0.0.0"):
+    """Escribe una wheel mínima (sin dependencias) que se instala como el paquete `name`"""
+    project = canonical_name(name)
+    module = project.replace("-", "_")
+    dist_info = f"{module}-{version}.dist-info"
+    files = {
+        f"{module}/__init__.py": f'__version__ = "{version}"\n',
+        # Permite que los pasos finales tipo `python -m django ...` terminen sin error
+        f"{module}/__main__.py": "",
+        f"{dist_info}/METADATA": f"Metadata-Version: 2.1\nName: {project}\nVersion: {version}\n",
+        f"{dist_info}/WHEEL": "Wheel-Version: 1.0\nGenerator: scaffolder-benchmark\n"
+                              "Root-Is-Purelib: true\nTag: py3-none-any\n",
+    }
+    record = []
+    for path, content in files.items():
+        digest = base64.urlsafe_b64encode(hashlib.sha256(content.encode()).digest()).rstrip(b"=").decode()
+        record.append(f"{path},sha256={digest},{len(content.encode())}")
+    record.append(f"{dist_info}/RECORD,,")
+    files[f"{dist_info}/RECORD"] = "\n".join(record) + "\n"
+
+    path = os.path.join(directory, f"{module}-{version}-py3-none-any.whl")
+    with zipfile.ZipFile(path, "w") as wheel:
+        for name_in_zip, content in files.items():
+            wheel.writestr(name_in_zip, content)
+    return path
+
+
+@contextlib.contextmanager
+def local_index(requirements):
+    """Índice local de paquetes falsos: pip y uv resuelven contra él en lugar de la red.
+
+    También redirige la caché del scaffolder a una carpeta temporal para no
+    mezclar los resultados con la wheelhouse, el pool de venvs ni las estadísticas reales.
+    """
+    root = tempfile.mkdtemp(prefix="scaffolder-bench-")
+    index = os.path.join(root, "index")
+    os.mkdir(index)
+    for name in {canonical_name(r) for r in requirements}:
+        build_wheel(index, name)
+    overrides = {
+        "PIP_NO_INDEX": "1",
+        "PIP_FIND_LINKS": index,
+        "PIP_DISABLE_PIP_VERSION_CHECK": "1",
+        "UV_NO_INDEX": "1",
+        "UV_FIND_LINKS": index,
+        "SCAFFOLDER_CACHE_DIR": os.path.join(root, "cache"),
+    }
+    saved = {key: os.environ.get(key) for key in overrides}
+    os.environ.update(overrides)
+    try:
+        yield root
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        wait_for_cleanups()
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    pos = (len(values) - 1) * q
+    low = int(pos)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (pos - low)
+
+
+def summarize(samples):
+    return {"p50": percentile(samples, 0.5), "p95": percentile(samples, 0.95), "samples": samples}
+
+
+def bench_template(template_id, workdir, repeat, libs=(), warm=False, installer="pip", log=print):
+    """Ejecuta `repeat` veces la escritura del árbol y la generación completa de una plantilla"""
+    tree = []
+    totals = []
+    steps = {}
+    warnings = []
+
+    for i in range(repeat + (1 if warm else 0)):
+        start = time.perf_counter()
+        create_project_structure(os.path.join(workdir, f"tree-{i}"), template_id, "bench")
+        tree_elapsed = time.perf_counter() - start
+
+        options = project_options(
+            f"{template_id}-{i}", workdir, template_id, libs=libs,
+            use_wheelhouse=warm, use_venv_pool=warm, refresh_lock=not warm, installer=installer,
+            use_snapshots=warm,
+        )
+        generator = ProjectGenerator(options, on_warning=warnings.append)
+        graph = generator.run()
+        _, total = graph.critical_path()
+        if warm and i == 0:
+            continue
+        tree.append(tree_elapsed)
+        totals.append(total)
+        for name, (step_start, step_end) in graph.timings.items():
+            steps.setdefault(name, []).append(step_end - step_start)
+        log(f"  {template_id} #{len(totals)}: {total:.2f} s")
+
+    return {
+        "tree": summarize(tree),
+        "total": summarize(totals),
+        "steps": {name: summarize(values) for name, values in steps.items()},
+        "warnings": sorted(set(warnings)),
+    }
+
+
+def run_benchmark(template_ids=None, repeat=5, libs=(), warm=False, installer="pip", log=print):
+    template_ids = list(template_ids or [template.id for template in REGISTRY])
+    requirements = set(libs)
+    for template_id in template_ids:
+        requirements.update(requirements_for(template_id, libs))
+
+    results = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": f"{platform.system()}-{platform.machine()}",
+        "repeat": repeat,
+        "mode": "warm" if warm else "cold",
+        "installer": installer,
+        "templates": {},
+    }
+    with local_index(requirements) as root:
+        for template_id in template_ids:
+            workdir = os.path.join(root, "projects", template_id)
+            os.makedirs(workdir)
+            results["templates"][template_id] = bench_template(
+                template_id, workdir, repeat, libs, warm=warm, installer=installer, log=log)
+            wait_for_cleanups()
+            shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def _metrics(entry):
+    yield "tree", entry["tree"]
+    yield "total", entry["total"]
+    for name, stats in entry["steps"].items():
+        yield name, stats
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Devuelve (plantilla, métrica, p50 base, p50 actual, es_regresión) para lo que está en ambos"""
+    rows = []
+    for template_id, entry in results["templates"].items():
+        base_entry = baseline.get("templates", {}).get(template_id)
+        if not base_entry:
+            continue
+        base_metrics = dict(_metrics(base_entry))
+        for metric, stats in _metrics(entry):
+            if metric not in base_metrics:
+                continue
+            before, after = base_metrics[metric]["p50"], stats["p50"]
+            regressed = after > before * (1 + tolerance) and after - before > MIN_DELTA
+            rows.append((template_id, metric, before, after, regressed))
+    return rows
+
+
+def format_results(results):
+    lines = [f"{'plantilla':20} {'métrica':12} {'p50 (s)':>9} {'p95 (s)':>9}"]
+    for template_id, entry in results["templates"].items():
+        for metric, stats in _metrics(entry):
+            lines.append(f"{template_id:20} {metric:12} {stats['p50']:9.3f} {stats['p95']:9.3f}")
+    return "\n".join(lines)
+
+
+def format_comparison(rows):
+    lines = []
+    for template_id, metric, before, after, regressed in rows:
+        change = (after - before) / before * 100 if before else 0.0
+        mark = "  REGRESIÓN" if regressed else ""
+        lines.append(f"{template_id:20} {metric:12} {before:9.3f} -> {after:9.3f} ({change:+.0f}%){mark}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m scaffolder.benchmark",
+                                     description="Mide la latencia de generación por plantilla y por paso.")
+    parser.add_argument("--templates", default="", help="plantillas separadas por comas (por defecto todas)")
+    parser.add_argument("--libs", default="", help="librerías adicionales para cada proyecto")
+    parser.add_argument("--repeat", type=int, default=5, help="repeticiones por plantilla")
+    parser.add_argument("--warm", action="store_true",
+                        help="usar wheelhouse, pool de venvs y caché de resoluciones (con una vuelta previa)")
+    parser.add_argument("--installer", default="pip", choices=["auto", "uv", "pip-parallel", "pip"])
+    parser.add_argument("--output", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--baseline", default=None, help="resultados de referencia a comparar")
+    parser.add_argument("--save-baseline", action="store_true", help="guardar estos resultados como referencia")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="aumento relativo del p50 que se considera regresión (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    template_ids = [t.strip() for t in args.templates.split(",") if t.strip()]
+    try:
+        template_ids = [REGISTRY.get(t).id for t in template_ids]
+    except KeyError as e:
+        parser.error(f"plantilla desconocida: {e.args[0]}")
+    libs = [lib.strip() for lib in args.libs.split(",") if lib.strip()]
+    baseline_file = args.baseline or baseline_path()
+
+    results = run_benchmark(template_ids, args.repeat, libs, warm=args.warm, installer=args.installer)
+    print(format_results(results))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    exit_code = 0
+    if os.path.exists(baseline_file) and not args.save_baseline:
+        with open(baseline_file, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline, args.tolerance)
+        print(f"\nComparación con {baseline_file}:")
+        if (baseline.get("mode"), baseline.get("installer")) != (results["mode"], results["installer"]):
+            print(f"(la referencia se midió en modo {baseline.get('mode')} con {baseline.get('installer')})")
+        print(format_comparison(rows))
+        if any(row[4] for row in rows):
+            exit_code = 1
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(baseline_file)), exist_ok=True)
+        with open(baseline_file, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nReferencia guardada en {baseline_file}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .engine import ProjectGenerator, wait_for_cleanups
+
+_install_slots = None
+
+
+def _init_worker(slots):
+    global _install_slots
+    _install_slots = slots
+
+
+def _generate_one(options):
+    output = []
+    warnings = []
+    start = time.perf_counter()
+    generator = ProjectGenerator(options, on_output=output.append, on_warning=warnings.append,
+                                 limiter=_install_slots)
+    try:
+        generator.run()
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    # Los procesos del pool terminan sin esperar hilos pendientes
+    wait_for_cleanups()
+    return {
+        "name": options["name"],
+        "target_path": options["target_path"],
+        "ok": error is None,
+        "error": error,
+        "warnings": warnings,
+        "elapsed": time.perf_counter() - start,
+        "tail": output[-20:] if error else [],
+    }
+
+
+class BulkReport:
+    def __init__(self, results, elapsed):
+        self.results = results
+        self.elapsed = elapsed
+
+    @property
+    def failures(self):
+        return [r for r in self.results if not r["ok"]]
+
+    @property
+    def throughput(self):
+        return len(self.results) / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        ok = len(self.results) - len(self.failures)
+        return (f"{ok}/{len(self.results)} proyectos generados en {self.elapsed:.2f} s "
+                f"({self.throughput:.2f} proyectos/s)")
+
+
+def default_install_slots():
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+def generate_bulk(options_list, jobs=None, max_installs=None, on_result=None):
+    """Genera varios proyectos en un pool de procesos; un fallo no detiene al resto"""
+    jobs = jobs or os.cpu_count() or 1
+    max_installs = max_installs or default_install_slots()
+    context = multiprocessing.get_context()
+    slots = context.BoundedSemaphore(max_installs)
+
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=context,
+                             initializer=_init_worker, initargs=(slots,)) as pool:
+        futures = {pool.submit(_generate_one, options): options for options in options_list}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                options = futures[future]
+                result = {"name": options["name"], "target_path": options["target_path"], "ok": False,
+                          "error": f"{type(e).__name__}: {e}", "warnings": [], "elapsed": 0.0, "tail": []}
+            results.append(result)
+            if on_result:
+                on_result(result)
+    return BulkReport(results, time.perf_counter() - start)
@@ -0,0 +1,397 @@
+import argparse
+import json
+import sys
+import threading
+import time
+
+from .templates import ADDITIONAL_LIBS, EXTRA_FILES, REGISTRY, resolve_template
+from .timeouts import DEFAULT_RETRIES, DEFAULT_TIMEOUTS
+
+
+def _split(value):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return list(value)
+
+
+def _timeouts(value):
+    """{"install": 900} o "install=900,git=30" -> {paso: segundos}"""
+    if not value:
+        return {}
+    if isinstance(value, dict):
+        return {step: float(seconds) for step, seconds in value.items()}
+    timeouts = {}
+    for item in _split(value):
+        step, sep, seconds = item.partition("=")
+        try:
+            timeouts[step.strip()] = float(seconds)
+        except ValueError:
+            raise ValueError(f"Tiempo máximo inválido: '{item}' (se espera paso=segundos).") from None
+    return timeouts
+
+
+def load_manifest(path):
+    """Lee un manifiesto JSON o YAML con una lista de proyectos (o {"defaults": ..., "projects": [...]})"""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    if path.endswith((".yml", ".yaml")):
+        try:
+            import yaml
+        except ImportError:
+            raise SystemExit("PyYAML no está instalado; usa un manifiesto JSON o instala PyYAML.")
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+
+    defaults = {}
+    if isinstance(data, dict):
+        defaults = data.get("defaults", {})
+        data = data.get("projects", [])
+    return [dict(defaults, **spec) for spec in data]
+
+
+def spec_to_options(spec, dest=".", overwrite=False, update=False):
+    # El motor (asyncio, instaladores, snapshots) se importa recién al generar: --list y
+    # --search no lo necesitan
+    from .engine import project_options
+
+    if "name" not in spec:
+        raise ValueError("Cada proyecto del manifiesto necesita un 'name'.")
+    try:
+        project_type = resolve_template(spec.get("type", "python_script"))
+    except KeyError as e:
+        raise ValueError(f"Tipo de proyecto desconocido: {e.args[0]}")
+    profile = spec.get("profile") or None
+    if profile:
+        try:
+            profile = REGISTRY.get(project_type).get_profile(profile).id
+        except KeyError:
+            raise ValueError(f"La plantilla {project_type} no tiene el perfil '{profile}'.")
+    files = spec.get("files")
+    return project_options(
+        spec["name"],
+        spec.get("dest", dest),
+        project_type,
+        libs=_split(spec.get("libs")),
+        extra_files=EXTRA_FILES if files is None else _split(files),
+        create_venv=spec.get("venv", True),
+        create_req=spec.get("requirements", True),
+        init_git=spec.get("git", True),
+        overwrite=spec.get("overwrite", overwrite),
+        use_wheelhouse=spec.get("wheelhouse", True),
+        use_venv_pool=spec.get("venv_pool", True),
+        lock=spec.get("lock", True),
+        refresh_lock=spec.get("refresh_lock", False),
+        installer=spec.get("installer", "auto"),
+        trace=spec.get("trace", True),
+        chrome_trace=spec.get("chrome_trace", False),
+        update=spec.get("update", update),
+        use_snapshots=spec.get("snapshots", True),
+        snapshot_venv=spec.get("snapshot_venv", False),
+        timeouts=_timeouts(spec.get("timeouts")),
+        retries=spec.get("retries", DEFAULT_RETRIES),
+        git_commit=spec.get("git_commit", False),
+        profile=profile,
+    )
+
+
+_print_lock = threading.Lock()
+
+
+def _print(*args, **kwargs):
+    with _print_lock:
+        print(*args, **kwargs, flush=True)
+
+
+def generate(options, quiet=False):
+    from .engine import ProjectGenerator
+
+    def on_output(line):
+        if not quiet:
+            _print("    " + line)
+
+    def on_step_start(label):
+        _print(f"==> {label}")
+
+    def on_step_finish(label, elapsed):
+        _print(f"<== {label} ({elapsed:.2f} s)")
+
+    def on_warning(message):
+        _print(f"ADVERTENCIA: {message}", file=sys.stderr)
+
+    generator = ProjectGenerator(options, on_output, on_step_start, on_step_finish, on_warning)
+    graph = generator.run()
+    if quiet:
+        print(graph.report())
+        if generator.trace_files:
+            print("Traza guardada en " + ", ".join(generator.trace_files))
+    return graph
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="app.py",
+        description="Genera proyectos Python sin abrir la interfaz gráfica.",
+    )
+    parser.add_argument("--type", default="python_script",
+                        help="tipo de proyecto (identificador corto o nombre completo)")
+    parser.add_argument("--profile", help="variante de la plantilla (ver --list), por ejemplo performance")
+    parser.add_argument("--name", help="nombre del proyecto")
+    parser.add_argument("--dest", default=".", help="carpeta destino (por defecto la actual)")
+    parser.add_argument("--libs", default="", help="librerías adicionales separadas por comas")
+    parser.add_argument("--files", default=",".join(EXTRA_FILES),
+                        help="archivos extras separados por comas")
+    parser.add_argument("--no-venv", action="store_true", help="no crear entorno virtual")
+    parser.add_argument("--no-requirements", action="store_true", help="no crear requirements.txt")
+    parser.add_argument("--no-git", action="store_true", help="no inicializar repositorio Git")
+    parser.add_argument("--git-commit", action="store_true",
+                        help="crear el commit inicial con los archivos generados (respeta el .gitignore)")
+    parser.add_argument("--no-wheelhouse", action="store_true",
+                        help="instalar siempre desde el índice sin usar la wheelhouse local")
+    parser.add_argument("--no-venv-pool", action="store_true",
+                        help="crear siempre el venv desde cero en lugar de copiar un entorno base")
+    parser.add_argument("--no-lock", action="store_true",
+                        help="no generar requirements.lock con versiones y hashes fijos")
+    parser.add_argument("--refresh-lock", action="store_true",
+                        help="volver a resolver las versiones aunque haya una resolución en caché")
+    parser.add_argument("--installer", default="auto", choices=["auto", "uv", "pip-parallel", "pip"],
+                        help="backend de instalación (auto elige el más rápido medido en esta máquina)")
+    parser.add_argument("--no-trace", action="store_true", help="no guardar la traza de tiempos por paso")
+    parser.add_argument("--chrome-trace", action="store_true",
+                        help="guardar también la traza en formato Chrome (chrome://tracing, Perfetto)")
+    parser.add_argument("--no-snapshots", action="store_true",
+                        help="no restaurar ni guardar el proyecto en la caché de snapshots")
+    parser.add_argument("--snapshot-venv", action="store_true",
+                        help="incluir el entorno virtual en el snapshot del proyecto")
+    parser.add_argument("--timeouts", default="", metavar="PASO=SEG,...",
+                        help="tiempo máximo por comando de cada paso (por defecto "
+                             + ",".join(f"{step}={seconds}" for step, seconds in DEFAULT_TIMEOUTS.items()) + ")")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES,
+                        help="reintentos de instalación y resolución ante errores transitorios de red")
+    parser.add_argument("--force", action="store_true",
+                        help="sobrescribir la carpeta si ya existe (con --update: también los archivos editados)")
+    parser.add_argument("--update", action="store_true",
+                        help="actualizar un proyecto existente: solo escribe archivos nuevos o cambiados, "
+                             "conserva el venv e instala solo lo que falta")
+    parser.add_argument("--manifest", help="archivo JSON/YAML con varios proyectos a generar")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="procesos en paralelo para generar el manifiesto")
+    parser.add_argument("--max-installs", type=int, default=None,
+                        help="máximo de venv/pip simultáneos en modo paralelo")
+    parser.add_argument("--prewarm-wheels", action="store_true",
+                        help="llena la wheelhouse con --libs (o con todas las librerías adicionales)")
+    parser.add_argument("--wheelhouse-stats", action="store_true", help="muestra el estado de la wheelhouse")
+    parser.add_argument("--snapshot-stats", action="store_true",
+                        help="muestra el tamaño y la tasa de aciertos de la caché de snapshots")
+    parser.add_argument("--clear-snapshots", action="store_true", help="vacía la caché de snapshots")
+    parser.add_argument("--refresh-index", action="store_true",
+                        help="descarga la lista de paquetes del índice para el buscador")
+    parser.add_argument("--search", metavar="TEXTO", help="busca paquetes en el índice local")
+    parser.add_argument("--benchmark-installers", action="store_true",
+                        help="mide cada backend de instalación con --libs y guarda los tiempos")
+    parser.add_argument("--serve", action="store_true",
+                        help="atiende pedidos de generación por HTTP (proyectos dentro de --dest)")
+    parser.add_argument("--host", default="127.0.0.1", help="dirección donde escucha --serve")
+    parser.add_argument("--port", type=int, default=None, help="puerto de --serve (por defecto 8765)")
+    parser.add_argument("--socket", metavar="RUTA", help="escuchar en un socket Unix en lugar de TCP")
+    parser.add_argument("--workers", type=int, default=2, help="generaciones simultáneas en --serve")
+    parser.add_argument("--queue-size", type=int, default=None,
+                        help="pedidos en espera antes de rechazar con 503 (por defecto 32)")
+    parser.add_argument("--warm", default="",
+                        help="plantillas cuyo venv base se prepara al iniciar --serve, separadas por comas")
+    parser.add_argument("--list", action="store_true", help="lista los tipos de proyecto disponibles")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no mostrar la salida de los comandos")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.list:
+        for template in REGISTRY:
+            print(f"{template.id:20} {template.label}")
+            for profile in template.profiles:
+                print(f"{'':20}   --profile {profile.id}: {profile.label}")
+        for error in REGISTRY.errors:
+            print(f"ERROR: plantilla inválida: {error}", file=sys.stderr)
+        return 0
+
+    if args.prewarm_wheels or args.wheelhouse_stats:
+        return run_wheelhouse(args)
+
+    if args.snapshot_stats or args.clear_snapshots:
+        return run_snapshots(args)
+
+    if args.refresh_index or args.search is not None:
+        return run_index(args)
+
+    if args.benchmark_installers:
+        from .installers import benchmark_installers
+
+        libs = _split(args.libs) or ["requests"]
+        print(f"Instalando {', '.join(libs)} con cada backend disponible...")
+        return 0 if benchmark_installers(libs, sys.executable, log=_print) else 1
+
+    if args.serve:
+        return run_server(args)
+
+    if args.manifest:
+        specs = load_manifest(args.manifest)
+    elif args.name:
+        specs = [{
+            "name": args.name,
+            "type": args.type,
+            "profile": args.profile,
+            "libs": args.libs,
+            "files": args.files,
+            "venv": not args.no_venv,
+            "requirements": not args.no_requirements,
+            "git": not args.no_git,
+            "git_commit": args.git_commit,
+            "wheelhouse": not args.no_wheelhouse,
+            "venv_pool": not args.no_venv_pool,
+            "lock": not args.no_lock,
+            "refresh_lock": args.refresh_lock,
+            "installer": args.installer,
+            "trace": not args.no_trace,
+            "chrome_trace": args.chrome_trace,
+            "snapshots": not args.no_snapshots,
+            "snapshot_venv": args.snapshot_venv,
+            "timeouts": args.timeouts,
+            "retries": args.retries,
+        }]
+    else:
+        build_parser().error("debes indicar --name o --manifest")
+
+    if args.jobs > 1 and len(specs) > 1:
+        return run_bulk(specs, args)
+
+    failures = []
+    start = time.perf_counter()
+    for spec in specs:
+        try:
+            options = spec_to_options(spec, args.dest, args.force, args.update)
+            print(f"### {options['name']} ({options['project_type']}) -> {options['target_path']}")
+            generate(options, args.quiet)
+        except KeyboardInterrupt:
+            print("Generación cancelada.", file=sys.stderr)
+            return 130
+        except Exception as e:
+            print(f"ERROR: {spec.get('name', '?')}: {e}", file=sys.stderr)
+            failures.append(spec.get("name", "?"))
+
+    if len(specs) > 1:
+        elapsed = time.perf_counter() - start
+        print(f"{len(specs) - len(failures)}/{len(specs)} proyectos generados en {elapsed:.2f} s")
+    return 1 if failures else 0
+
+
+def run_wheelhouse(args):
+    from .wheelhouse import Wheelhouse
+
+    wheelhouse = Wheelhouse()
+    failed = []
+    if args.prewarm_wheels:
+        failed = wheelhouse.prewarm(_split(args.libs) or ADDITIONAL_LIBS, log=_print)
+        if failed:
+            print("No se pudieron preparar: " + ", ".join(failed), file=sys.stderr)
+    stats = wheelhouse.stats()
+    print(f"Wheelhouse: {stats['path']}")
+    print(f"{stats['wheels']} wheels, {stats['bytes'] / 1024 / 1024:.1f} MB "
+          f"de {stats['max_bytes'] / 1024 / 1024:.0f} MB")
+    return 1 if failed else 0
+
+
+def run_snapshots(args):
+    from .snapshots import SnapshotCache
+
+    cache = SnapshotCache()
+    if args.clear_snapshots:
+        cache.clear()
+        print("Caché de snapshots vaciada.")
+    stats = cache.stats()
+    print(f"Snapshots: {stats['path']} ({stats['format']})")
+    print(f"{stats['entries']} entradas, {stats['bytes'] / 1024 / 1024:.1f} MB "
+          f"de {stats['max_bytes'] / 1024 / 1024:.0f} MB")
+    print(f"{stats['hits']} aciertos, {stats['misses']} fallos "
+          f"(tasa de aciertos {stats['hit_rate']:.0%})")
+    return 0
+
+
+def run_index(args):
+    from .pkgindex import PackageIndex
+
+    index = PackageIndex(seed=ADDITIONAL_LIBS).load()
+    if args.refresh_index:
+        print(f"Actualizando el índice desde {index.index_url}...")
+        try:
+            count = index.refresh()
+        except Exception as e:
+            print(f"ERROR: no se pudo actualizar el índice: {e}", file=sys.stderr)
+            return 1
+        print(f"{count} paquetes guardados en {index.names_file}")
+    if args.search is not None:
+        results = index.search(args.search)
+        for name in results[:30]:
+            info = index.info(name)
+            detail = ""
+            if info:
+                detail = f"{info.get('version') or '?'}{'' if info.get('wheel') else ' (sin wheel)'}"
+            print(f"{name:40} {detail}")
+        if len(results) > 30:
+            print(f"... y {len(results) - 30} más")
+    return 0
+
+
+def run_server(args):
+    import asyncio
+
+    from .server import DEFAULT_PORT, DEFAULT_QUEUE_SIZE, serve
+
+    try:
+        asyncio.run(serve(args.dest, args.host, args.port or DEFAULT_PORT, args.socket,
+                          workers=max(1, args.workers), queue_size=args.queue_size or DEFAULT_QUEUE_SIZE,
+                          max_installs=args.max_installs, warm=_split(args.warm), log=_print))
+    except KeyboardInterrupt:
+        print("Servidor detenido.", file=sys.stderr)
+    return 0
+
+
+def run_bulk(specs, args):
+    from .bulk import generate_bulk
+
+    options_list = []
+    invalid = 0
+    for spec in specs:
+        try:
+            options_list.append(spec_to_options(spec, args.dest, args.force, args.update))
+        except ValueError as e:
+            print(f"ERROR: {spec.get('name', '?')}: {e}", file=sys.stderr)
+            invalid += 1
+
+    def on_result(result):
+        if result["ok"]:
+            _print(f"OK    {result['name']} ({result['elapsed']:.2f} s)")
+        else:
+            _print(f"ERROR {result['name']}: {result['error']}", file=sys.stderr)
+            if not args.quiet:
+                for line in result["tail"]:
+                    _print("    " + line, file=sys.stderr)
+        for message in result["warnings"]:
+            _print(f"ADVERTENCIA: {result['name']}: {message}", file=sys.stderr)
+
+    try:
+        report = generate_bulk(options_list, jobs=args.jobs, max_installs=args.max_installs,
+                               on_result=on_result)
+    except KeyboardInterrupt:
+        print("Generación cancelada.", file=sys.stderr)
+        return 130
+    print(report.summary())
+    if invalid:
+        print(f"{invalid} entradas inválidas en el manifiesto", file=sys.stderr)
+    return 1 if report.failures or invalid else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
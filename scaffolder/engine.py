@@ -0,0 +1,681 @@
+import contextlib
+import functools
+import glob
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from .gitimport import fallback_ident, fast_import_stream, head_ref, unquote_path
+from .installers import install_requirements, missing_requirements, outdated_requirements
+from .lock import LOCK_FILE, resolve
+from .process import CommandTimeout, kill_tree, pid_alive, run_command, with_retries
+from .snapshots import SnapshotCache, snapshot_key
+from .templates import EXTRA_FILES, get_template, plan_project, requirements_for
+from .timeouts import DEFAULT_RETRIES, DEFAULT_TIMEOUTS
+from .trace import Tracer, trace_path
+from .venvpool import VenvPool, installed_distributions, relocate_venv, venv_python
+from .writer import plan_hashes, read_file_hashes, save_file_hashes, update_plan, write_plan
+
+
+class StepGraph:
+    """Ejecuta pasos con dependencias en paralelo y calcula la ruta crítica"""
+
+    def __init__(self):
+        self.steps = {}
+        self.timings = {}
+
+    def __len__(self):
+        return len(self.steps)
+
+    def add(self, name, label, func, deps=()):
+        for dep in deps:
+            if dep not in self.steps:
+                raise ValueError(f"Paso desconocido: {dep}")
+        self.steps[name] = (label, func, tuple(deps))
+
+    def run(self, max_workers=None, on_start=None, on_finish=None, on_error=None, tracer=None):
+        pending = dict(self.steps)
+        done = set()
+        running = {}
+        error = None
+        self.timings = {}
+        origin = time.perf_counter()
+
+        def execute(name):
+            label, func, _ = self.steps[name]
+            if on_start:
+                on_start(label)
+            start = time.perf_counter()
+            try:
+                if tracer is None:
+                    return func()
+                with tracer.span(name, "step", label=label):
+                    return func()
+            finally:
+                end = time.perf_counter()
+                self.timings[name] = (start - origin, end - origin)
+                if on_finish:
+                    on_finish(label, end - start)
+
+        with ThreadPoolExecutor(max_workers=max_workers or len(self.steps) or 1) as pool:
+            try:
+                while pending or running:
+                    if error is None:
+                        for name in [n for n, (_, _, deps) in pending.items() if done.issuperset(deps)]:
+                            del pending[name]
+                            running[pool.submit(execute, name)] = name
+                    if not running:
+                        break
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        name = running.pop(future)
+                        exc = future.exception()
+                        if exc is None:
+                            done.add(name)
+                        elif error is None:
+                            error = exc
+                            if on_error:
+                                on_error(exc)
+            except BaseException as exc:
+                if on_error:
+                    on_error(exc)
+                raise
+        if error is not None:
+            raise error
+        if pending:
+            raise ValueError("Dependencias circulares entre pasos: " + ", ".join(pending))
+
+    def critical_path(self):
+        if not self.timings:
+            return [], 0.0
+        name = max(self.timings, key=lambda n: self.timings[n][1])
+        total = self.timings[name][1]
+        path = []
+        while name is not None:
+            path.append(name)
+            deps = self.steps[name][2]
+            name = max(deps, key=lambda n: self.timings[n][1]) if deps else None
+        path.reverse()
+        return path, total
+
+    def report(self):
+        path, total = self.critical_path()
+        parts = []
+        for name in path:
+            start, end = self.timings[name]
+            parts.append(f"{self.steps[name][0]} ({end - start:.2f} s)")
+        serial = sum(end - start for start, end in self.timings.values())
+        return (f"Ruta crítica: {' -> '.join(parts)}\n"
+                f"Tiempo total: {total:.2f} s (secuencial: {serial:.2f} s)")
+
+
+class GenerationCancelled(Exception):
+    pass
+
+
+def project_options(name, dest, project_type, libs=(), extra_files=EXTRA_FILES,
+                    create_venv=True, create_req=True, init_git=True, overwrite=False,
+                    use_wheelhouse=True, use_venv_pool=True, lock=True, refresh_lock=False,
+                    installer="auto", trace=True, chrome_trace=False, update=False,
+                    use_snapshots=True, snapshot_venv=False, timeouts=None, retries=DEFAULT_RETRIES,
+                    git_commit=False, profile=None):
+    """Opciones de generación; con `update` un proyecto existente se actualiza en el lugar
+    (y `overwrite` reemplaza también los archivos modificados a mano). Con `use_snapshots`
+    una especificación ya generada se restaura de la caché, con el venv si `snapshot_venv`.
+
+    `timeouts` ({paso: segundos}) reemplaza los tiempos máximos por comando de DEFAULT_TIMEOUTS
+    y `retries` es la cantidad de reintentos de instalación ante errores de red. Con `git_commit`
+    el repositorio se crea con un commit inicial de los archivos no ignorados. `profile` elige una
+    variante de la plantilla (ver Template.profiles)."""
+    return {
+        "project_type": project_type,
+        "profile": profile,
+        "name": name,
+        "target_path": os.path.abspath(os.path.join(dest, name)),
+        "overwrite": overwrite,
+        "create_venv": create_venv,
+        "create_req": create_req,
+        "init_git": init_git,
+        "libs": list(libs),
+        "extra_files": list(extra_files),
+        "use_wheelhouse": use_wheelhouse,
+        "use_venv_pool": use_venv_pool,
+        "lock": lock,
+        "refresh_lock": refresh_lock,
+        "installer": installer,
+        "trace": trace,
+        "chrome_trace": chrome_trace,
+        "update": update,
+        "use_snapshots": use_snapshots,
+        "snapshot_venv": snapshot_venv,
+        "timeouts": dict(DEFAULT_TIMEOUTS, **(timeouts or {})),
+        "retries": retries,
+        "git_commit": git_commit,
+    }
+
+
+def _ignore(*args):
+    pass
+
+
+class ProjectGenerator:
+    """Genera un proyecto sin depender de la interfaz; el progreso se reporta por callbacks"""
+
+    def __init__(self, options, on_output=None, on_step_start=None, on_step_finish=None, on_warning=None,
+                 limiter=None, on_plan=None):
+        """`on_plan(pasos)` se llama con la cantidad de pasos una vez armado el grafo, ya dentro de `run`"""
+        self.options = options
+        self.limiter = limiter if limiter is not None else contextlib.nullcontext()
+        self.on_output = on_output or _ignore
+        self.on_step_start = on_step_start or _ignore
+        self.on_step_finish = on_step_finish or _ignore
+        self.on_plan = on_plan or _ignore
+        self._warned = False
+        warn = on_warning or _ignore
+
+        def on_warning_tracked(message):
+            self._warned = True
+            warn(message)
+
+        self.on_warning = on_warning_tracked
+        self.graph = None
+        self.installer = None
+        self.tracer = Tracer()
+        self.trace_files = []
+        self.work_path = None
+        self._pool = None
+        self._pool_key = None
+        self._venv_from_pool = False
+        self._venv_existing = False
+        self._updating = False
+        self._file_hashes = None
+        self._plan = None
+        self._git_ready = False
+        self._snapshots = None
+        self._snapshot_key = None
+        self._snapshot_hit = None
+        self._requirements_file = "requirements.txt"
+        self._cancel_requested = False
+        self._procs = set()
+        self._procs_lock = threading.Lock()
+
+    def cancel(self):
+        self._cancel_requested = True
+        with self._procs_lock:
+            procs = list(self._procs)
+        for proc in procs:
+            if proc.returncode is None:
+                kill_tree(proc.pid)
+
+    def _check_cancel(self):
+        if self._cancel_requested:
+            raise GenerationCancelled()
+
+    def _run_command(self, cmd, cwd=None, timeout=None, input=None, capture=False):
+        """Ejecuta `cmd` en el loop compartido de subprocesos, mostrando stdout y stderr a medida que llegan.
+
+        Con `capture` las líneas de stdout no se muestran y se devuelven en una lista.
+        """
+        self._check_cancel()
+        self.on_output("$ " + " ".join(cmd))
+        spawned = []
+        captured = []
+
+        def on_line(stream, line):
+            if capture and stream == "stdout":
+                captured.append(line)
+            else:
+                self.on_output(line)
+
+        def on_spawn(proc):
+            spawned.append(proc)
+            with self._procs_lock:
+                self._procs.add(proc)
+            if self._cancel_requested:
+                kill_tree(proc.pid)
+
+        with self.tracer.span(os.path.basename(cmd[0]), "subprocess", cmd=" ".join(cmd), timeout=timeout) as span:
+            try:
+                returncode, tail, counts = run_command(cmd, cwd, on_line, timeout, on_spawn, input)
+            except CommandTimeout:
+                span["timed_out"] = True
+                self._check_cancel()
+                raise
+            finally:
+                with self._procs_lock:
+                    self._procs.difference_update(spawned)
+            span["returncode"] = returncode
+            span["stdout_lines"] = counts["stdout"]
+            span["stderr_lines"] = counts["stderr"]
+        self._check_cancel()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, cmd, "\n".join(tail))
+        return captured
+
+    def _runner(self, step, retry=False):
+        """`run(cmd, cwd)` para los comandos del paso `step`, con su tiempo máximo y, si `retry`, reintentos"""
+        run = functools.partial(self._run_command, timeout=self.options["timeouts"].get(step))
+        if not retry or self.options["retries"] <= 0:
+            return run
+
+        def on_retry(error, attempt, delay):
+            self.on_output(f"Error transitorio ({error}); reintento {attempt} de {self.options['retries']} "
+                           f"en {delay:.1f} s...")
+
+        return with_retries(run, self.options["retries"] + 1, on_retry=on_retry,
+                            should_stop=lambda: self._cancel_requested)
+
+    def _run_limited(self, cmd, cwd=None, timeout=None):
+        with self.limiter:
+            return self._run_command(cmd, cwd, timeout)
+
+    def _build_graph(self):
+        opts = self.options
+        graph = StepGraph()
+        self._updating = opts["update"] and os.path.isdir(opts["target_path"])
+        self._venv_existing = self._updating and os.path.exists(
+            venv_python(os.path.join(opts["target_path"], "venv")))
+
+        self._snapshot_key = None
+        self._snapshot_hit = None
+        if opts["use_snapshots"] and not self._updating:
+            self._snapshots = SnapshotCache()
+            self._snapshot_key = snapshot_key(opts, self._snapshot_venv())
+            self._snapshot_hit = not opts["refresh_lock"] and self._snapshots.has(self._snapshot_key)
+
+        restored = ()
+        if self._snapshot_hit:
+            graph.add("restore", "Restaurando el proyecto desde la caché de snapshots", self._restore_snapshot)
+            restored = ("restore",)
+            if opts["create_req"] and opts["lock"]:
+                self._requirements_file = LOCK_FILE
+        graph.add("files", "Escribiendo archivos del proyecto", self._write_files, restored)
+
+        python_cmd = sys.executable
+        venv_restored = self._snapshot_hit and self._snapshot_venv()
+        if opts["create_venv"] and not venv_restored:
+            if opts["create_req"] and opts["use_venv_pool"] and VenvPool.supported() and not self._venv_existing:
+                self._pool = VenvPool()
+                self._pool_key = VenvPool.key(requirements_for(opts["project_type"], opts["libs"], opts["profile"]))
+            graph.add("venv", "Creando entorno virtual", self._create_venv)
+            python_cmd = None
+
+        if opts["init_git"]:
+            graph.add("git", "Inicializando Git", self._init_git)
+
+        if self._snapshot_hit:
+            if opts["create_req"] and opts["create_venv"] and not venv_restored:
+                graph.add("install", "Instalando dependencias", self._install_requirements,
+                          ("venv", "files", "restore"))
+            if opts["init_git"] and opts["git_commit"]:
+                graph.add("commit", "Creando el commit inicial", self._commit_initial, ("restore", "files", "git"))
+            graph.add("finalize", "Moviendo el proyecto a su carpeta final", self._finalize, tuple(graph.steps))
+            return graph
+
+        if opts["create_req"] and opts["lock"]:
+            # Se resuelve con el intérprete actual (el mismo del venv), así no espera al venv
+            graph.add("lock", "Resolviendo versiones (requirements.lock)", self._lock_requirements,
+                      tuple(step for step in ("files",) if step in graph.steps))
+
+        if opts["create_req"] and opts["create_venv"]:
+            graph.add("install", "Instalando dependencias", self._install_requirements,
+                      tuple(step for step in ("venv", "files", "lock") if step in graph.steps))
+
+        if self._updating:
+            return graph
+
+        template = get_template(opts["project_type"], opts["profile"])
+        if template.post_steps:
+            deps = ("files",) + tuple(step for step in ("venv", "install") if step in graph.steps)
+            graph.add("post_steps", "Pasos finales de la plantilla",
+                      lambda: self._run_post_steps(template, python_cmd or self._venv_python()), deps)
+
+        if opts["init_git"] and opts["git_commit"]:
+            graph.add("commit", "Creando el commit inicial", self._commit_initial,
+                      tuple(step for step in ("files", "git", "lock", "post_steps") if step in graph.steps))
+
+        if self._snapshot_key:
+            graph.add("snapshot", "Guardando el proyecto en la caché de snapshots", self._store_snapshot,
+                      tuple(graph.steps))
+
+        graph.add("finalize", "Moviendo el proyecto a su carpeta final", self._finalize, tuple(graph.steps))
+        return graph
+
+    def _snapshot_venv(self):
+        opts = self.options
+        return opts["snapshot_venv"] and opts["create_venv"] and VenvPool.supported()
+
+    def _restore_snapshot(self):
+        with self.tracer.span("restore_snapshot", "io", key=self._snapshot_key) as span:
+            meta = self._snapshots.restore(self._snapshot_key, self.work_path)
+            span.update(format=meta["format"], venv=meta["venv"])
+        self.on_output(f"Snapshot {self._snapshot_key} restaurado"
+                       f"{' con el entorno virtual' if meta['venv'] else ''}.")
+
+    def _store_snapshot(self):
+        if self._warned:
+            self.on_output("Hubo advertencias: el proyecto no se guarda en la caché de snapshots.")
+            return
+        try:
+            with self.tracer.span("store_snapshot", "io", key=self._snapshot_key):
+                self._snapshots.store(self._snapshot_key, self.work_path, include_venv=self._snapshot_venv())
+        except OSError as e:
+            self.on_output(f"No se pudo guardar el snapshot: {e}")
+            return
+        self.on_output(f"Snapshot {self._snapshot_key} guardado en la caché.")
+
+    def _write_files(self):
+        with self.tracer.span("write_plan", "io") as span:
+            plan = plan_project(self.options)
+            if self._updating:
+                result = update_plan(self.work_path, plan, read_file_hashes(self.options["target_path"]),
+                                     force=self.options["overwrite"])
+                count, written = len(result["added"]) + len(result["changed"]), result["bytes"]
+                self._file_hashes = result["hashes"]
+            else:
+                count, written = write_plan(self.work_path, plan)
+                self._file_hashes = plan_hashes(plan)
+                self._plan = plan
+            span.update(files=count, bytes=written)
+        if not self._updating:
+            self.on_output(f"{count} archivos escritos ({written} bytes)")
+            return
+        self.on_output(f"{len(result['added'])} archivos nuevos, {len(result['changed'])} actualizados, "
+                       f"{result['unchanged']} sin cambios ({written} bytes escritos)")
+        for rel in result["added"] + result["changed"]:
+            self.on_output(f"  {'+' if rel in result['added'] else '~'} {rel}")
+        if result["conflicts"]:
+            self.on_warning("Se conservaron los archivos modificados a mano (se pueden reemplazar "
+                            "sobrescribiendo): " + ", ".join(result["conflicts"]))
+
+    def _venv_python(self):
+        return venv_python(os.path.join(self.work_path, "venv"))
+
+    def _run_post_steps(self, template, python_cmd):
+        values = {"python": python_cmd, "target": self.work_path, "name": self.options["name"]}
+        for step in template.post_steps:
+            cmd = [arg.format(**values) for arg in step]
+            try:
+                self._run_command(cmd, self.work_path, self.options["timeouts"].get("post_steps"))
+            except (OSError, subprocess.CalledProcessError) as e:
+                self._check_cancel()
+                self.on_warning(f"Falló un paso final de la plantilla ({' '.join(cmd)}): {e}")
+
+    def _init_git(self):
+        if self._updating and os.path.exists(os.path.join(self.work_path, ".git")):
+            self.on_output("El repositorio Git ya existe.")
+            return
+        try:
+            self._run_command(["git", "init", self.work_path], timeout=self.options["timeouts"].get("git"))
+        except (OSError, subprocess.CalledProcessError):
+            self._check_cancel()
+            self.on_warning("Git no está instalado. No se pudo inicializar el repositorio.")
+            return
+        self._git_ready = True
+
+    def _commit_initial(self):
+        """Crea el primer commit con `git fast-import` a partir del plan, sin pasar por `git add`.
+
+        Git lista los archivos no ignorados (el venv nunca se recorre ni se hashea) y todo el
+        contenido se envía en un único flujo, así que el costo no crece con un proceso por archivo.
+        """
+        if not self._git_ready:
+            return
+        git = ["git", "-C", self.work_path]
+        timeout = self.options["timeouts"].get("git")
+        try:
+            paths = [unquote_path(line) for line in self._run_command(
+                git + ["-c", "core.quotepath=off", "ls-files", "--others", "--exclude-standard"],
+                timeout=timeout, capture=True) if line]
+            try:
+                ident = self._run_command(git + ["var", "GIT_COMMITTER_IDENT"], timeout=timeout, capture=True)[0]
+            except (subprocess.CalledProcessError, IndexError):
+                self._check_cancel()
+                ident = fallback_ident()
+            planned = self._plan.files if self._plan is not None else {}
+            ref = head_ref(os.path.join(self.work_path, ".git"))
+            with self.tracer.span("fast_import", "git") as span:
+                chunks, count, size = fast_import_stream(self.work_path, sorted(paths), planned, ref, ident)
+                self._run_command(git + ["fast-import", "--quiet", "--done", "--date-format=raw"],
+                                  timeout=timeout, input=chunks)
+                span.update(files=count, bytes=size)
+            self._run_command(git + ["read-tree", ref], timeout=timeout)
+        except (OSError, subprocess.CalledProcessError) as e:
+            self._check_cancel()
+            self.on_warning(f"No se pudo crear el commit inicial: {e}")
+            return
+        self.on_output(f"Commit inicial con {count} archivos ({size} bytes) en {ref.rpartition('/')[2]}")
+
+    def _create_venv(self):
+        venv_path = os.path.join(self.work_path, "venv")
+        if self._venv_existing:
+            self.on_output("Se conserva el entorno virtual existente.")
+            return
+        if self._pool_key and self._pool.has(self._pool_key):
+            self.on_output("Copiando el entorno base con las dependencias ya instaladas...")
+            self._pool.clone(self._pool_key, venv_path)
+            self._venv_from_pool = True
+            return
+        self._run_limited([sys.executable, "-m", "venv", venv_path], timeout=self.options["timeouts"].get("venv"))
+
+    def _lock_requirements(self):
+        opts = self.options
+        try:
+            requirements = requirements_for(opts["project_type"], opts["libs"], opts["profile"])
+            content, cached = resolve(requirements, sys.executable, self._runner("lock", retry=True),
+                                      refresh=opts["refresh_lock"])
+        except (OSError, subprocess.CalledProcessError) as e:
+            self._check_cancel()
+            self.on_warning(f"No se pudo generar {LOCK_FILE}; se instalará sin versiones fijas: {e}")
+            return
+        with open(os.path.join(self.work_path, LOCK_FILE), "w") as f:
+            f.write(content)
+        self._requirements_file = LOCK_FILE
+        self.on_output(f"{LOCK_FILE} {'reutilizado de la caché' if cached else 'resuelto y guardado en la caché'}")
+
+    def _install_requirements(self):
+        python_cmd = self._venv_python()
+        requirements = self._requirements_file
+        if self._venv_from_pool:
+            if requirements != LOCK_FILE:
+                self.on_output("Las dependencias ya están instaladas en el entorno base.")
+                return
+            # El pool se indexa por nombres de dependencias: sus versiones pueden no ser las del lock
+            outdated = outdated_requirements(os.path.join(self.work_path, requirements),
+                                             installed_distributions(os.path.join(self.work_path, "venv")))
+            if not outdated:
+                self.on_output(f"El entorno base ya coincide con {LOCK_FILE}.")
+                return
+            self.on_output(f"El entorno base difiere de {LOCK_FILE} en {len(outdated)} paquetes; sincronizando...")
+        if self._venv_existing:
+            self._install_missing(python_cmd, requirements)
+            return
+        try:
+            with self.limiter, self.tracer.span("install_requirements", "install",
+                                                 requirements=requirements) as span:
+                self.installer = install_requirements(
+                    self._runner("install", retry=True), python_cmd, requirements, self.work_path, self.on_output,
+                    preferred=self.options["installer"], use_wheelhouse=self.options["use_wheelhouse"],
+                )
+                span["backend"] = self.installer
+        except (OSError, subprocess.CalledProcessError) as e:
+            self._check_cancel()
+            self.on_warning(f"No se pudieron instalar las dependencias: {str(e)}")
+            return
+        if self._pool_key:
+            try:
+                self._pool.store(self._pool_key, os.path.join(self.work_path, "venv"), replace=self._venv_from_pool)
+            except OSError as e:
+                self.on_output(f"No se pudo guardar el entorno base: {e}")
+
+    def _install_missing(self, python_cmd, requirements):
+        """Instala en el venv existente solo los paquetes que todavía no tiene"""
+        installed = installed_distributions(os.path.join(self.work_path, "venv"))
+        missing = missing_requirements(os.path.join(self.work_path, requirements), installed)
+        if not missing:
+            self.on_output("Todas las dependencias ya están instaladas.")
+            return
+        self.on_output(f"Faltan {len(missing)} paquetes en el entorno existente.")
+        partial = f".scaffolder-missing-{uuid.uuid4().hex[:8]}.txt"
+        with open(os.path.join(self.work_path, partial), "w") as f:
+            f.write("".join(line + "\n" for line in missing))
+        try:
+            with self.limiter, self.tracer.span("install_requirements", "install",
+                                                 requirements=requirements, packages=len(missing)) as span:
+                self.installer = install_requirements(
+                    self._runner("install", retry=True), python_cmd, partial, self.work_path, self.on_output,
+                    preferred=self.options["installer"], use_wheelhouse=self.options["use_wheelhouse"],
+                )
+                span["backend"] = self.installer
+        except (OSError, subprocess.CalledProcessError) as e:
+            self._check_cancel()
+            self.on_warning(f"No se pudieron instalar las dependencias: {str(e)}")
+        finally:
+            os.remove(os.path.join(self.work_path, partial))
+
+    def _finalize(self):
+        """Reemplaza la carpeta destino por la preparada con renombrados; la anterior se borra en segundo plano"""
+        self._check_cancel()
+        target_path = self.options["target_path"]
+        old_path = None
+        if os.path.exists(target_path):
+            old_path = _sibling_path(target_path, "old")
+            os.rename(target_path, old_path)
+        try:
+            os.rename(self.work_path, target_path)
+        except OSError:
+            if old_path:
+                os.rename(old_path, target_path)
+            raise
+        staged_venv = os.path.join(self.work_path, "venv")
+        self.work_path = target_path
+        if old_path:
+            remove_tree_later(old_path)
+        venv_path = os.path.join(target_path, "venv")
+        if os.path.isdir(venv_path):
+            relocate_venv(venv_path, staged_venv)
+
+    def _on_step_start(self, label):
+        self._check_cancel()
+        self.on_step_start(label)
+
+    def run(self):
+        """Genera el proyecto en una carpeta temporal junto al destino y la mueve al final.
+
+        Ante un error o cancelación solo se descarta la carpeta temporal. En modo
+        actualización se trabaja directamente sobre el proyecto existente.
+        """
+        target_path = self.options["target_path"]
+        if os.path.exists(target_path) and not (self.options["overwrite"] or self.options["update"]):
+            raise FileExistsError(f"La carpeta '{target_path}' ya existe.")
+        if self.options["update"] and os.path.isdir(target_path):
+            self.work_path = target_path
+            return self._run_steps()
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        sweep_leftovers(target_path)
+        self.work_path = _sibling_path(target_path, "staging")
+        os.mkdir(self.work_path)
+        return self._run_steps()
+
+    def _run_steps(self):
+        try:
+            # Armar el grafo ya renderiza el plan (clave del snapshot): un error de plantilla
+            # también tiene que descartar la carpeta temporal
+            self.graph = self._build_graph()
+            if self._snapshot_key:
+                self._snapshots.record(self._snapshot_hit)
+            self.on_plan(len(self.graph))
+            with self.tracer.span(self.options["name"], "run", template=self.options["project_type"]):
+                self.graph.run(on_start=self._on_step_start, on_finish=self.on_step_finish,
+                               on_error=lambda exc: self.cancel(), tracer=self.tracer)
+            self._check_cancel()
+            self._save_file_hashes()
+            self.on_output(self.graph.report())
+        except BaseException:
+            self._rollback()
+            raise
+        finally:
+            self._write_trace()
+        return self.graph
+
+    def _save_file_hashes(self):
+        if self._file_hashes is None:
+            return
+        try:
+            save_file_hashes(self.options["target_path"], self._file_hashes)
+        except OSError as e:
+            self.on_output(f"No se pudo registrar el estado de los archivos generados: {e}")
+
+    def _write_trace(self):
+        if not self.options.get("trace"):
+            return
+        try:
+            path = trace_path(self.options["name"])
+            self.tracer.write_jsonl(path)
+            self.trace_files = [path]
+            if self.options.get("chrome_trace"):
+                chrome_path = path[:-len(".jsonl")] + ".trace.json"
+                self.tracer.write_chrome(chrome_path)
+                self.trace_files.append(chrome_path)
+        except OSError as e:
+            self.on_output(f"No se pudo guardar la traza: {e}")
+            return
+        self.on_output("Traza guardada en " + ", ".join(self.trace_files))
+
+    def _rollback(self):
+        if self.work_path != self.options["target_path"] and os.path.exists(self.work_path):
+            self.on_output("Descartando la carpeta temporal...")
+            remove_tree_later(self.work_path)
+
+
+STALE_STAGING_SECONDS = 24 * 3600
+
+
+def _sibling_path(path, kind):
+    """Carpeta oculta junto a `path`; lleva el PID del proceso dueño para poder reclamarla si muere"""
+    parent, name = os.path.split(path)
+    return os.path.join(parent, f".{name}.{kind}-{os.getpid()}-{uuid.uuid4().hex[:8]}")
+
+
+def _stale_staging(path):
+    suffix = os.path.basename(path).rsplit(".staging-", 1)[-1].split("-")
+    if len(suffix) == 2 and suffix[0].isdigit():
+        return not pid_alive(int(suffix[0]))
+    # Sin PID (creada por una versión anterior): solo si nadie la tocó en un día
+    try:
+        return time.time() - os.path.getmtime(path) > STALE_STAGING_SECONDS
+    except OSError:
+        return False
+
+
+def sweep_leftovers(target_path):
+    """Descarta las carpetas que dejaron generaciones anteriores de `target_path`: las copias
+    viejas de un reemplazo y las carpetas temporales de procesos que ya no existen"""
+    parent, name = os.path.split(target_path)
+    prefix = os.path.join(glob.escape(parent), f".{glob.escape(name)}.")
+    for leftover in glob.glob(prefix + "old-*"):
+        remove_tree_later(leftover)
+    for staging in glob.glob(prefix + "staging-*"):
+        if _stale_staging(staging):
+            remove_tree_later(staging)
+
+
+_cleanup_threads = []
+
+
+def remove_tree_later(path):
+    """Borra `path` en un hilo aparte para no demorar a quien lo llama"""
+    thread = threading.Thread(target=shutil.rmtree, args=(path, True), name="scaffolder-cleanup")
+    thread.start()
+    _cleanup_threads.append(thread)
+    return thread
+
+
+def wait_for_cleanups():
+    while _cleanup_threads:
+        _cleanup_threads.pop().join()
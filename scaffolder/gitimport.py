@@ -0,0 +1,79 @@
+import os
+import re
+import time
+
+from .writer import encode_content
+
+FALLBACK_IDENT = "Python Port-Scaffolder <scaffolder@localhost>"
+COMMIT_MESSAGE = "Commit inicial generado por Python Port-Scaffolder\n"
+_ESCAPES = {b"a": b"\a", b"b": b"\b", b"f": b"\f", b"n": b"\n", b"r": b"\r", b"t": b"\t", b"v": b"\v",
+            b'"': b'"', b"\\": b"\\"}
+
+
+def unquote_path(path):
+    """Deshace las comillas estilo C con que git muestra las rutas con caracteres especiales"""
+    if not (path.startswith('"') and path.endswith('"')):
+        return path
+    def replace(match):
+        escape = match.group(1)
+        return _ESCAPES.get(escape) or bytes([int(escape, 8)])
+    raw = re.sub(rb'\\([0-7]{3}|.)', replace, path[1:-1].encode("utf-8"))
+    return raw.decode("utf-8", errors="surrogateescape")
+
+
+def _quote_path(path):
+    if "\n" not in path and not path.startswith('"'):
+        return path.encode("utf-8", errors="surrogateescape")
+    return b'"' + path.encode("utf-8", errors="surrogateescape").replace(b"\\", b"\\\\").replace(
+        b'"', b'\\"').replace(b"\n", b"\\n") + b'"'
+
+
+def _data(payload):
+    return b"data %d\n" % len(payload), payload, b"\n"
+
+
+def head_ref(git_dir):
+    """Rama a la que apunta HEAD en un repositorio recién creado (según init.defaultBranch)"""
+    try:
+        with open(os.path.join(git_dir, "HEAD"), encoding="utf-8") as f:
+            head = f.read().strip()
+    except OSError:
+        return "refs/heads/master"
+    return head[len("ref: "):] if head.startswith("ref: ") else "refs/heads/master"
+
+
+def fallback_ident():
+    return f"{FALLBACK_IDENT} {int(time.time())} {time.strftime('%z') or '+0000'}"
+
+
+def fast_import_stream(root, paths, planned, ref, ident, message=COMMIT_MESSAGE):
+    """Bloques de bytes para `git fast-import` con un único commit de `paths` en `ref`.
+
+    El contenido de los archivos del plan (`planned`, {ruta: texto}) sale de memoria y
+    el del resto (requirements.lock, archivos de los pasos finales) se lee del disco.
+    Devuelve (bloques, cantidad de archivos, bytes).
+    """
+    chunks = [b"commit %s\n" % ref.encode(), b"committer %s\n" % ident.encode("utf-8")]
+    chunks.extend(_data(message.encode("utf-8")))
+    files = 0
+    size = 0
+    for rel in paths:
+        path = os.path.join(root, *rel.split("/"))
+        if os.path.islink(path):
+            mode, payload = b"120000", os.readlink(path).encode("utf-8", errors="surrogateescape")
+        else:
+            mode = b"100755" if os.name != 'nt' and os.access(path, os.X_OK) else b"100644"
+            if rel in planned:
+                payload = encode_content(planned[rel])
+            else:
+                try:
+                    with open(path, "rb") as f:
+                        payload = f.read()
+                except (FileNotFoundError, IsADirectoryError):
+                    continue
+        chunks.append(b"M %s inline %s\n" % (mode, _quote_path(rel)))
+        chunks.extend(_data(payload))
+        files += 1
+        size += len(payload)
+    chunks.append(b"done\n")
+    return chunks, files, size
@@ -0,0 +1,200 @@
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .lock import read_requirement_lines, requirement_name, write_unhashed
+from .paths import cache_dir
+from .process import CommandTimeout
+from .venvpool import venv_python
+from .wheelhouse import Wheelhouse
+
+HISTORY_SIZE = 20
+
+
+def missing_requirements(path, installed):
+    """Líneas de `path` cuyo paquete no figura en `installed` (nombres normalizados)"""
+    return [line for line in read_requirement_lines(path) if requirement_name(line) not in installed]
+
+
+def outdated_requirements(path, installed):
+    """Líneas de `path` que no coinciden con `installed` ({nombre normalizado: versión}): paquetes
+    que faltan o que están fijados con == a otra versión"""
+    outdated = []
+    for line in read_requirement_lines(path):
+        name = requirement_name(line)
+        pin = line.split(" --hash")[0].partition("==")[2].split(";")[0].strip()
+        if name not in installed or (pin and installed[name] != pin):
+            outdated.append(line)
+    return outdated
+
+
+class Installer:
+    """Backend de instalación; `run(cmd, cwd)` ejecuta un comando y lanza CalledProcessError si falla"""
+    name = ""
+
+    def available(self):
+        return True
+
+    def install(self, run, python_cmd, requirements, cwd, log):
+        raise NotImplementedError
+
+
+class PipInstaller(Installer):
+    name = "pip"
+
+    def __init__(self, use_wheelhouse=True):
+        self.use_wheelhouse = use_wheelhouse
+
+    def install(self, run, python_cmd, requirements, cwd, log):
+        if self.use_wheelhouse:
+            Wheelhouse().install(run, python_cmd, requirements, cwd, log=log)
+        else:
+            run([python_cmd, "-m", "pip", "install", "-r", requirements], cwd)
+
+
+class ParallelPipInstaller(Installer):
+    """Construye/descarga cada wheel en paralelo y después instala todo sin red de una vez"""
+    name = "pip-parallel"
+
+    def __init__(self, use_wheelhouse=True, jobs=None):
+        self.use_wheelhouse = use_wheelhouse
+        self.jobs = jobs or min(8, (os.cpu_count() or 2) * 2)
+
+    def install(self, run, python_cmd, requirements, cwd, log):
+        lines = read_requirement_lines(os.path.join(cwd, requirements))
+        # Un lockfile ya trae el cierre completo de dependencias
+        no_deps = requirements.endswith(".lock")
+        with tempfile.TemporaryDirectory() as tmp:
+            target = Wheelhouse().path if self.use_wheelhouse else os.path.join(tmp, "wheels")
+            os.makedirs(target, exist_ok=True)
+
+            def fetch(index_line):
+                index, line = index_line
+                req_file = os.path.join(tmp, f"req-{index}.txt")
+                with open(req_file, "w") as f:
+                    f.write(line + "\n")
+                cmd = [python_cmd, "-m", "pip", "wheel", "-q", "-w", target, "-r", req_file]
+                if no_deps:
+                    cmd.append("--no-deps")
+                run(cmd, cwd)
+
+            log(f"Preparando {len(lines)} wheels con {self.jobs} descargas en paralelo...")
+            with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+                list(pool.map(fetch, enumerate(lines)))
+
+            pins = write_unhashed(os.path.join(cwd, requirements), os.path.join(tmp, "pins.txt"))
+            run([python_cmd, "-m", "pip", "install", "--no-index", "--find-links", target, "-r", pins], cwd)
+
+
+class UvInstaller(Installer):
+    name = "uv"
+
+    def __init__(self):
+        self.executable = shutil.which("uv")
+
+    def available(self):
+        return self.executable is not None
+
+    def install(self, run, python_cmd, requirements, cwd, log):
+        run([self.executable, "pip", "install", "--python", python_cmd, "-r", requirements], cwd)
+
+
+def all_installers(use_wheelhouse=True):
+    return [UvInstaller(), ParallelPipInstaller(use_wheelhouse), PipInstaller(use_wheelhouse)]
+
+
+class InstallerStats:
+    """Tiempos de instalación registrados en esta máquina, en segundos por paquete"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(cache_dir(), "installer-timings.json")
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def record(self, backend, seconds, packages):
+        data = self.load()
+        history = data.setdefault(backend, [])
+        history.append(seconds / max(packages, 1))
+        del history[:-HISTORY_SIZE]
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    def medians(self):
+        return {backend: statistics.median(values) for backend, values in self.load().items() if values}
+
+
+def choose_installers(preferred="auto", use_wheelhouse=True, stats=None):
+    """Backends disponibles en orden de preferencia; pip siempre queda como último recurso"""
+    installers = [i for i in all_installers(use_wheelhouse) if i.available()]
+    if preferred and preferred != "auto":
+        installers.sort(key=lambda i: i.name != preferred)
+        return installers
+    medians = (stats or InstallerStats()).medians()
+    if medians:
+        default_order = {i.name: n for n, i in enumerate(installers)}
+        installers.sort(key=lambda i: (medians.get(i.name, float("inf")), default_order[i.name]))
+    return installers
+
+
+def install_requirements(run, python_cmd, requirements, cwd, log, preferred="auto", use_wheelhouse=True):
+    """Instala con el backend más rápido disponible, pasando al siguiente si falla; devuelve su nombre"""
+    stats = InstallerStats()
+    packages = len(read_requirement_lines(os.path.join(cwd, requirements)))
+    installers = choose_installers(preferred, use_wheelhouse, stats)
+    for n, installer in enumerate(installers):
+        start = time.perf_counter()
+        try:
+            installer.install(run, python_cmd, requirements, cwd, log)
+        except CommandTimeout:
+            # Otro backend volvería a esperar el tiempo máximo completo
+            raise
+        except subprocess.CalledProcessError:
+            if n == len(installers) - 1:
+                raise
+            log(f"Falló la instalación con {installer.name}; probando con {installers[n + 1].name}...")
+            continue
+        elapsed = time.perf_counter() - start
+        stats.record(installer.name, elapsed, packages)
+        log(f"Dependencias instaladas con {installer.name} en {elapsed:.2f} s")
+        return installer.name
+
+
+def benchmark_installers(requirements, python_cmd, log=print):
+    """Instala `requirements` en un venv nuevo con cada backend disponible y registra los tiempos"""
+    stats = InstallerStats()
+    results = {}
+
+    def run(cmd, cwd):
+        subprocess.run(cmd, cwd=cwd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    for installer in all_installers(use_wheelhouse=False):
+        if not installer.available():
+            continue
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "requirements.txt"), "w") as f:
+                f.write("".join(f"{r}\n" for r in requirements))
+            venv_path = os.path.join(tmp, "venv")
+            run([python_cmd, "-m", "venv", venv_path], tmp)
+            start = time.perf_counter()
+            try:
+                installer.install(run, venv_python(venv_path), "requirements.txt", tmp, lambda message: None)
+            except subprocess.CalledProcessError:
+                log(f"{installer.name:14} falló")
+                continue
+            elapsed = time.perf_counter() - start
+        stats.record(installer.name, elapsed, len(requirements))
+        results[installer.name] = elapsed
+        log(f"{installer.name:14} {elapsed:8.2f} s")
+    return results
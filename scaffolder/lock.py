@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import tempfile
+from urllib.parse import unquote, urlparse
+
+from .paths import cache_dir
+
+LOCK_FILE = "requirements.lock"
+_REQUIREMENT = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)(.*)$")
+
+
+def canonical_name(name):
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def requirement_name(line):
+    """Nombre normalizado del paquete de una línea de requisitos, o None si no es un requisito"""
+    match = _REQUIREMENT.match(line)
+    return canonical_name(match.group(1)) if match else None
+
+
+def read_requirement_lines(path):
+    """Líneas de requisitos de un requirements/lock, uniendo las continuaciones con barra invertida"""
+    with open(path, encoding="utf-8") as f:
+        text = f.read().replace("\\\n", " ")
+    return [line.strip() for line in text.splitlines() if line.strip() and not line.lstrip().startswith("#")]
+
+
+def write_unhashed(path, dst):
+    """Copia los requisitos de `path` en `dst` sin las opciones --hash.
+
+    Las wheels construidas localmente a partir de un sdist no coinciden con los hashes
+    del índice, que ya se verificaron al descargar el sdist.
+    """
+    with open(dst, "w", encoding="utf-8") as f:
+        f.write("".join(line.split(" --hash")[0].rstrip() + "\n" for line in read_requirement_lines(path)))
+    return dst
+
+
+def normalize_requirements(requirements):
+    """Quita duplicados (por nombre normalizado, conservando el primero) y líneas vacías"""
+    seen = set()
+    result = []
+    for line in requirements:
+        line = line.strip()
+        match = _REQUIREMENT.match(line)
+        if not match:
+            continue
+        key = canonical_name(match.group(1))
+        if key in seen:
+            continue
+        seen.add(key)
+        result.append(match.group(1) + match.group(2).strip())
+    return result
+
+
+def _canonical_requirement(line):
+    match = _REQUIREMENT.match(line)
+    return canonical_name(match.group(1)) + match.group(2).replace(" ", "").lower()
+
+
+def lock_key(requirements):
+    spec = {
+        "requirements": sorted(_canonical_requirement(r) for r in normalize_requirements(requirements)),
+        "python": ".".join(platform.python_version_tuple()[:2]),
+        "platform": f"{platform.system()}-{platform.machine()}",
+    }
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:24]
+
+
+def _file_sha256(url):
+    path = unquote(urlparse(url).path)
+    if os.name == 'nt' and path.startswith("/"):
+        path = path[1:]
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def _pins_from_report(report):
+    pins = []
+    for item in report.get("install", []):
+        metadata = item.get("metadata", {})
+        info = item.get("download_info", {})
+        archive = info.get("archive_info", {})
+        digest = archive.get("hashes", {}).get("sha256")
+        if not digest and archive.get("hash", "").startswith("sha256="):
+            digest = archive["hash"].split("=", 1)[1]
+        if not digest and info.get("url", "").startswith("file:"):
+            digest = _file_sha256(info["url"])
+        pins.append((canonical_name(metadata["name"]), metadata["version"], digest))
+    return sorted(pins)
+
+
+def format_lock(pins, requirements):
+    lines = [
+        "# Generado por Python Port-Scaffolder; no editar a mano.",
+        "# Dependencias: " + ", ".join(requirements),
+        f"# Python {platform.python_version()} / {platform.system()} {platform.machine()}",
+    ]
+    with_hashes = all(digest for _, _, digest in pins)
+    for name, version, digest in pins:
+        if with_hashes:
+            lines.append(f"{name}=={version} \\\n    --hash=sha256:{digest}")
+        else:
+            lines.append(f"{name}=={version}")
+    return "\n".join(lines) + "\n"
+
+
+class LockCache:
+    """Resoluciones de dependencias ya calculadas, por conjunto normalizado de dependencias"""
+
+    def __init__(self, path=None):
+        self.path = path or cache_dir("locks")
+
+    def _entry(self, key):
+        return os.path.join(self.path, key + ".lock")
+
+    def get(self, key):
+        try:
+            with open(self._entry(key), encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, key, content):
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp, self._entry(key))
+
+    def clear(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.makedirs(self.path, exist_ok=True)
+
+
+def resolve(requirements, python_cmd, run, cache=None, refresh=False):
+    """Devuelve el contenido del lockfile para `requirements`, resolviéndolo con pip si no está en caché.
+
+    `run(cmd, cwd)` ejecuta un comando y lanza CalledProcessError si falla.
+    """
+    requirements = normalize_requirements(requirements)
+    cache = cache or LockCache()
+    key = lock_key(requirements)
+    content = None if refresh else cache.get(key)
+    if content is not None:
+        return content, True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        req_file = os.path.join(tmp, "requirements.txt")
+        report_file = os.path.join(tmp, "report.json")
+        with open(req_file, "w") as f:
+            f.write("".join(f"{r}\n" for r in requirements))
+        run([python_cmd, "-m", "pip", "install", "--dry-run", "--ignore-installed", "--quiet",
+             "--report", report_file, "-r", req_file], tmp)
+        try:
+            with open(report_file, encoding="utf-8") as f:
+                report = json.load(f)
+        except (OSError, ValueError) as e:
+            raise subprocess.CalledProcessError(1, "pip --report", str(e))
+
+    content = format_lock(_pins_from_report(report), requirements)
+    cache.put(key, content)
+    return content, False
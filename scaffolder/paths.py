@@ -0,0 +1,32 @@
+import os
+import sys
+
+
+def cache_root():
+    """Carpeta de caché del scaffolder (se puede cambiar con SCAFFOLDER_CACHE_DIR)"""
+    path = os.environ.get("SCAFFOLDER_CACHE_DIR")
+    if not path:
+        if os.name == 'nt':
+            base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+            path = os.path.join(base, "PortScaffolder", "Cache")
+        elif sys.platform == "darwin":
+            path = os.path.expanduser("~/Library/Caches/PortScaffolder")
+        else:
+            base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+            path = os.path.join(base, "port-scaffolder")
+    return path
+
+
+def cache_dir(*parts):
+    path = os.path.join(cache_root(), *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def config_dir():
+    """Carpeta de configuración del usuario (plantillas propias, etc.)"""
+    if os.name == 'nt':
+        base = os.environ.get("APPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "PortScaffolder")
+    base = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    return os.path.join(base, "port-scaffolder")
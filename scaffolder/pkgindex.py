@@ -0,0 +1,215 @@
+import bisect
+import gzip
+import html
+import json
+import os
+import re
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from .paths import cache_dir
+
+INDEX_URL = (os.environ.get("SCAFFOLDER_INDEX_URL") or os.environ.get("PIP_INDEX_URL")
+             or "https://pypi.org/simple/")
+SIMPLE_JSON = "application/vnd.pypi.simple.v1+json"
+DEFAULT_MAX_AGE_DAYS = 7
+# Con consultas más cortas solo se buscan prefijos: la búsqueda difusa devolvería casi todo el índice
+FUZZY_MIN_LENGTH = 3
+_PRERELEASE = re.compile(r"(a|b|rc|dev|alpha|beta|pre)\d*", re.IGNORECASE)
+_ANCHOR = re.compile(r"<a\s[^>]*>([^<]*)</a>", re.IGNORECASE)
+
+
+def normalize_name(name):
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def _version_key(version):
+    return [(0, int(part), "") if part.isdigit() else (-1, 0, part) for part in re.findall(r"\d+|[a-z]+", version.lower())]
+
+
+def _latest_version(versions):
+    stable = [v for v in versions if not _PRERELEASE.search(v)]
+    candidates = stable or list(versions)
+    return max(candidates, key=_version_key) if candidates else None
+
+
+def _get_simple(url, timeout):
+    """Página del índice simple en la forma JSON de PEP 691; si el servidor solo habla HTML (PEP 503) se convierte"""
+    request = urllib.request.Request(url, headers={"Accept": f"{SIMPLE_JSON}, text/html;q=0.1"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        content_type = response.headers.get("Content-Type", "")
+        body = response.read().decode("utf-8", errors="replace")
+    if "json" in content_type:
+        return json.loads(body)
+    texts = [html.unescape(text).strip() for text in _ANCHOR.findall(body)]
+    return {"projects": [{"name": t} for t in texts], "files": [{"filename": t} for t in texts]}
+
+
+class PackageIndex:
+    """Índice local de paquetes: nombres normalizados del índice (gzip, uno por línea, ordenados)
+    y la última versión y disponibilidad de wheels de los más usados.
+
+    La búsqueda corre con expresiones regulares sobre un único texto con un nombre
+    por línea, y es incremental: si la consulta nueva extiende a la anterior solo
+    se filtran los resultados previos. Se puede buscar desde un hilo mientras otro
+    carga o actualiza los nombres.
+    """
+
+    def __init__(self, path=None, seed=(), index_url=None):
+        self.path = path or cache_dir("index")
+        self.index_url = index_url or INDEX_URL
+        self.seed = list(seed)
+        self.details = {}
+        self._names = []
+        self._blob = ""
+        self._last = (None, None)
+        self._lock = threading.Lock()
+        self._set_names(())
+
+    @property
+    def names_file(self):
+        return os.path.join(self.path, "names.txt.gz")
+
+    @property
+    def details_file(self):
+        return os.path.join(self.path, "details.json")
+
+    def __len__(self):
+        return len(self._names)
+
+    def _set_names(self, names):
+        """`names` ya normalizados y ordenados, como están en el archivo"""
+        names = list(names)
+        missing = {normalize_name(name) for name in self.seed}.difference(names)
+        if missing:
+            names = sorted(set(names).union(missing))
+        blob = "\n".join(names)
+        with self._lock:
+            self._names, self._blob = names, blob
+            self._last = (None, None)
+
+    def load(self):
+        try:
+            with gzip.open(self.names_file, "rt", encoding="utf-8") as f:
+                self._set_names(f.read().split("\n"))
+        except (OSError, EOFError):
+            pass
+        try:
+            with open(self.details_file, encoding="utf-8") as f:
+                self.details = json.load(f)
+        except (OSError, ValueError):
+            self.details = {}
+        return self
+
+    def age(self):
+        try:
+            return time.time() - os.path.getmtime(self.names_file)
+        except OSError:
+            return None
+
+    def needs_refresh(self, max_age_days=None):
+        if max_age_days is None:
+            max_age_days = float(os.environ.get("SCAFFOLDER_INDEX_MAX_AGE_DAYS", DEFAULT_MAX_AGE_DAYS))
+        age = self.age()
+        return age is None or age > max_age_days * 86400
+
+    def refresh(self, detail_names=None, jobs=8, timeout=30):
+        """Descarga la lista de nombres del índice y los detalles de `detail_names` (por defecto la semilla)"""
+        data = _get_simple(self.index_url, timeout)
+        names = sorted({normalize_name(project["name"]) for project in data.get("projects", ())})
+        os.makedirs(self.path, exist_ok=True)
+        tmp = self.names_file + ".tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=9) as f:
+            f.write("\n".join(names))
+        os.replace(tmp, self.names_file)
+        self._set_names(names)
+        self.fetch_details(self.seed if detail_names is None else detail_names, jobs, timeout)
+        return len(names)
+
+    def fetch_details(self, names, jobs=8, timeout=30):
+        """Última versión estable de cada paquete y si la publica como wheel; los fallos se omiten"""
+        def fetch(name):
+            key = normalize_name(name)
+            try:
+                data = _get_simple(f"{self.index_url.rstrip('/')}/{key}/", timeout)
+            except (OSError, ValueError):
+                return key, None
+            files = data.get("files", ())
+            versions = data.get("versions") or sorted({_file_version(f["filename"], key) for f in files} - {None})
+            latest = _latest_version(versions)
+            wheel = any(f["filename"].endswith(".whl") and _file_version(f["filename"], key) == latest
+                        for f in files)
+            return key, {"version": latest, "wheel": wheel, "checked": int(time.time())}
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            for key, info in pool.map(fetch, names):
+                if info is not None:
+                    self.details[key] = info
+        tmp = self.details_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.details, f, separators=(",", ":"))
+        os.replace(tmp, self.details_file)
+
+    def info(self, name):
+        return self.details.get(normalize_name(name))
+
+    def search(self, query):
+        """Nombres que empiezan con `query`; desde FUZZY_MIN_LENGTH caracteres también los que
+        la contienen como subcadena o subsecuencia, en ese orden"""
+        query = normalize_name(query.strip())
+        if not query:
+            return list(self.seed)
+        with self._lock:
+            names, full_blob, (last_query, last_blob) = self._names, self._blob, self._last
+        if len(query) < FUZZY_MIN_LENGTH:
+            start = bisect.bisect_left(names, query)
+            end = bisect.bisect_left(names, query + "\uffff", start)
+            return names[start:end]
+
+        blob = last_blob if last_query and query.startswith(last_query) else full_blob
+        hits = _matching_lines(blob, re.compile("[^\n]*?".join(map(re.escape, query))))
+        with self._lock:
+            # Si los nombres cambiaron mientras se buscaba, el resultado no sirve de base
+            if self._blob is full_blob:
+                self._last = (query, "\n".join(hits))
+
+        prefix, substring, subsequence = [], [], []
+        for name in hits:
+            if name.startswith(query):
+                prefix.append(name)
+            elif query in name:
+                substring.append(name)
+            else:
+                subsequence.append(name)
+        if query in prefix:
+            prefix.remove(query)
+            prefix.insert(0, query)
+        return prefix + substring + subsequence
+
+
+def _matching_lines(blob, pattern):
+    """Líneas de `blob` donde `pattern` encuentra una coincidencia, en orden"""
+    hits = []
+    pos = 0
+    while True:
+        match = pattern.search(blob, pos)
+        if match is None:
+            return hits
+        start = blob.rfind("\n", 0, match.start()) + 1
+        end = blob.find("\n", match.end())
+        if end < 0:
+            end = len(blob)
+        hits.append(blob[start:end])
+        pos = end + 1
+
+
+def _file_version(filename, key):
+    """Versión a partir del nombre de una wheel o sdist (`nombre-1.2.3-...whl`, `nombre-1.2.3.tar.gz`)"""
+    stem = re.sub(r"\.(whl|tar\.gz|zip|tar\.bz2|egg)$", "", filename)
+    parts = stem.split("-")
+    for i in range(1, len(parts)):
+        if normalize_name("-".join(parts[:i])) == key:
+            return parts[i]
+    return None
@@ -0,0 +1,186 @@
+import asyncio
+import collections
+import os
+import random
+import re
+import signal
+import subprocess
+import threading
+import time
+
+from .timeouts import DEFAULT_RETRIES, RETRY_BACKOFF
+
+OUTPUT_TAIL = 50
+_STREAM_LIMIT = 1024 * 1024
+# Errores de red o del índice que suelen resolverse reintentando
+TRANSIENT = re.compile(
+    r"ConnectionError|ConnectTimeout|ReadTimeout|timed out|Connection (reset|refused|aborted)"
+    r"|Temporary failure in name resolution|Name or service not known|RemoteDisconnected"
+    r"|IncompleteRead|ProtocolError|HTTP error 5\d\d|\b5\d\d Server Error|SSLError"
+    r"|error sending request|failed to fetch",
+    re.IGNORECASE,
+)
+
+
+class CommandTimeout(subprocess.CalledProcessError):
+    """Un comando superó su tiempo máximo y se terminó junto con sus procesos hijos.
+
+    Hereda de CalledProcessError para que quien ya maneja comandos fallidos (advertencias)
+    trate igual un comando colgado; los respaldos de instalación la dejan pasar para no volver
+    a esperar el tiempo máximo con otro backend o método.
+    """
+
+    def __init__(self, cmd, timeout, output=None):
+        super().__init__(-signal.SIGKILL if hasattr(signal, "SIGKILL") else 1, cmd, output)
+        self.timeout = timeout
+
+    def __str__(self):
+        return f"El comando '{' '.join(self.cmd)}' superó el tiempo máximo de {self.timeout:g} s"
+
+
+def is_transient(error):
+    # Un comando que agotó su tiempo no se reintenta: con los tiempos de install (1800 s)
+    # cada reintento volvería a bloquear el paso durante media hora
+    if isinstance(error, CommandTimeout):
+        return False
+    return isinstance(error, subprocess.CalledProcessError) and bool(TRANSIENT.search(error.output or ""))
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def shared_loop():
+    """Loop de asyncio, en un hilo propio, donde corren los subprocesos de todos los proyectos del proceso"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="scaffolder-subprocess-loop", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+def kill_tree(pid):
+    """Termina el proceso `pid` y todo su grupo (los comandos se lanzan en una sesión propia)"""
+    if os.name == 'nt':
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    else:
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+def pid_alive(pid):
+    """True si existe un proceso con `pid` (ante la duda, por ejemplo sin permisos, también True)"""
+    if os.name == 'nt':
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return kernel32.GetLastError() == 5  # ERROR_ACCESS_DENIED: existe pero es de otro usuario
+        try:
+            code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+            return code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+async def run_async(cmd, cwd=None, on_line=None, timeout=None, on_spawn=None, input=None):
+    """Ejecuta `cmd` leyendo stdout y stderr a medida que llegan.
+
+    `on_line(stream, line)` recibe cada línea ("stdout" o "stderr") y `on_spawn(proc)`
+    el proceso recién creado; `input` es una secuencia de bloques de bytes que se
+    escriben en stdin. Devuelve (código de salida, últimas líneas, líneas por stream);
+    con `timeout` el árbol de procesos se termina y se lanza CommandTimeout.
+    """
+    kwargs = {}
+    if os.name == 'nt':
+        kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, cwd=cwd, stdin=subprocess.DEVNULL if input is None else subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        limit=_STREAM_LIMIT, **kwargs)
+    if on_spawn:
+        on_spawn(proc)
+    tail = collections.deque(maxlen=OUTPUT_TAIL)
+    counts = {"stdout": 0, "stderr": 0}
+
+    async def pump(stream, name):
+        while True:
+            try:
+                raw = await stream.readline()
+            except ValueError:
+                # Línea más larga que el límite del buffer: se descarta el resto
+                raw = await stream.read(_STREAM_LIMIT)
+            if not raw:
+                return
+            line = raw.decode(errors="replace").rstrip()
+            counts[name] += 1
+            tail.append(line)
+            if on_line:
+                on_line(name, line)
+
+    async def feed():
+        try:
+            for chunk in input:
+                proc.stdin.write(chunk)
+                await proc.stdin.drain()
+            proc.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            # El proceso terminó antes de leer todo; su código de salida informa el error
+            pass
+
+    tasks = [pump(proc.stdout, "stdout"), pump(proc.stderr, "stderr"), proc.wait()]
+    if input is not None:
+        tasks.append(feed())
+    pumps = asyncio.gather(*tasks)
+    try:
+        await asyncio.wait_for(pumps, timeout)
+    except asyncio.TimeoutError:
+        kill_tree(proc.pid)
+        await proc.wait()
+        raise CommandTimeout(cmd, timeout, "\n".join(tail)) from None
+    except asyncio.CancelledError:
+        kill_tree(proc.pid)
+        raise
+    return proc.returncode, list(tail), counts
+
+
+def run_command(cmd, cwd=None, on_line=None, timeout=None, on_spawn=None, input=None):
+    """Versión bloqueante de `run_async` para llamar desde cualquier hilo; usa el loop compartido"""
+    future = asyncio.run_coroutine_threadsafe(run_async(cmd, cwd, on_line, timeout, on_spawn, input),
+                                              shared_loop())
+    return future.result()
+
+
+def with_retries(run, attempts=DEFAULT_RETRIES + 1, backoff=RETRY_BACKOFF, on_retry=None, should_stop=None):
+    """Envuelve `run(cmd, cwd)` para reintentar con espera exponencial los fallos transitorios"""
+    def run_with_retries(cmd, cwd=None):
+        for attempt in range(1, attempts + 1):
+            try:
+                return run(cmd, cwd)
+            except subprocess.CalledProcessError as e:
+                if attempt == attempts or not is_transient(e) or (should_stop and should_stop()):
+                    raise
+                delay = backoff * 2 ** (attempt - 1) * random.uniform(0.8, 1.2)
+                if on_retry:
+                    on_retry(e, attempt, delay)
+                deadline = time.monotonic() + delay
+                while time.monotonic() < deadline:
+                    if should_stop and should_stop():
+                        raise
+                    time.sleep(min(0.1, delay))
+    return run_with_retries
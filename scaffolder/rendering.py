@@ -0,0 +1,56 @@
+import functools
+import os
+import re
+
+TEMPLATE_FILES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "template_files")
+TEMPLATE_SUFFIX = ".tmpl"
+PLACEHOLDER = re.compile(r"@\{(\w+)\}")
+
+
+class CompiledTemplate:
+    """Cuerpo de plantilla ya separado en texto fijo y variables `@{nombre}`"""
+
+    __slots__ = ("_parts", "names")
+
+    def __init__(self, text):
+        self._parts = PLACEHOLDER.split(text)
+        self.names = frozenset(self._parts[1::2])
+
+    def render(self, context):
+        if len(self._parts) == 1:
+            return self._parts[0]
+        parts = list(self._parts)
+        for i in range(1, len(parts), 2):
+            try:
+                parts[i] = str(context[parts[i]])
+            except KeyError:
+                raise KeyError(f"Variable de plantilla desconocida: @{{{parts[i]}}}") from None
+        return "".join(parts)
+
+
+@functools.lru_cache(maxsize=None)
+def compile_file(path):
+    with open(path, encoding="utf-8") as f:
+        return CompiledTemplate(f.read())
+
+
+@functools.lru_cache(maxsize=256)
+def compile_text(text):
+    return CompiledTemplate(text)
+
+
+def builtin_path(*parts):
+    return os.path.join(TEMPLATE_FILES, *parts)
+
+
+def scan_sources(directory):
+    """Rutas relativas (con / y sin el sufijo .tmpl) de los cuerpos de plantilla en `directory`"""
+    sources = {}
+    for root, _, names in os.walk(directory):
+        for fname in names:
+            path = os.path.join(root, fname)
+            rel = os.path.relpath(path, directory).replace(os.sep, "/")
+            if rel.endswith(TEMPLATE_SUFFIX):
+                rel = rel[:-len(TEMPLATE_SUFFIX)]
+            sources[rel] = path
+    return sources
@@ -0,0 +1,383 @@
+"""Servicio local de generación de proyectos por HTTP (TCP o socket Unix).
+
+    python app.py --serve --port 8765 --workers 4 --warm fastapi,flask_sqlalchemy
+    curl -X POST localhost:8765/projects -d '{"name": "svc", "type": "fastapi"}'
+    curl localhost:8765/projects/<id>
+    curl localhost:8765/status
+
+El proceso queda vivo entre pedidos, así que las plantillas compiladas, la
+resolución de versiones y los venv base del pool se reutilizan. Los pedidos
+esperan en una cola acotada (si está llena se responde 503) y los atiende un
+número fijo de workers.
+"""
+import asyncio
+import bisect
+import collections
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from .bulk import default_install_slots
+from .engine import ProjectGenerator, project_options, wait_for_cleanups
+from .templates import REGISTRY, plan_project, requirements_for
+from .venvpool import VenvPool
+
+DEFAULT_PORT = 8765
+DEFAULT_QUEUE_SIZE = 32
+MAX_JOBS_KEPT = 500
+MAX_BODY = 1024 * 1024
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class Histogram:
+    """Conteos por intervalos fijos (en segundos), acumulados al estilo Prometheus en `snapshot()`"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+        self._recent = collections.deque(maxlen=1000)
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+        self._recent.append(value)
+
+    def percentile(self, fraction):
+        if not self._recent:
+            return None
+        ordered = sorted(self._recent)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def snapshot(self):
+        cumulative = []
+        running = 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            running += count
+            cumulative.append({"le": bound, "count": running})
+        return {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "buckets": cumulative,
+        }
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+def _within(path, root):
+    path, root = os.path.abspath(path), os.path.abspath(root)
+    return os.path.commonpath([path, root]) == root
+
+
+class GenerationService:
+    """Cola acotada de pedidos de generación atendida por `workers` tareas asyncio.
+
+    Cada generación corre en un hilo del ejecutor propio del servicio; los venv e
+    instalaciones simultáneos se limitan con `max_installs`, igual que en modo paralelo.
+    """
+
+    def __init__(self, root, workers=2, queue_size=DEFAULT_QUEUE_SIZE, max_installs=None, warm=()):
+        self.root = os.path.abspath(root)
+        self.workers = workers
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.limiter = threading.BoundedSemaphore(max_installs or default_install_slots())
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scaffolder-job")
+        self.jobs = collections.OrderedDict()
+        self._done = {}
+        self.running = 0
+        self.counters = collections.Counter()
+        self.queue_wait = Histogram()
+        self.latency = Histogram()
+        self.warm_templates = list(warm)
+        self.warm_state = {}
+        self.started = time.time()
+        self._tasks = []
+
+    def start(self):
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(loop.create_task(self._warm_up()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self.executor.shutdown(wait=True)
+        wait_for_cleanups()
+
+    def submit(self, spec):
+        """Valida `spec` (mismo formato que una entrada del manifiesto) y la encola; devuelve el pedido"""
+        from .cli import spec_to_options
+
+        if not isinstance(spec, dict):
+            raise HTTPError(400, "El cuerpo debe ser un objeto JSON con la especificación del proyecto.")
+        try:
+            dest = os.path.join(self.root, spec.get("dest", "."))
+            if not _within(dest, self.root):
+                raise HTTPError(400, f"'dest' debe estar dentro de {self.root}.")
+            options = spec_to_options(dict(spec, dest=dest))
+        except (ValueError, TypeError) as e:
+            # TypeError: un campo con un tipo inesperado, p. ej. {"libs": 5}
+            raise HTTPError(400, f"Especificación inválida: {e}")
+        if not _within(options["target_path"], self.root) or options["target_path"] == self.root:
+            raise HTTPError(400, "Nombre de proyecto inválido.")
+        if os.path.exists(options["target_path"]) and not (options["overwrite"] or options["update"]):
+            raise HTTPError(409, f"La carpeta '{options['target_path']}' ya existe.")
+
+        job = {
+            "id": uuid.uuid4().hex[:12],
+            "name": options["name"],
+            "target_path": options["target_path"],
+            "state": "queued",
+            "submitted": time.time(),
+            "started": None,
+            "finished": None,
+            "error": None,
+            "warnings": [],
+            "report": None,
+            "installer": None,
+            "tail": [],
+        }
+        done = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((job, options, done))
+        except asyncio.QueueFull:
+            self.counters["rejected"] += 1
+            raise HTTPError(503, "La cola de generación está llena; reintenta más tarde.",
+                            {"Retry-After": str(self._retry_after())})
+        self.counters["accepted"] += 1
+        self.jobs[job["id"]] = job
+        self._done[job["id"]] = done
+        while len(self.jobs) > MAX_JOBS_KEPT:
+            oldest = next(iter(self.jobs))
+            if self.jobs[oldest]["state"] in ("queued", "running"):
+                break
+            del self.jobs[oldest]
+            del self._done[oldest]
+        return job
+
+    async def wait(self, job_id):
+        """Espera a que termine el pedido `job_id`; si el cliente se desconecta el pedido sigue en curso"""
+        return await asyncio.shield(self._done[job_id])
+
+    def _retry_after(self):
+        mean = self.latency.total / self.latency.count if self.latency.count else 10
+        return max(1, round(mean * self.queue.qsize() / self.workers))
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job, options, done = await self.queue.get()
+            job["state"] = "running"
+            job["started"] = time.time()
+            self.queue_wait.observe(job["started"] - job["submitted"])
+            self.running += 1
+            try:
+                await loop.run_in_executor(self.executor, self._generate, job, options)
+            finally:
+                self.running -= 1
+                job["finished"] = time.time()
+                self.latency.observe(job["finished"] - job["started"])
+                self.counters["succeeded" if job["state"] == "done" else "failed"] += 1
+                if not done.done():
+                    done.set_result(job)
+                self.queue.task_done()
+
+    def _generate(self, job, options):
+        output = []
+        generator = ProjectGenerator(options, on_output=output.append, on_warning=job["warnings"].append,
+                                     limiter=self.limiter)
+        try:
+            graph = generator.run()
+        except Exception as e:
+            job["state"] = "failed"
+            job["error"] = f"{type(e).__name__}: {e}"
+            job["tail"] = output[-20:]
+            return
+        job["state"] = "done"
+        job["report"] = graph.report()
+        job["installer"] = generator.installer
+
+    async def _warm_up(self):
+        """Compila todas las plantillas y prepara en el pool el venv base de las indicadas en `warm`"""
+        loop = asyncio.get_running_loop()
+        # Corre en el ejecutor por defecto del loop para no ocupar a los workers
+        await loop.run_in_executor(None, self._compile_templates)
+        for template_id in self.warm_templates:
+            self.warm_state[template_id] = "pending"
+        for template_id in self.warm_templates:
+            self.warm_state[template_id] = await loop.run_in_executor(None, self._warm_venv, template_id)
+
+    def _compile_templates(self):
+        for template in REGISTRY:
+            try:
+                plan_project(project_options("__warm__", self.root, template.label))
+            except (OSError, KeyError) as e:
+                self.warm_state[template.id] = f"failed: {e}"
+
+    def _warm_venv(self, template_id):
+        if not VenvPool.supported():
+            return "unsupported"
+        try:
+            template = REGISTRY.get(template_id)
+        except KeyError:
+            return "unknown template"
+        if VenvPool().has(VenvPool.key(requirements_for(template.id, ()))):
+            return "ready"
+        workdir = tempfile.mkdtemp(prefix="scaffolder-warm-")
+        warnings = []
+        try:
+            options = project_options("warm", workdir, template.label, extra_files=(), init_git=False,
+                                      use_snapshots=False, trace=False)
+            with self.limiter:
+                ProjectGenerator(options, on_warning=warnings.append).run()
+        except Exception as e:
+            return f"failed: {e}"
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        return "failed: " + warnings[0] if warnings else "ready"
+
+    def status(self):
+        return {
+            "uptime": round(time.time() - self.started, 1),
+            "workers": self.workers,
+            "running": self.running,
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "counters": dict(self.counters),
+            "queue_wait_seconds": self.queue_wait.snapshot(),
+            "latency_seconds": self.latency.snapshot(),
+            "warm_venvs": self.warm_state,
+        }
+
+
+async def _read_request(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise HTTPError(400, "Línea de pedido inválida.")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        length = -1
+    if length < 0:
+        raise HTTPError(400, "Content-Length inválido.")
+    if length > MAX_BODY:
+        raise HTTPError(413, "Cuerpo demasiado grande.")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, body
+
+
+def _write_response(writer, status, payload, headers=None):
+    body = json.dumps(payload, ensure_ascii=False, indent=1).encode("utf-8")
+    lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+             "Content-Type: application/json; charset=utf-8",
+             f"Content-Length: {len(body)}",
+             "Connection: close"]
+    lines += [f"{key}: {value}" for key, value in (headers or {}).items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+
+
+async def _dispatch(service, method, target):
+    url = urlsplit(target)
+    query = parse_qs(url.query)
+    parts = [part for part in url.path.split("/") if part]
+    if parts == ["status"] and method == "GET":
+        return 200, service.status()
+    if parts == ["projects"] and method == "GET":
+        return 200, list(service.jobs.values())
+    if len(parts) == 2 and parts[0] == "projects" and method == "GET":
+        job = service.jobs.get(parts[1])
+        if job is None:
+            raise HTTPError(404, "Pedido desconocido.")
+        if query.get("wait", ["0"])[0] not in ("0", ""):
+            job = await service.wait(parts[1])
+        return 200, job
+    if parts and parts[0] in ("status", "projects"):
+        raise HTTPError(405, "Método no permitido.")
+    raise HTTPError(404, "Ruta desconocida.")
+
+
+def make_handler(service):
+    async def handle(reader, writer):
+        try:
+            try:
+                request = await _read_request(reader)
+                if request is None:
+                    return
+                method, target, body = request
+                if method == "POST" and urlsplit(target).path.rstrip("/") == "/projects":
+                    try:
+                        spec = json.loads(body or b"{}")
+                    except ValueError:
+                        raise HTTPError(400, "El cuerpo no es JSON válido.")
+                    job = service.submit(spec)
+                    if parse_qs(urlsplit(target).query).get("wait", ["0"])[0] not in ("0", ""):
+                        _write_response(writer, 200, await service.wait(job["id"]))
+                    else:
+                        _write_response(writer, 202, job, {"Location": f"/projects/{job['id']}"})
+                else:
+                    status, payload = await _dispatch(service, method, target)
+                    _write_response(writer, status, payload)
+            except HTTPError as e:
+                _write_response(writer, e.status, {"error": str(e)}, e.headers)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return
+            except Exception as e:
+                # Cualquier otro error se responde en lugar de dejar al cliente esperando
+                _write_response(writer, 500, {"error": f"Error interno: {e!r}"})
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+        finally:
+            writer.close()
+    return handle
+
+
+async def serve(root=".", host="127.0.0.1", port=DEFAULT_PORT, socket_path=None, workers=2,
+                queue_size=DEFAULT_QUEUE_SIZE, max_installs=None, warm=(), log=print):
+    service = GenerationService(root, workers, queue_size, max_installs, warm)
+    service.start()
+    handler = make_handler(service)
+    if socket_path:
+        server = await asyncio.start_unix_server(handler, path=socket_path)
+        log(f"Escuchando en {socket_path}")
+    else:
+        server = await asyncio.start_server(handler, host, port)
+        log(f"Escuchando en http://{host}:{port}")
+    log(f"Proyectos en {service.root}; {workers} workers, cola de {queue_size}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
@@ -0,0 +1,224 @@
+import hashlib
+import json
+import os
+import platform
+import shutil
+import sys
+import tarfile
+import tempfile
+import time
+
+from .lock import canonical_name
+from .paths import cache_dir
+from .templates import get_template, plan_project
+from .venvpool import VenvPool, clone_venv, relocate_venv
+from .writer import plan_hashes
+
+DEFAULT_MAX_MB = 4096
+META_FILE = "meta.json"
+# Nunca forman parte del snapshot: el repositorio se inicializa de nuevo en cada proyecto
+EXCLUDED = (".git",)
+
+
+def default_format():
+    fmt = os.environ.get("SCAFFOLDER_SNAPSHOT_FORMAT")
+    if fmt in ("tree", "archive"):
+        return fmt
+    return "tree" if VenvPool.supported() else "archive"
+
+
+def snapshot_key(options, include_venv=False):
+    """Hash de todo lo que determina el resultado de una generación (sin el nombre del proyecto,
+    salvo que la plantilla tenga pasos finales que lo usen)"""
+    template = get_template(options["project_type"], options.get("profile"))
+    plan = plan_project(dict(options, name="__snapshot__"))
+    spec = {
+        "template": template.id,
+        "profile": template.profile,
+        "plan": plan_hashes(plan),
+        "libs": sorted(canonical_name(lib) for lib in options["libs"]),
+        "extra_files": sorted(options["extra_files"]),
+        "requirements": options["create_req"],
+        "lock": options["create_req"] and options["lock"],
+        "venv": bool(include_venv and options["create_venv"]),
+        "python": os.path.realpath(sys.executable),
+        "version": platform.python_version(),
+        "platform": platform.platform(),
+        "name": options["name"] if template.post_steps else None,
+    }
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:24]
+
+
+def _tree_size(path):
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def _ignore_top_level(root):
+    """Filtro para copytree que omite .git y el venv de la carpeta raíz (el venv se copia aparte)"""
+    def ignore(directory, names):
+        if os.path.abspath(directory) != root:
+            return []
+        return [name for name in names if name in EXCLUDED or name == "venv"]
+    return ignore
+
+
+class SnapshotCache:
+    """Proyectos terminados indexados por el hash de su especificación.
+
+    Cada entrada es una carpeta con `meta.json` y el árbol del proyecto (`tree/`, con el
+    venv compartiendo archivos por enlaces duros) o un `snapshot.tar.gz`. Se descartan
+    primero las entradas usadas hace más tiempo cuando el total supera `max_bytes`.
+    """
+
+    def __init__(self, path=None, max_bytes=None, fmt=None):
+        self.path = path or cache_dir("snapshots")
+        if max_bytes is None:
+            max_bytes = int(os.environ.get("SCAFFOLDER_SNAPSHOT_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024
+        self.max_bytes = max_bytes
+        self.format = fmt or default_format()
+
+    def _entry(self, key):
+        return os.path.join(self.path, key)
+
+    def _meta(self, key):
+        try:
+            with open(os.path.join(self._entry(key), META_FILE), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def has(self, key):
+        return self._meta(key) is not None
+
+    def restore(self, key, dst):
+        """Copia el snapshot `key` en `dst` (que ya existe); devuelve sus metadatos"""
+        meta = self._meta(key)
+        if meta is None:
+            raise KeyError(key)
+        entry = self._entry(key)
+        venv_dst = os.path.join(dst, "venv")
+        if meta["format"] == "archive":
+            with tarfile.open(os.path.join(entry, "snapshot.tar.gz")) as tar:
+                if hasattr(tarfile, "data_filter"):
+                    tar.extractall(dst, filter="tar")
+                else:
+                    tar.extractall(dst)
+            if meta["venv"]:
+                relocate_venv(venv_dst, meta["venv_prefix"])
+        else:
+            tree = os.path.join(entry, "tree")
+            shutil.copytree(tree, dst, symlinks=True, dirs_exist_ok=True,
+                            ignore=_ignore_top_level(os.path.abspath(tree)))
+            if meta["venv"]:
+                clone_venv(os.path.join(tree, "venv"), venv_dst)
+        os.utime(os.path.join(entry, META_FILE))
+        return meta
+
+    def store(self, key, project_path, include_venv=False):
+        """Guarda `project_path` (sin .git y, salvo `include_venv`, sin el venv) como snapshot `key`"""
+        if self.has(key):
+            return
+        venv_path = os.path.join(project_path, "venv")
+        include_venv = include_venv and os.path.isdir(venv_path)
+        tmp = tempfile.mkdtemp(prefix=".tmp-", dir=self.path)
+        try:
+            meta = {"format": self.format, "venv": include_venv, "created": time.time()}
+            if self.format == "archive":
+                archive = os.path.join(tmp, "snapshot.tar.gz")
+                with tarfile.open(archive, "w:gz", compresslevel=6) as tar:
+                    for name in sorted(os.listdir(project_path)):
+                        if name in EXCLUDED or (name == "venv" and not include_venv):
+                            continue
+                        tar.add(os.path.join(project_path, name), arcname=name)
+                meta["venv_prefix"] = os.path.abspath(venv_path)
+                meta["bytes"] = os.path.getsize(archive)
+            else:
+                tree = os.path.join(tmp, "tree")
+                shutil.copytree(project_path, tree, symlinks=True,
+                                ignore=_ignore_top_level(os.path.abspath(project_path)))
+                if include_venv:
+                    clone_venv(venv_path, os.path.join(tree, "venv"),
+                               prefix=os.path.join(self._entry(key), "tree", "venv"))
+                meta["bytes"] = _tree_size(tree)
+            with open(os.path.join(tmp, META_FILE), "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            try:
+                os.rename(tmp, self._entry(key))
+            except OSError:
+                return
+            tmp = None
+        finally:
+            if tmp:
+                shutil.rmtree(tmp, ignore_errors=True)
+        self.evict()
+
+    def entries(self):
+        """[(clave, metadatos, último uso)] de la más reciente a la más antigua"""
+        result = []
+        for name in os.listdir(self.path):
+            meta_path = os.path.join(self.path, name, META_FILE)
+            if name.startswith(".") or not os.path.exists(meta_path):
+                continue
+            meta = self._meta(name)
+            if meta is not None:
+                result.append((name, meta, os.path.getmtime(meta_path)))
+        result.sort(key=lambda item: item[2], reverse=True)
+        return result
+
+    def evict(self):
+        total = 0
+        for key, meta, _ in self.entries():
+            total += meta.get("bytes", 0)
+            if total > self.max_bytes:
+                shutil.rmtree(self._entry(key), ignore_errors=True)
+
+    def clear(self):
+        for key, _, _ in self.entries():
+            shutil.rmtree(self._entry(key), ignore_errors=True)
+        self._save_counters({"hits": 0, "misses": 0})
+
+    def _counters_path(self):
+        return os.path.join(self.path, "stats.json")
+
+    def _load_counters(self):
+        try:
+            with open(self._counters_path(), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"hits": 0, "misses": 0}
+
+    def _save_counters(self, counters):
+        tmp = f"{self._counters_path()}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(counters, f)
+        os.replace(tmp, self._counters_path())
+
+    def record(self, hit):
+        counters = self._load_counters()
+        counters["hits" if hit else "misses"] += 1
+        try:
+            self._save_counters(counters)
+        except OSError:
+            pass
+
+    def stats(self):
+        entries = self.entries()
+        counters = self._load_counters()
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            "path": self.path,
+            "format": self.format,
+            "entries": len(entries),
+            "bytes": sum(meta.get("bytes", 0) for _, meta, _ in entries),
+            "max_bytes": self.max_bytes,
+            "hits": counters["hits"],
+            "misses": counters["misses"],
+            "hit_rate": counters["hits"] / lookups if lookups else 0.0,
+        }
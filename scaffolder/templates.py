@@ -0,0 +1,482 @@
+import json
+import os
+import platform
+from dataclasses import dataclass, field, replace
+
+from .paths import config_dir
+from .rendering import TEMPLATE_SUFFIX, builtin_path, compile_file, compile_text, scan_sources
+from .writer import FilePlan, write_plan
+
+EXTRA_FILES = ["README.md", "LICENSE", ".gitignore", "pyproject.toml", "Dockerfile", "setup.py", "Makefile"]
+ADDITIONAL_LIBS = [
+    "numpy", "pandas", "scipy", "scikit-learn", "matplotlib", "seaborn",
+    "plotly", "polars", "requests", "beautifulsoup4", "sqlalchemy",
+    "pillow", "pytest", "black", "flake8", "click", "uvicorn",
+    "fastapi", "jupyter", "ipython", "PyYAML", "h5py",
+    "statsmodels", "lightgbm", "xgboost", "bokeh", "altair", "plotnine",
+    "geoplotlib", "river", "gensim", "nltk", "spacy", "langchain",
+    "hydra", "dask", "duckdb", "cuPy", "scrapy", "paramiko", "lxml",
+    "httpx", "typer", "sphinx", "ruff", "glom", "rich", "textual",
+    "networkx", "python-igraph", "graph-tool", "pygame", "opencv",
+    "manim", "scikit-image"
+]
+
+COMMON_DIRS = ("src", "tests", "docs")
+COMMON_FILES = ("README.md", ".gitignore")
+# Archivos que se agregan junto con un archivo extra elegido
+COMPANION_FILES = {"Dockerfile": (".dockerignore",)}
+
+
+@dataclass
+class Profile:
+    """Variante opcional de una plantilla (por ejemplo, una configuración de producción).
+
+    Sus dependencias se instalan antes que las de la plantilla, sus archivos se agregan a
+    los de la plantilla o los reemplazan, y los demás campos, si se indican, reemplazan
+    a los de la plantilla.
+    """
+    id: str
+    label: str
+    requirements: tuple = ()
+    source_dir: str = None
+    inline_files: dict = field(default_factory=dict)
+    entry: str = None
+    run: str = None
+    container_cmd: tuple = None
+    container_entrypoint: tuple = None
+    container_port: int = None
+    gitignore: tuple = ()
+
+
+@dataclass
+class Template:
+    """Descripción declarativa de un tipo de proyecto.
+
+    Los cuerpos de los archivos se leen de `source_dir` (o de `inline_files`) recién cuando
+    se genera un proyecto con la plantilla. `post_steps` son comandos que se ejecutan al
+    final, con `{python}`, `{target}` y `{name}` reemplazados. `container_cmd` y
+    `container_entrypoint` definen cómo arranca la imagen del Dockerfile (por defecto
+    `python <entry>`, con `{name}` reemplazado), `container_requirements` los paquetes que
+    solo la imagen instala (como el servidor de producción) y `container_port` el puerto
+    que expone. `gitignore` son líneas que se agregan al .gitignore común. `profiles` son
+    las variantes que se pueden elegir al generar (ver `with_profile`).
+    """
+    id: str
+    label: str
+    dirs: tuple = ()
+    requirements: tuple = ()
+    post_steps: tuple = ()
+    entry: str = "src/main.py"
+    run: str = ""
+    source_dir: str = None
+    inline_files: dict = field(default_factory=dict)
+    container_cmd: tuple = ()
+    container_entrypoint: tuple = ()
+    container_requirements: tuple = ()
+    container_port: int = None
+    gitignore: tuple = ()
+    profiles: tuple = ()
+    profile: str = None
+    overlay_dir: str = None
+    _sources: dict = field(default=None, init=False, repr=False, compare=False)
+    _variants: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    @property
+    def run_command(self):
+        return self.run or f"python {self.entry}"
+
+    def sources(self):
+        if self._sources is None:
+            sources = scan_sources(self.source_dir) if self.source_dir else {}
+            if self.overlay_dir:
+                sources.update(scan_sources(self.overlay_dir))
+            self._sources = sources
+        return self._sources
+
+    def get_profile(self, profile_id):
+        for profile in self.profiles:
+            if profile_id in (profile.id, profile.label):
+                return profile
+        raise KeyError(f"{self.id}: {profile_id}")
+
+    def with_profile(self, profile_id):
+        """Plantilla efectiva con el perfil `profile_id` aplicado (la misma plantilla si es None)"""
+        if not profile_id:
+            return self
+        if profile_id not in self._variants:
+            profile = self.get_profile(profile_id)
+            self._variants[profile_id] = replace(
+                self,
+                requirements=tuple(profile.requirements) + tuple(self.requirements),
+                entry=profile.entry or self.entry,
+                run=profile.run if profile.run is not None else ("" if profile.entry else self.run),
+                inline_files=dict(self.inline_files, **profile.inline_files),
+                container_cmd=self.container_cmd if profile.container_cmd is None else profile.container_cmd,
+                container_entrypoint=(self.container_entrypoint if profile.container_entrypoint is None
+                                      else profile.container_entrypoint),
+                container_port=profile.container_port or self.container_port,
+                gitignore=tuple(self.gitignore) + tuple(profile.gitignore),
+                profiles=(),
+                profile=profile.id,
+                overlay_dir=profile.source_dir,
+            )
+        return self._variants[profile_id]
+
+    def render_files(self, context):
+        """Devuelve {ruta relativa: contenido} con las variables de `context` resueltas en los
+        archivos .tmpl; los demás se devuelven como bytes, sin cambios"""
+        files = {}
+        for rel, path in self.sources().items():
+            if path.endswith(TEMPLATE_SUFFIX):
+                files[rel] = compile_file(path).render(context)
+            else:
+                with open(path, "rb") as f:
+                    files[rel] = f.read()
+        for rel, text in self.inline_files.items():
+            files[rel] = compile_text(text).render(context)
+        return files
+
+
+class TemplateRegistry:
+    """Índice de plantillas por identificador y por nombre visible"""
+
+    def __init__(self):
+        self._by_id = {}
+        self._by_label = {}
+        self.errors = []
+
+    def register(self, template):
+        if template.id in self._by_id or template.label in self._by_label:
+            raise ValueError(f"La plantilla '{template.id}' ya está registrada.")
+        self._by_id[template.id] = template
+        self._by_label[template.label] = template
+
+    def get(self, key):
+        template = self._by_id.get(key) or self._by_label.get(key)
+        if template is None:
+            raise KeyError(key)
+        return template
+
+    def __contains__(self, key):
+        return key in self._by_id or key in self._by_label
+
+    def __iter__(self):
+        return iter(self._by_id.values())
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def load_plugins(self, directory):
+        """Registra las plantillas de `directory`: una carpeta por plantilla con un template.json
+        y, opcionalmente, una subcarpeta files/ que se copia al proyecto. Los archivos .tmpl
+        se copian sin el sufijo y con las variables `@{nombre}` resueltas; el resto, tal cual."""
+        if not os.path.isdir(directory):
+            return
+        for template_id in sorted(os.listdir(directory)):
+            plugin_dir = os.path.join(directory, template_id)
+            manifest = os.path.join(plugin_dir, "template.json")
+            if not os.path.isfile(manifest):
+                continue
+            try:
+                self.register(_load_plugin(template_id, plugin_dir, manifest))
+            except (OSError, ValueError, KeyError) as e:
+                self.errors.append(f"{plugin_dir}: {e}")
+
+
+def _load_plugin(template_id, plugin_dir, manifest):
+    with open(manifest, encoding="utf-8") as f:
+        data = json.load(f)
+    files_dir = os.path.join(plugin_dir, "files")
+    profiles = []
+    for item in data.get("profiles", ()):
+        profile_dir = os.path.join(plugin_dir, "profiles", item["id"])
+        profiles.append(Profile(
+            id=item["id"],
+            label=item.get("label", item["id"]),
+            requirements=tuple(item.get("requirements", ())),
+            source_dir=profile_dir if os.path.isdir(profile_dir) else None,
+            inline_files=dict(item.get("files", {})),
+            entry=item.get("entry"),
+            run=item.get("run"),
+            container_cmd=tuple(item["container_cmd"]) if "container_cmd" in item else None,
+            container_entrypoint=tuple(item["container_entrypoint"]) if "container_entrypoint" in item else None,
+            container_port=item.get("container_port"),
+            gitignore=tuple(item.get("gitignore", ())),
+        ))
+    return Template(
+        id=data.get("id", template_id),
+        label=data["label"],
+        dirs=tuple(data.get("dirs", ())),
+        requirements=tuple(data.get("requirements", ())),
+        post_steps=tuple(tuple(step) for step in data.get("post_steps", ())),
+        entry=data.get("entry", "src/main.py"),
+        run=data.get("run", ""),
+        source_dir=files_dir if os.path.isdir(files_dir) else None,
+        inline_files=dict(data.get("files", {})),
+        container_cmd=tuple(data.get("container_cmd", ())),
+        container_entrypoint=tuple(data.get("container_entrypoint", ())),
+        container_requirements=tuple(data.get("container_requirements", ())),
+        container_port=data.get("container_port"),
+        gitignore=tuple(data.get("gitignore", ())),
+        profiles=tuple(profiles),
+    )
+
+
+def plugin_dirs():
+    dirs = [os.path.join(config_dir(), "templates")]
+    extra = os.environ.get("SCAFFOLDER_TEMPLATES_DIR")
+    if extra:
+        dirs.extend(p for p in extra.split(os.pathsep) if p)
+    return dirs
+
+
+BUILTIN_TEMPLATES = [
+    Template(id="python_script", label="Python Script"),
+    Template(
+        id="flask_sqlalchemy",
+        label="Flask Web App (Flask + SQLAlchemy)",
+        dirs=("src/templates", "src/static/css", "src/static/js", "src/models"),
+        requirements=("flask", "flask_sqlalchemy"),
+        entry="src/app.py",
+        container_cmd=("gunicorn", "--bind", "0.0.0.0:8000", "src.app:app"),
+        container_requirements=("gunicorn",),
+        container_port=8000,
+        profiles=(
+            Profile(
+                id="production",
+                label="Producción (gunicorn, pool de conexiones)",
+                requirements=("gunicorn",),
+                entry="wsgi.py",
+                run="gunicorn -c gunicorn.conf.py wsgi:app",
+                container_cmd=("gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"),
+                container_port=8000,
+            ),
+        ),
+    ),
+    Template(
+        id="fastapi",
+        label="FastAPI Web App",
+        requirements=("fastapi", "uvicorn"),
+        run="uvicorn src.main:app --reload",
+        container_cmd=("uvicorn", "src.main:app", "--host", "0.0.0.0", "--port", "8000"),
+        container_port=8000,
+        profiles=(
+            Profile(
+                id="performance",
+                label="Alto rendimiento (workers, uvloop, httptools)",
+                requirements=("uvicorn[standard]", "httpx"),
+                run="python -m src.server",
+                container_cmd=("python", "-m", "src.server"),
+            ),
+        ),
+    ),
+    Template(
+        id="django",
+        label="Django Web App",
+        requirements=("django",),
+        entry="manage.py",
+        run="python manage.py runserver",
+        post_steps=(("{python}", "-m", "django", "startproject", "{name}", "{target}"),),
+        container_cmd=("gunicorn", "--bind", "0.0.0.0:8000", "{name}.wsgi"),
+        container_requirements=("gunicorn",),
+        container_port=8000,
+    ),
+    Template(
+        id="datascience",
+        label="Data Science Project (Jupyter)",
+        requirements=("jupyter", "pandas", "numpy", "matplotlib"),
+        entry="src/analysis.ipynb",
+        run="jupyter notebook src/analysis.ipynb",
+        container_cmd=("jupyter", "notebook", "src/analysis.ipynb", "--ip=0.0.0.0", "--port=8888", "--no-browser"),
+        container_port=8888,
+    ),
+    Template(
+        id="ml_sklearn",
+        label="Machine Learning (scikit-learn)",
+        requirements=("scikit-learn", "pandas", "numpy", "matplotlib"),
+        entry="src/train.py",
+        profiles=(
+            Profile(
+                id="parallel",
+                label="Paralelo con caché (n_jobs, joblib.Memory, mmap)",
+                requirements=("joblib",),
+                gitignore=("# Memory-mapped datasets, joblib cache and trained models", "cache/", "models/"),
+            ),
+        ),
+    ),
+    Template(id="tkinter", label="Tkinter Desktop App"),
+    Template(id="pyqt5", label="PyQt5 Desktop App", requirements=("pyqt5",)),
+    Template(id="kivy", label="Kivy Mobile App", requirements=("kivy",)),
+    Template(id="pygame", label="Pygame Project", requirements=("pygame",)),
+    Template(id="cli_click", label="CLI Tool (Click)", requirements=("click",), entry="src/cli.py",
+             container_entrypoint=("python", "src/cli.py"), container_cmd=("--help",)),
+    Template(id="cli_typer", label="Minimal CLI Tool (Typer)", requirements=("typer",), entry="src/cli.py",
+             container_entrypoint=("python", "src/cli.py"), container_cmd=("--help",)),
+]
+
+for _template in BUILTIN_TEMPLATES:
+    _source_dir = builtin_path(_template.id)
+    if os.path.isdir(_source_dir):
+        _template.source_dir = _source_dir
+    # Los archivos de cada perfil están en template_files/<plantilla>-<perfil>
+    for _profile in _template.profiles:
+        _profile_dir = builtin_path(f"{_template.id}-{_profile.id}")
+        if os.path.isdir(_profile_dir):
+            _profile.source_dir = _profile_dir
+
+
+def _build_registry():
+    registry = TemplateRegistry()
+    for template in BUILTIN_TEMPLATES:
+        registry.register(template)
+    for directory in plugin_dirs():
+        registry.load_plugins(directory)
+    return registry
+
+
+REGISTRY = _build_registry()
+TEMPLATES = {template.label: template.id for template in REGISTRY}
+
+
+def template_context(name, template):
+    return {
+        "project_name": name,
+        "template_label": template.label,
+        "run_command": template.run_command,
+        "entry": template.entry,
+    }
+
+
+def get_template(project_type, profile=None):
+    """Plantilla registrada con el perfil `profile` aplicado, si se indica"""
+    return REGISTRY.get(project_type).with_profile(profile)
+
+
+def plan_project_structure(project_type, name, plan=None, profile=None):
+    """Agrega al plan las carpetas y archivos de la plantilla, más el README y el .gitignore"""
+    plan = plan if plan is not None else FilePlan()
+    template = get_template(project_type, profile)
+    for directory in COMMON_DIRS + tuple(template.dirs):
+        plan.add_dir(directory)
+
+    context = template_context(name, template)
+    for rel_path, content in template.render_files(context).items():
+        plan.add_file(rel_path, content)
+    for rel_path in COMMON_FILES:
+        if rel_path not in plan:
+            content = compile_file(builtin_path("_common", rel_path + TEMPLATE_SUFFIX)).render(context)
+            if rel_path == ".gitignore" and template.gitignore:
+                content += "\n" + "".join(f"{line}\n" for line in template.gitignore)
+            plan.add_file(rel_path, content)
+    return plan
+
+
+def create_project_structure(target_path, project_type, name=None):
+    """Crea la estructura del proyecto a partir de su plantilla registrada"""
+    plan = plan_project_structure(project_type, name or os.path.basename(target_path))
+    return write_plan(target_path, plan)
+
+
+def requirements_for(project_type, libs, profile=None):
+    from .lock import normalize_requirements
+
+    return normalize_requirements(list(get_template(project_type, profile).requirements) + list(libs))
+
+
+def plan_requirements(project_type, libs, plan, profile=None):
+    plan.add_file("requirements.txt", "".join(f"{lib}\n" for lib in requirements_for(project_type, libs, profile)))
+    return plan
+
+
+_DOCKER_ARCHES = {"x86_64": "amd64", "amd64": "amd64", "aarch64": "arm64", "arm64": "arm64"}
+
+
+def _docker_platform():
+    """Plataforma de Docker del host (por ejemplo linux/amd64) si es Linux con glibc como las
+    imágenes slim, o None: solo ahí las wheels que fija requirements.lock son las de la imagen"""
+    if platform.system() != "Linux" or platform.libc_ver()[0] != "glibc":
+        return None
+    arch = _DOCKER_ARCHES.get(platform.machine().lower())
+    return f"linux/{arch}" if arch else None
+
+
+def container_context(template, requirements=True, name=""):
+    """Variables del Dockerfile: versión de Python, capa de dependencias, puerto y comando de arranque"""
+    from .lock import canonical_name
+
+    declared = {canonical_name(lib) for lib in template.requirements} if requirements else set()
+    image_only = [lib for lib in template.container_requirements if canonical_name(lib) not in declared]
+    lock_platform = _docker_platform()
+    if requirements and lock_platform:
+        dependencies = (
+            f"# requirements.lock pins the wheels of the machine that generated it ({lock_platform}, glibc);\n"
+            "# builds for another platform (docker build --platform) install requirements.txt instead\n"
+            "ARG TARGETPLATFORM\n"
+            "COPY requirements.txt requirements.lock* ./\n"
+            "RUN --mount=type=cache,target=/root/.cache/pip \\\n"
+            f'    if [ -f requirements.lock ] && [ "$TARGETPLATFORM" = "{lock_platform}" ]; then \\\n'
+            "        pip install -r requirements.lock; \\\n"
+            "    else pip install -r requirements.txt; fi"
+        )
+    elif requirements:
+        # Los hashes del lock corresponden a las wheels de esta plataforma, no a las de la imagen Linux
+        dependencies = (
+            "# requirements.lock was resolved on a platform other than this image (Linux, glibc): not used here\n"
+            "COPY requirements.txt ./\n"
+            "RUN --mount=type=cache,target=/root/.cache/pip pip install -r requirements.txt"
+        )
+    else:
+        dependencies = "# No requirements.txt: the runtime only gets an empty virtual environment"
+    if image_only:
+        dependencies += ("\n# Production server, only needed inside the image\n"
+                         "RUN --mount=type=cache,target=/root/.cache/pip pip install " + " ".join(image_only))
+
+    def exec_form(args):
+        return json.dumps([arg.replace("{name}", name) for arg in args])
+
+    command = ""
+    if template.container_entrypoint:
+        command = f"ENTRYPOINT {exec_form(template.container_entrypoint)}\n"
+    command += f"CMD {exec_form(template.container_cmd or ('python', template.entry))}"
+    return {
+        "python_version": ".".join(platform.python_version_tuple()[:2]),
+        "docker_dependencies": dependencies,
+        "docker_expose": f"EXPOSE {template.container_port}\n" if template.container_port else "",
+        "docker_command": command,
+    }
+
+
+def plan_extra_files(name, extra_files, plan, project_type=None, requirements=True, profile=None):
+    """Agrega los archivos extras (y sus acompañantes, como el .dockerignore) que el plan todavía no incluye"""
+    template = get_template(project_type or "python_script", profile)
+    context = template_context(name, template)
+    context.update(container_context(template, requirements, name))
+    wanted = []
+    for fname in extra_files:
+        wanted.append(fname)
+        wanted.extend(COMPANION_FILES.get(fname, ()))
+    for fname in wanted:
+        if fname in plan:
+            continue
+        source = builtin_path("_extra", fname + TEMPLATE_SUFFIX)
+        if os.path.exists(source):
+            plan.add_file(fname, compile_file(source).render(context))
+        else:
+            plan.add_file(fname, "")
+    return plan
+
+
+def plan_project(options):
+    """Plan completo de archivos de un proyecto: plantilla, requirements.txt y archivos extras"""
+    profile = options.get("profile")
+    plan = plan_project_structure(options["project_type"], options["name"], profile=profile)
+    if options["create_req"]:
+        plan_requirements(options["project_type"], options["libs"], plan, profile)
+    plan_extra_files(options["name"], options["extra_files"], plan, options["project_type"], options["create_req"],
+                     profile)
+    return plan
+
+
+def resolve_template(value):
+    """Acepta el nombre visible o el identificador corto de una plantilla"""
+    return REGISTRY.get(value).label
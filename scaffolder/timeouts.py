@@ -0,0 +1,6 @@
+# Separado de process.py para que la CLI los use sin importar asyncio
+
+# Segundos máximos por comando de cada paso; se cambian con la opción `timeouts`
+DEFAULT_TIMEOUTS = {"venv": 300, "git": 60, "lock": 600, "install": 1800, "post_steps": 600}
+DEFAULT_RETRIES = 2
+RETRY_BACKOFF = 2.0
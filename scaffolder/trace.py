@@ -0,0 +1,107 @@
+import contextlib
+import glob
+import json
+import os
+import threading
+import time
+
+from .paths import cache_dir
+
+MAX_TRACES = 50
+
+
+class Tracer:
+    """Registra intervalos de tiempo (spans) anidados por hilo y los exporta como JSON lines o trace de Chrome"""
+
+    def __init__(self):
+        self.spans = []
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._next_id = 0
+
+    @contextlib.contextmanager
+    def span(self, name, category="step", **attrs):
+        """Mide el bloque; los atributos se pueden completar dentro del `with` sobre el dict devuelto"""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        with self._lock:
+            self._next_id += 1
+            span_id = self._next_id
+        parent = stack[-1] if stack else None
+        stack.append(span_id)
+        start = time.perf_counter()
+        try:
+            yield attrs
+        except BaseException as e:
+            attrs["error"] = type(e).__name__
+            raise
+        finally:
+            end = time.perf_counter()
+            stack.pop()
+            with self._lock:
+                self.spans.append({
+                    "id": span_id,
+                    "parent": parent,
+                    "name": name,
+                    "cat": category,
+                    "start": start - self._origin,
+                    "dur": end - start,
+                    "tid": threading.get_ident(),
+                    "args": attrs,
+                })
+
+    def children(self, span_id):
+        return sorted((s for s in self.spans if s["parent"] == span_id), key=lambda s: s["start"])
+
+    def descendants(self, span_id):
+        result = []
+        for child in self.children(span_id):
+            result.append(child)
+            result.extend(self.descendants(child["id"]))
+        return sorted(result, key=lambda s: s["start"])
+
+    def by_category(self, category):
+        return sorted((s for s in self.spans if s["cat"] == category), key=lambda s: s["start"])
+
+    def write_jsonl(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"name": "trace", "cat": "meta", "started_at": self.started_at}) + "\n")
+            for span in sorted(self.spans, key=lambda s: s["start"]):
+                f.write(json.dumps(span, default=str) + "\n")
+
+    def write_chrome(self, path):
+        """Formato Trace Event (chrome://tracing, Perfetto)"""
+        pid = os.getpid()
+        threads = {}
+        events = []
+        for span in sorted(self.spans, key=lambda s: s["start"]):
+            tid = threads.setdefault(span["tid"], len(threads) + 1)
+            events.append({
+                "name": span["args"].get("label", span["name"]),
+                "cat": span["cat"],
+                "ph": "X",
+                "ts": round(span["start"] * 1e6),
+                "dur": round(span["dur"] * 1e6),
+                "pid": pid,
+                "tid": tid,
+                "args": span["args"],
+            })
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+
+
+def trace_path(project_name):
+    """Ruta para una traza nueva en la caché; conserva solo las MAX_TRACES más recientes"""
+    directory = cache_dir("traces")
+    existing = sorted(glob.glob(os.path.join(directory, "*.jsonl")), key=os.path.getmtime)
+    for old in existing[:max(0, len(existing) - MAX_TRACES + 1)]:
+        for path in (old, old[:-len(".jsonl")] + ".trace.json"):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(directory, f"{project_name}-{stamp}-{os.getpid()}.jsonl")
@@ -0,0 +1,213 @@
+import glob
+import hashlib
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+
+from .paths import cache_dir
+
+READY_MARKER = ".scaffolder-ready"
+DEFAULT_POOL_SIZE = 20
+_FICLONE = 0x40049409
+
+
+def _normalize(name):
+    return name.strip().lower().replace("_", "-").replace(".", "-")
+
+
+def venv_python(venv_path):
+    if os.name == 'nt':
+        return os.path.join(venv_path, "Scripts", "python.exe")
+    return os.path.join(venv_path, "bin", "python")
+
+
+def installed_distributions(venv_path):
+    """{nombre normalizado: versión} de los paquetes instalados en el venv, leyendo sus carpetas dist-info"""
+    if os.name == 'nt':
+        patterns = [os.path.join(venv_path, "Lib", "site-packages")]
+    else:
+        patterns = glob.glob(os.path.join(glob.escape(venv_path), "lib", "python*", "site-packages"))
+    versions = {}
+    for site_packages in patterns:
+        try:
+            entries = os.listdir(site_packages)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.endswith((".dist-info", ".egg-info")):
+                name, _, version = entry.rsplit(".", 1)[0].partition("-")
+                versions[_normalize(name)] = version.split("-", 1)[0]
+    return versions
+
+
+def _scripts_dir(venv_path):
+    return os.path.join(venv_path, "Scripts" if os.name == 'nt' else "bin")
+
+
+def _rewrite(path, old, new):
+    """Devuelve el contenido de `path` con `old` reemplazado, o None si no hay nada que cambiar"""
+    if os.path.getsize(path) > 1024 * 1024:
+        return None
+    with open(path, "rb") as f:
+        data = f.read()
+    if old not in data or b"\0" in data[:1024]:
+        return None
+    return data.replace(old, new)
+
+
+def _write_like(src, dst, data):
+    tmp = dst + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    shutil.copymode(src, tmp)
+    os.replace(tmp, dst)
+
+
+def _fast_copy(src, dst):
+    """Enlace duro si es posible, copia con reflink (copy-on-write) si no, y copia normal al final"""
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+    if sys.platform.startswith("linux"):
+        try:
+            import fcntl
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+
+def _relocated_files(venv_path):
+    """Archivos del entorno que contienen rutas absolutas (shebangs, activate, pyvenv.cfg)"""
+    yield os.path.join(venv_path, "pyvenv.cfg")
+    scripts = _scripts_dir(venv_path)
+    if os.path.isdir(scripts):
+        with os.scandir(scripts) as it:
+            for entry in it:
+                if entry.is_file(follow_symlinks=False):
+                    yield entry.path
+
+
+def clone_venv(src, dst, prefix=None):
+    """Copia un entorno virtual a `dst` compartiendo archivos y reescribiendo sus rutas absolutas.
+
+    `prefix` es la ruta final del entorno si no coincide con `dst` (por ejemplo al copiarlo a una
+    carpeta temporal que luego se renombra).
+    """
+    src = os.path.abspath(src)
+    dst = os.path.abspath(dst)
+    old, new = src.encode(), os.path.abspath(prefix or dst).encode()
+    rewrite = set(_relocated_files(src))
+    for root, dirs, files in os.walk(src):
+        rel = os.path.relpath(root, src)
+        target_root = os.path.join(dst, rel) if rel != "." else dst
+        os.makedirs(target_root, exist_ok=True)
+        for name in list(dirs):
+            path = os.path.join(root, name)
+            if os.path.islink(path):
+                os.symlink(os.readlink(path), os.path.join(target_root, name))
+                dirs.remove(name)
+        for name in files:
+            path = os.path.join(root, name)
+            target = os.path.join(target_root, name)
+            if os.path.islink(path):
+                os.symlink(os.readlink(path), target)
+                continue
+            data = _rewrite(path, old, new) if path in rewrite else None
+            if data is not None:
+                _write_like(path, target, data)
+            else:
+                _fast_copy(path, target)
+
+
+def relocate_venv(venv_path, old_prefix):
+    """Corrige en el lugar las rutas de un entorno que se movió desde `old_prefix`"""
+    old = os.path.abspath(old_prefix).encode()
+    new = os.path.abspath(venv_path).encode()
+    for path in _relocated_files(venv_path):
+        if not os.path.isfile(path):
+            continue
+        data = _rewrite(path, old, new)
+        if data is not None:
+            _write_like(path, path, data)
+
+
+class VenvPool:
+    """Entornos base por conjunto de dependencias; los proyectos nuevos reciben una copia rápida"""
+
+    def __init__(self, path=None, max_entries=None):
+        self.path = path or cache_dir("venvs")
+        if max_entries is None:
+            max_entries = int(os.environ.get("SCAFFOLDER_VENV_POOL_SIZE", DEFAULT_POOL_SIZE))
+        self.max_entries = max_entries
+
+    @staticmethod
+    def supported():
+        # Los lanzadores .exe de Windows llevan la ruta del intérprete embebida y no se pueden reubicar
+        return os.name != 'nt'
+
+    @staticmethod
+    def key(requirements, python=None):
+        spec = {
+            "python": os.path.realpath(python or sys.executable),
+            "version": platform.python_version(),
+            "platform": platform.platform(),
+            "requirements": sorted({_normalize(r) for r in requirements if r.strip()}),
+        }
+        return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:24]
+
+    def _entry(self, key):
+        return os.path.join(self.path, key)
+
+    def has(self, key):
+        return os.path.exists(os.path.join(self._entry(key), READY_MARKER))
+
+    def clone(self, key, dst):
+        entry = self._entry(key)
+        clone_venv(entry, dst)
+        marker = os.path.join(dst, READY_MARKER)
+        if os.path.exists(marker):
+            os.remove(marker)
+        os.utime(os.path.join(entry, READY_MARKER))
+
+    def store(self, key, venv_path, replace=False):
+        """Guarda una copia de `venv_path` como base para el conjunto de dependencias `key`;
+        con `replace` reemplaza la que ya existía (por ejemplo si se actualizaron sus versiones)"""
+        if self.has(key) and not replace:
+            return
+        entry = self._entry(key)
+        tmp = tempfile.mkdtemp(prefix=".tmp-", dir=self.path)
+        staged = os.path.join(tmp, "venv")
+        try:
+            clone_venv(venv_path, staged, prefix=entry)
+            open(os.path.join(staged, READY_MARKER), "w").close()
+            if replace and self.has(key):
+                # Se aparta dentro de tmp y se borra al final junto con el resto
+                os.rename(entry, os.path.join(tmp, "old"))
+            elif os.path.exists(entry) and not self.has(key):
+                shutil.rmtree(entry, ignore_errors=True)
+            try:
+                os.rename(staged, entry)
+            except OSError:
+                pass
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.prune()
+
+    def prune(self):
+        entries = []
+        for name in os.listdir(self.path):
+            marker = os.path.join(self.path, name, READY_MARKER)
+            if os.path.exists(marker):
+                entries.append((os.path.getmtime(marker), name))
+        entries.sort(reverse=True)
+        for _, name in entries[self.max_entries:]:
+            shutil.rmtree(self._entry(name), ignore_errors=True)
@@ -0,0 +1,135 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from .lock import write_unhashed
+from .paths import cache_dir
+from .process import CommandTimeout
+
+DEFAULT_MAX_MB = 2048
+
+
+def _normalize(name):
+    return name.lower().replace("_", "-").replace(".", "-")
+
+
+class Wheelhouse:
+    """Caché local de wheels compartida por todos los proyectos generados"""
+
+    def __init__(self, path=None, max_bytes=None):
+        self.path = path or cache_dir("wheelhouse")
+        os.makedirs(self.path, exist_ok=True)
+        if max_bytes is None:
+            max_bytes = int(os.environ.get("SCAFFOLDER_WHEELHOUSE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024
+        self.max_bytes = max_bytes
+
+    def wheels(self):
+        entries = []
+        with os.scandir(self.path) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".whl"):
+                    st = entry.stat()
+                    entries.append((entry.path, st.st_size, st.st_mtime))
+        return entries
+
+    def stats(self):
+        wheels = self.wheels()
+        return {
+            "path": self.path,
+            "wheels": len(wheels),
+            "bytes": sum(size for _, size, _ in wheels),
+            "max_bytes": self.max_bytes,
+        }
+
+    def _offline_command(self, python_cmd, requirements, report=None):
+        cmd = [python_cmd, "-m", "pip", "install", "--no-index", "--find-links", self.path,
+               "-r", requirements]
+        if report:
+            cmd += ["--report", report]
+        return cmd
+
+    def _touch_used(self, report_path):
+        """Marca como usadas las wheels instaladas para la expulsión LRU"""
+        try:
+            with open(report_path, encoding="utf-8") as f:
+                report = json.load(f)
+        except (OSError, ValueError):
+            return
+        for item in report.get("install", []):
+            url = item.get("download_info", {}).get("url", "")
+            if url.startswith("file:"):
+                path = os.path.join(self.path, os.path.basename(url))
+                if os.path.exists(path):
+                    os.utime(path)
+
+    def install(self, run, python_cmd, requirements="requirements.txt", cwd=None, log=print):
+        """Instala desde la wheelhouse sin red; si faltan wheels la completa y reintenta.
+
+        Los hashes del lock se verifican al completar la wheelhouse (`pip wheel`), no en la
+        instalación sin red, porque las wheels construidas desde un sdist tienen otro hash.
+
+        `run(cmd, cwd)` ejecuta un comando y lanza CalledProcessError si falla; un comando que
+        agota su tiempo (CommandTimeout) se propaga sin pasar al método siguiente.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            report = os.path.join(tmp, "report.json")
+            pins = write_unhashed(os.path.join(cwd or ".", requirements), os.path.join(tmp, "pins.txt"))
+            try:
+                run(self._offline_command(python_cmd, pins, report), cwd)
+                self._touch_used(report)
+                return "offline"
+            except CommandTimeout:
+                raise
+            except subprocess.CalledProcessError:
+                log("La wheelhouse no tiene todas las dependencias; descargando wheels...")
+
+            try:
+                run([python_cmd, "-m", "pip", "wheel", "-w", self.path, "-r", requirements], cwd)
+            except CommandTimeout:
+                raise
+            except subprocess.CalledProcessError:
+                log("No se pudo completar la wheelhouse; instalando directamente desde el índice.")
+                run([python_cmd, "-m", "pip", "install", "-r", requirements], cwd)
+                return "online"
+
+            run(self._offline_command(python_cmd, pins), cwd)
+        self.evict()
+        return "filled"
+
+    def evict(self):
+        """Elimina las wheels usadas hace más tiempo hasta quedar bajo el límite de tamaño"""
+        wheels = sorted(self.wheels(), key=lambda w: w[2])
+        total = sum(size for _, size, _ in wheels)
+        removed = 0
+        for path, size, _ in wheels:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def prewarm(self, libs, python_cmd=None, jobs=4, log=print):
+        """Descarga y construye wheels para `libs`; devuelve las librerías que fallaron"""
+        python_cmd = python_cmd or sys.executable
+        unique = list({_normalize(lib): lib for lib in reversed(list(libs))}.values())[::-1]
+
+        def fetch(lib):
+            result = subprocess.run([python_cmd, "-m", "pip", "wheel", "-q", "-w", self.path, lib],
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+            if result.returncode == 0:
+                log(f"OK    {lib}")
+                return None
+            log(f"ERROR {lib}")
+            return lib
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            failed = [lib for lib in pool.map(fetch, unique) if lib]
+        self.evict()
+        return failed
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import locale
+import os
+
+from .paths import cache_dir
+
+PARALLEL_WRITE_THRESHOLD = 64
+
+
+class FilePlan:
+    """Árbol de archivos planificado en memoria: carpetas y {ruta relativa: contenido}.
+
+    El contenido es texto, o bytes para los archivos que se copian tal cual.
+    """
+
+    def __init__(self):
+        self.dirs = set()
+        self.files = {}
+
+    def add_dir(self, rel_path):
+        self.dirs.add(rel_path.strip("/"))
+
+    def add_file(self, rel_path, content):
+        self.files[rel_path] = content
+
+    def __contains__(self, rel_path):
+        return rel_path in self.files
+
+    def all_dirs(self):
+        """Todas las carpetas necesarias (incluidos los ancestros), sin repetir y de menor a mayor profundidad"""
+        needed = set()
+        for rel_path in list(self.dirs) + [os.path.dirname(f) for f in self.files]:
+            while rel_path and rel_path not in needed:
+                needed.add(rel_path)
+                rel_path = rel_path.rpartition("/")[0]
+        return sorted(needed, key=lambda d: (d.count("/"), d))
+
+
+def _write_file(path, content):
+    # Los archivos binarios de las plantillas (bytes) se copian sin convertir
+    with open(path, "wb" if isinstance(content, bytes) else "w") as f:
+        f.write(content)
+    return len(content)
+
+
+def write_plan(root, plan, workers=None):
+    """Crea las carpetas en una sola pasada y escribe todos los archivos; devuelve (archivos, bytes)"""
+    os.makedirs(root, exist_ok=True)
+    for rel_dir in plan.all_dirs():
+        try:
+            os.mkdir(os.path.join(root, *rel_dir.split("/")))
+        except FileExistsError:
+            pass
+
+    items = [(os.path.join(root, *rel.split("/")), content) for rel, content in plan.files.items()]
+    if workers is None:
+        workers = 8 if len(items) >= PARALLEL_WRITE_THRESHOLD else 1
+    if workers > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            written = sum(pool.map(lambda item: _write_file(*item), items))
+    else:
+        written = sum(_write_file(path, content) for path, content in items)
+    return len(items), written
+
+
+def encode_content(content):
+    """Bytes que deja en disco `_write_file` (modo texto: fin de línea y codificación del sistema)"""
+    if isinstance(content, bytes):
+        return content
+    return content.replace("\n", os.linesep).encode(locale.getpreferredencoding(False))
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _hashes_path(target_path):
+    key = hashlib.sha256(os.path.normcase(os.path.abspath(target_path)).encode()).hexdigest()[:24]
+    return os.path.join(cache_dir("manifests"), key + ".json")
+
+
+def read_file_hashes(target_path):
+    """Hashes de los archivos tal como se generaron la última vez en `target_path` ({} si no hay registro)"""
+    try:
+        with open(_hashes_path(target_path), encoding="utf-8") as f:
+            return json.load(f).get("files", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_file_hashes(target_path, hashes):
+    path = _hashes_path(target_path)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"target": os.path.abspath(target_path), "files": hashes}, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def plan_hashes(plan):
+    return {rel: _sha256(encode_content(content)) for rel, content in plan.files.items()}
+
+
+def update_plan(root, plan, previous=None, force=False):
+    """Escribe solo los archivos del plan que faltan o cambiaron en la plantilla.
+
+    Un archivo distinto en disco se reemplaza si sigue igual a como se generó la vez
+    anterior (`previous`). Si el usuario lo modificó se conserva: sin aviso cuando la
+    plantilla tampoco cambió, y como conflicto cuando cambiaron los dos, salvo con
+    `force`. Devuelve un dict con las listas added/changed/conflicts, la cantidad de
+    archivos sin cambios, los bytes escritos y los hashes a registrar.
+    """
+    previous = previous or {}
+    result = {"added": [], "changed": [], "conflicts": [], "unchanged": 0, "bytes": 0, "hashes": {}}
+    pending = FilePlan()
+    pending.dirs = set(plan.dirs)
+    for rel, content in plan.files.items():
+        new_hash = _sha256(encode_content(content))
+        path = os.path.join(root, *rel.split("/"))
+        try:
+            with open(path, "rb") as f:
+                disk_hash = _sha256(f.read())
+        except FileNotFoundError:
+            kind = "added"
+        else:
+            if disk_hash == new_hash:
+                kind = "unchanged"
+            elif force or previous.get(rel) == disk_hash:
+                kind = "changed"
+            elif previous.get(rel) == new_hash:
+                # Editado a mano pero la plantilla no cambió: se conserva sin avisar
+                kind = "unchanged"
+            else:
+                kind = "conflicts"
+        if kind == "unchanged":
+            result["unchanged"] += 1
+        else:
+            result[kind].append(rel)
+        if kind == "conflicts":
+            # Se mantiene el hash anterior: mientras el usuario no lo restaure, seguirá en conflicto
+            if rel in previous:
+                result["hashes"][rel] = previous[rel]
+            continue
+        result["hashes"][rel] = new_hash
+        if kind != "unchanged":
+            pending.add_file(rel, content)
+    _, result["bytes"] = write_plan(root, pending)
+    return result
@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import zipfile
+
+from scaffolder.benchmark import build_wheel, compare, format_comparison, local_index, percentile, summarize
+
+
+def _entry(total, tree=0.01, **steps):
+    return {"tree": summarize([tree]), "total": summarize([total]),
+            "steps": {name: summarize([value]) for name, value in steps.items()}}
+
+
+class StatisticsTests(unittest.TestCase):
+    def test_percentile_interpolates(self):
+        self.assertEqual(percentile([4, 1, 3, 2], 0.5), 2.5)
+        self.assertAlmostEqual(percentile(range(1, 101), 0.95), 95.05)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+    def test_compare_flags_regressions_beyond_tolerance_and_noise(self):
+        baseline = {"templates": {"web": _entry(1.0, venv=0.5, git=0.001), "gone": _entry(1.0)}}
+        results = {"templates": {"web": _entry(1.1, venv=0.7, git=0.005), "new": _entry(1.0)}}
+        rows = {(template, metric): regressed for template, metric, _, _, regressed in compare(results, baseline)}
+        self.assertEqual(rows, {("web", "tree"): False, ("web", "total"): False,
+                                ("web", "venv"): True, ("web", "git"): False})
+        self.assertIn("REGRESIÓN", format_comparison(compare(results, baseline)))
+
+
+class LocalIndexTests(unittest.TestCase):
+    def test_fake_wheels_install_offline(self):
+        with local_index(["Flask_SQLAlchemy"]) as root:
+            self.assertEqual(os.environ["PIP_NO_INDEX"], "1")
+            wheel = os.path.join(root, "index", "flask_sqlalchemy-0.0.0-py3-none-any.whl")
+            with zipfile.ZipFile(wheel) as zf:
+                self.assertIn("flask_sqlalchemy-0.0.0.dist-info/RECORD", zf.namelist())
+            with tempfile.TemporaryDirectory() as target:
+                subprocess.run([sys.executable, "-m", "pip", "install", "-q", "--target", target, "flask-sqlalchemy"],
+                               check=True, capture_output=True)
+                self.assertTrue(os.path.isfile(os.path.join(target, "flask_sqlalchemy", "__init__.py")))
+        self.assertNotIn("PIP_NO_INDEX", os.environ)
+        self.assertFalse(os.path.exists(root))
+
+    def test_build_wheel_names_the_module_after_the_project(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertTrue(build_wheel(tmp, "scikit.learn", "1.0").endswith("scikit_learn-1.0-py3-none-any.whl"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from scaffolder.bulk import BulkReport, generate_bulk
+from scaffolder.engine import project_options
+
+
+class GenerateBulkTests(unittest.TestCase):
+    def test_failures_do_not_stop_the_other_projects(self):
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.dict(os.environ, {"SCAFFOLDER_CACHE_DIR": os.path.join(tmp, "cache")}):
+            dest = os.path.join(tmp, "out")
+            os.makedirs(os.path.join(dest, "taken"))
+            options = [project_options(name, dest, "python_script", create_venv=False, init_git=False,
+                                       create_req=False, trace=False, use_snapshots=False)
+                       for name in ("one", "taken", "two")]
+            seen = []
+            report = generate_bulk(options, jobs=2, on_result=lambda result: seen.append(result["name"]))
+            self.assertEqual(sorted(seen), ["one", "taken", "two"])
+            self.assertEqual([r["name"] for r in report.failures], ["taken"])
+            self.assertIn("FileExistsError", report.failures[0]["error"])
+            for name in ("one", "two"):
+                self.assertTrue(os.path.isfile(os.path.join(dest, name, "README.md")))
+            self.assertTrue(report.summary().startswith("2/3 proyectos generados"))
+
+
+class BulkReportTests(unittest.TestCase):
+    def test_throughput(self):
+        report = BulkReport([{"ok": True}, {"ok": False}], elapsed=4.0)
+        self.assertEqual((report.throughput, len(report.failures)), (0.5, 1))
+        self.assertEqual(BulkReport([], elapsed=0).throughput, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
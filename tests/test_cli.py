@@ -0,0 +1,68 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from scaffolder.cli import _split, _timeouts, load_manifest, spec_to_options
+from scaffolder.timeouts import DEFAULT_TIMEOUTS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class SpecTests(unittest.TestCase):
+    def test_split_accepts_strings_and_lists(self):
+        self.assertEqual(_split(" six, ,requests "), ["six", "requests"])
+        self.assertEqual(_split(("six",)), ["six"])
+        self.assertEqual(_split(None), [])
+
+    def test_timeouts_accepts_strings_and_dicts(self):
+        self.assertEqual(_timeouts("install=900, git=30"), {"install": 900.0, "git": 30.0})
+        self.assertEqual(_timeouts({"venv": "60"}), {"venv": 60.0})
+        with self.assertRaises(ValueError):
+            _timeouts("install")
+
+    def test_spec_to_options(self):
+        options = spec_to_options({"name": "api", "type": "FastAPI Web App", "libs": "six", "files": "",
+                                   "profile": "performance", "timeouts": {"install": 60}}, dest="/tmp/out")
+        self.assertEqual(options["project_type"], "FastAPI Web App")
+        self.assertEqual((options["profile"], options["libs"], options["extra_files"]), ("performance", ["six"], []))
+        self.assertEqual(options["target_path"], os.path.abspath("/tmp/out/api"))
+        self.assertEqual(options["timeouts"], dict(DEFAULT_TIMEOUTS, install=60.0))
+
+    def test_invalid_specs_raise_value_error(self):
+        for spec in ({"type": "fastapi"}, {"name": "a", "type": "nope"}, {"name": "a", "profile": "nope"}):
+            with self.subTest(spec=spec), self.assertRaises(ValueError):
+                spec_to_options(spec)
+
+    def test_manifest_defaults_apply_to_every_project(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "projects.json")
+            with open(path, "w") as f:
+                json.dump({"defaults": {"venv": False, "type": "fastapi"},
+                           "projects": [{"name": "a"}, {"name": "b", "type": "django"}]}, f)
+            self.assertEqual(load_manifest(path), [{"venv": False, "type": "fastapi", "name": "a"},
+                                                   {"venv": False, "type": "django", "name": "b"}])
+
+
+class HeadlessTests(unittest.TestCase):
+    def test_list_does_not_import_qt_or_the_engine(self):
+        code = ("import sys; from scaffolder.cli import main; main(['--list']); "
+                "print(sorted(m for m in ('PyQt5', 'scaffolder.engine', 'asyncio') if m in sys.modules))")
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertIn("python_script", result.stdout)
+        self.assertTrue(result.stdout.rstrip().endswith("[]"), result.stdout)
+
+    def test_generates_a_project_without_the_gui(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, SCAFFOLDER_CACHE_DIR=os.path.join(tmp, "cache"))
+            subprocess.run([sys.executable, "app.py", "--name", "demo", "--dest", tmp, "--type", "python_script",
+                            "--no-venv", "--no-git", "--no-requirements", "--files", "", "-q"],
+                           cwd=ROOT, env=env, capture_output=True, check=True)
+            self.assertEqual(sorted(os.listdir(os.path.join(tmp, "demo"))),
+                             [".gitignore", "README.md", "docs", "src", "tests"])
+
+
+if __name__ == "__main__":
+    unittest.main()
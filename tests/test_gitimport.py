@@ -0,0 +1,87 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from scaffolder.gitimport import fast_import_stream, unquote_path
+
+FIXED_IDENT = "Tester <tester@example.invalid> 1700000000 +0000"
+
+
+class UnquotePathTests(unittest.TestCase):
+    def test_plain_paths_are_unchanged(self):
+        self.assertEqual(unquote_path("src/main.py"), "src/main.py")
+
+    def test_c_style_escapes(self):
+        self.assertEqual(unquote_path('"tab\\there"'), "tab\there")
+        self.assertEqual(unquote_path('"quote\\"and\\\\slash"'), 'quote"and\\slash')
+
+    def test_octal_escapes_are_utf8_bytes(self):
+        # git muestra "ñ" como los bytes UTF-8 \303\261
+        self.assertEqual(unquote_path('"espa\\303\\261ol.txt"'), "español.txt")
+
+
+class FastImportStreamTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        Path(self.root, "src").mkdir()
+        Path(self.root, "src", "main.py").write_text("on disk\n")
+        Path(self.root, "run.sh").write_text("#!/bin/sh\n")
+        os.chmod(os.path.join(self.root, "run.sh"), 0o755)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_planned_content_wins_and_missing_files_are_skipped(self):
+        chunks, files, size = fast_import_stream(
+            self.root, ["src/main.py", "run.sh", "gone.txt"], {"src/main.py": "planned\n"},
+            "refs/heads/main", FIXED_IDENT)
+        stream = b"".join(chunks)
+        self.assertEqual(files, 2)
+        self.assertIn(b"planned\n", stream)
+        self.assertNotIn(b"on disk", stream)
+        self.assertNotIn(b"gone.txt", stream)
+        self.assertTrue(stream.startswith(b"commit refs/heads/main\ncommitter " + FIXED_IDENT.encode()))
+        self.assertTrue(stream.endswith(b"done\n"))
+        self.assertEqual(size, len("planned\n".encode()) + len(b"#!/bin/sh\n"))
+
+    @unittest.skipIf(os.name == 'nt', "bits de ejecución y enlaces simbólicos")
+    def test_modes_for_executables_and_symlinks(self):
+        os.symlink("src/main.py", os.path.join(self.root, "link"))
+        stream = b"".join(fast_import_stream(self.root, ["run.sh", "link", "src/main.py"], {},
+                                             "refs/heads/main", FIXED_IDENT)[0])
+        self.assertIn(b"M 100755 inline run.sh\n", stream)
+        self.assertIn(b"M 120000 inline link\ndata 11\nsrc/main.py\n", stream)
+        self.assertIn(b"M 100644 inline src/main.py\n", stream)
+
+    def test_paths_with_newlines_are_quoted(self):
+        name = "odd\nname.txt"
+        try:
+            Path(self.root, name).write_text("x")
+        except OSError:
+            self.skipTest("el sistema de archivos no admite saltos de línea en nombres")
+        stream = b"".join(fast_import_stream(self.root, [name], {}, "refs/heads/main", FIXED_IDENT)[0])
+        self.assertIn(b'M 100644 inline "odd\\nname.txt"\n', stream)
+
+    @unittest.skipUnless(shutil.which("git"), "git no está instalado")
+    def test_stream_is_accepted_by_git(self):
+        env = dict(os.environ, GIT_CONFIG_GLOBAL=os.devnull, GIT_CONFIG_NOSYSTEM="1")
+        subprocess.run(["git", "init", "-q", "-b", "main", self.root], check=True, env=env)
+        chunks, _, _ = fast_import_stream(self.root, ["src/main.py", "run.sh"], {"src/main.py": "planned\n"},
+                                          "refs/heads/main", FIXED_IDENT)
+        subprocess.run(["git", "fast-import", "--quiet", "--done", "--date-format=raw"], cwd=self.root,
+                       input=b"".join(chunks), check=True, env=env)
+        show = subprocess.run(["git", "show", "main:src/main.py"], cwd=self.root, env=env,
+                              capture_output=True, text=True, check=True)
+        self.assertEqual(show.stdout, "planned\n")
+        tree = subprocess.run(["git", "ls-tree", "main", "run.sh"], cwd=self.root, env=env,
+                              capture_output=True, text=True, check=True)
+        if os.name != 'nt':
+            self.assertTrue(tree.stdout.startswith("100755"))
+
+
+if __name__ == "__main__":
+    unittest.main()
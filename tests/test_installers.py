@@ -0,0 +1,129 @@
+import os
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+
+from scaffolder import installers
+from scaffolder.installers import HISTORY_SIZE, Installer, InstallerStats, choose_installers, install_requirements
+from scaffolder.process import CommandTimeout
+from scaffolder.wheelhouse import Wheelhouse
+
+
+class FakeInstaller(Installer):
+    def __init__(self, name, error=None, available=True):
+        self.name = name
+        self.error = error
+        self.calls = 0
+        self._available = available
+
+    def available(self):
+        return self._available
+
+    def install(self, run, python_cmd, requirements, cwd, log):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+
+
+class InstallerTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        cache = mock.patch.dict(os.environ, {"SCAFFOLDER_CACHE_DIR": os.path.join(self.root, "cache")})
+        cache.start()
+        self.addCleanup(cache.stop)
+        with open(os.path.join(self.root, "requirements.txt"), "w") as f:
+            f.write("six==1.17.0\n")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def install(self, *backends):
+        with mock.patch.object(installers, "all_installers", return_value=list(backends)):
+            return install_requirements(lambda cmd, cwd: None, "python", "requirements.txt", self.root,
+                                        lambda message: None, preferred=backends[0].name)
+
+
+class ChooseInstallersTests(InstallerTestCase):
+    def choose(self, preferred="auto", timings=None):
+        stats = InstallerStats(os.path.join(self.root, "timings.json"))
+        for name, seconds in (timings or {}).items():
+            stats.record(name, seconds, packages=1)
+        backends = [FakeInstaller("uv"), FakeInstaller("pip-parallel"), FakeInstaller("pip"),
+                    FakeInstaller("missing", available=False)]
+        with mock.patch.object(installers, "all_installers", return_value=backends):
+            return [i.name for i in choose_installers(preferred, stats=stats)]
+
+    def test_default_order_without_measurements(self):
+        self.assertEqual(self.choose(), ["uv", "pip-parallel", "pip"])
+
+    def test_measured_backends_are_sorted_by_median(self):
+        self.assertEqual(self.choose(timings={"pip": 1.0, "pip-parallel": 3.0}), ["pip", "pip-parallel", "uv"])
+
+    def test_preferred_backend_goes_first(self):
+        self.assertEqual(self.choose("pip", timings={"uv": 0.1}), ["pip", "uv", "pip-parallel"])
+
+    def test_stats_keep_the_latest_measurements_per_package(self):
+        stats = InstallerStats(os.path.join(self.root, "timings.json"))
+        for seconds in range(HISTORY_SIZE + 5):
+            stats.record("pip", seconds * 10, packages=10)
+        history = stats.load()["pip"]
+        self.assertEqual(len(history), HISTORY_SIZE)
+        self.assertEqual(history[0], 5)
+        self.assertEqual(stats.medians(), {"pip": 14.5})
+
+
+class InstallRequirementsTests(InstallerTestCase):
+    def test_failed_backend_falls_back_to_the_next_one(self):
+        broken = FakeInstaller("uv", subprocess.CalledProcessError(1, ["uv"], "error"))
+        pip = FakeInstaller("pip")
+        self.assertEqual(self.install(broken, pip), "pip")
+        self.assertEqual((broken.calls, pip.calls), (1, 1))
+        # Solo se mide el backend que instaló
+        self.assertEqual(list(InstallerStats().load()), ["pip"])
+
+    def test_last_failure_is_raised(self):
+        error = subprocess.CalledProcessError(2, ["pip"], "error")
+        with self.assertRaises(subprocess.CalledProcessError) as ctx:
+            self.install(FakeInstaller("uv", subprocess.CalledProcessError(1, ["uv"])), FakeInstaller("pip", error))
+        self.assertIs(ctx.exception, error)
+
+    def test_timeout_is_not_retried_with_the_next_backend(self):
+        hung = FakeInstaller("uv", CommandTimeout(["uv", "pip", "install"], 1800))
+        pip = FakeInstaller("pip")
+        with self.assertRaises(CommandTimeout):
+            self.install(hung, pip)
+        self.assertEqual(pip.calls, 0)
+
+
+class WheelhouseTimeoutTests(InstallerTestCase):
+    def test_offline_timeout_does_not_fill_the_wheelhouse(self):
+        calls = []
+
+        def run(cmd, cwd):
+            calls.append(cmd)
+            raise CommandTimeout(cmd, 1800)
+
+        wheelhouse = Wheelhouse(os.path.join(self.root, "wheels"))
+        with self.assertRaises(CommandTimeout):
+            wheelhouse.install(run, "python", "requirements.txt", self.root, log=lambda message: None)
+        self.assertEqual(len(calls), 1)
+        self.assertIn("--no-index", calls[0])
+
+    def test_missing_wheels_fill_the_wheelhouse_and_retry_offline(self):
+        calls = []
+
+        def run(cmd, cwd):
+            calls.append(cmd[3])
+            if len(calls) == 1:
+                raise subprocess.CalledProcessError(1, cmd, "No matching distribution found for six")
+
+        wheelhouse = Wheelhouse(os.path.join(self.root, "wheels"))
+        self.assertEqual(wheelhouse.install(run, "python", "requirements.txt", self.root, log=lambda m: None),
+                         "filled")
+        self.assertEqual(calls, ["install", "wheel", "install"])
+
+
+if __name__ == "__main__":
+    unittest.main()
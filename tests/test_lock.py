@@ -0,0 +1,75 @@
+import hashlib
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from scaffolder.lock import (
+    _pins_from_report, format_lock, lock_key, normalize_requirements, read_requirement_lines, write_unhashed,
+)
+
+
+def _item(name, version, **download_info):
+    return {"metadata": {"name": name, "version": version}, "download_info": download_info}
+
+
+class NormalizeRequirementsTests(unittest.TestCase):
+    def test_keeps_first_occurrence_by_normalized_name(self):
+        result = normalize_requirements(["Flask", "flask>=2", "flask_sqlalchemy", "Flask-SQLAlchemy==3.1"])
+        self.assertEqual(result, ["Flask", "flask_sqlalchemy"])
+
+    def test_drops_blank_and_invalid_lines_and_strips_spaces(self):
+        self.assertEqual(normalize_requirements(["", "  ", "# comment", " numpy >= 1.26 "]), ["numpy>= 1.26"])
+
+    def test_extras_and_markers_are_kept(self):
+        self.assertEqual(normalize_requirements(["uvicorn[standard]"]), ["uvicorn[standard]"])
+
+    def test_lock_key_ignores_order_case_and_duplicates(self):
+        self.assertEqual(lock_key(["Flask", "numpy"]), lock_key(["numpy", "flask", "FLASK"]))
+        self.assertNotEqual(lock_key(["flask"]), lock_key(["flask==3.0"]))
+
+
+class PinsFromReportTests(unittest.TestCase):
+    def test_hash_sources(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            wheel = Path(tmp, "local-1.0-py3-none-any.whl")
+            wheel.write_bytes(b"wheel")
+            report = {"install": [
+                _item("Zeta_Pkg", "2.0", archive_info={"hashes": {"sha256": "aa"}}),
+                _item("alpha", "1.0", archive_info={"hash": "sha256=bb"}),
+                _item("local", "1.0", url=wheel.as_uri(), archive_info={}),
+                _item("vcs", "0.1", url="git+https://example.invalid/vcs.git", vcs_info={}),
+            ]}
+            pins = _pins_from_report(report)
+        self.assertEqual(pins, [
+            ("alpha", "1.0", "bb"),
+            ("local", "1.0", hashlib.sha256(b"wheel").hexdigest()),
+            ("vcs", "0.1", None),
+            ("zeta-pkg", "2.0", "aa"),
+        ])
+
+    def test_empty_report(self):
+        self.assertEqual(_pins_from_report({}), [])
+
+    def test_format_lock_drops_all_hashes_when_one_is_missing(self):
+        hashed = format_lock([("a", "1", "aa"), ("b", "2", "bb")], ["a"])
+        self.assertIn("a==1 \\\n    --hash=sha256:aa\n", hashed)
+        partial = format_lock([("a", "1", "aa"), ("b", "2", None)], ["a"])
+        self.assertNotIn("--hash", partial)
+        self.assertTrue(partial.endswith("a==1\nb==2\n"))
+
+
+class RequirementFilesTests(unittest.TestCase):
+    def test_read_lines_joins_continuations_and_skips_comments(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "requirements.lock")
+            Path(path).write_text(format_lock([("a", "1", "aa"), ("b", "2", "bb")], ["a", "b"]))
+            lines = read_requirement_lines(path)
+            self.assertEqual([line.split() for line in lines],
+                             [["a==1", "--hash=sha256:aa"], ["b==2", "--hash=sha256:bb"]])
+            unhashed = write_unhashed(path, os.path.join(tmp, "pins.txt"))
+            self.assertEqual(Path(unhashed).read_text(), "a==1\nb==2\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
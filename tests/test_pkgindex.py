@@ -0,0 +1,76 @@
+import os
+import pathlib
+import tempfile
+import unittest
+
+from scaffolder.pkgindex import PackageIndex, _file_version, _latest_version
+
+NAMES = ["aflask", "django", "f-l-a-s-k", "flake8", "flask", "flask-cors", "flask-sqlalchemy", "flasktools",
+         "fastapi", "pyflask", "requests", "scikit-learn", "sklearn"]
+
+
+class SearchTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.index = PackageIndex(self._tmp.name, seed=["Requests", "my_seed"])
+        self.index._set_names(sorted(NAMES))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_exact_match_then_prefix_substring_and_subsequence(self):
+        self.assertEqual(self.index.search("flask"),
+                         ["flask", "flask-cors", "flask-sqlalchemy", "flasktools",  # prefijo
+                          "aflask", "pyflask",                                         # subcadena
+                          "f-l-a-s-k"])                                                # subsecuencia
+        self.assertEqual(self.index.search("sklrn"), ["scikit-learn", "sklearn"])
+
+    def test_short_queries_only_match_prefixes(self):
+        self.assertEqual(self.index.search("fl"), ["flake8", "flask", "flask-cors", "flask-sqlalchemy",
+                                                   "flasktools"])
+
+    def test_query_is_normalized(self):
+        self.assertEqual(self.index.search("  Flask_SQL")[0], "flask-sqlalchemy")
+
+    def test_empty_query_returns_the_seed(self):
+        self.assertEqual(self.index.search(""), ["Requests", "my_seed"])
+
+    def test_seed_names_are_always_searchable(self):
+        self.assertEqual(self.index.search("my-se"), ["my-seed"])
+
+    def test_incremental_search_matches_a_fresh_one(self):
+        for query in ("fla", "flas", "flask", "flask-s", "fla"):
+            fresh = PackageIndex(self._tmp.name, seed=["Requests", "my_seed"])
+            fresh._set_names(sorted(NAMES))
+            self.assertEqual(self.index.search(query), fresh.search(query), query)
+
+    def test_new_names_reset_the_incremental_base(self):
+        self.index.search("flas")
+        self.index._set_names(sorted(NAMES + ["flash"]))
+        self.assertIn("flash", self.index.search("flash"))
+
+    def test_refresh_and_load_from_a_simple_index(self):
+        page = pathlib.Path(self._tmp.name, "simple.html")
+        page.write_text('<html><body><a href="/simple/zope-interface/">zope.interface</a>\n'
+                        '<a href="/simple/flask/">Flask</a></body></html>')
+        index = PackageIndex(os.path.join(self._tmp.name, "cache"), index_url=page.as_uri())
+        self.assertEqual(index.refresh(detail_names=()), 2)
+        loaded = PackageIndex(index.path).load()
+        self.assertEqual(loaded.search("zope"), ["zope-interface"])
+        self.assertEqual(len(loaded), 2)
+
+
+class VersionTests(unittest.TestCase):
+    def test_file_version(self):
+        self.assertEqual(_file_version("Flask_SQLAlchemy-3.1.1-py3-none-any.whl", "flask-sqlalchemy"), "3.1.1")
+        self.assertEqual(_file_version("scikit-learn-1.5.0.tar.gz", "scikit-learn"), "1.5.0")
+        self.assertIsNone(_file_version("other-1.0.tar.gz", "flask"))
+
+    def test_latest_version_prefers_stable_releases(self):
+        self.assertEqual(_latest_version(["1.9.0", "1.10.0", "2.0.0rc1"]), "1.10.0")
+        self.assertEqual(_latest_version(["2.0.0b1", "2.0.0rc1"]), "2.0.0rc1")
+        self.assertIsNone(_latest_version([]))
+
+
+if __name__ == "__main__":
+    unittest.main()
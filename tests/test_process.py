@@ -0,0 +1,114 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from scaffolder.process import CommandTimeout, is_transient, pid_alive, run_command, with_retries
+
+
+def _failure(output, returncode=1):
+    return subprocess.CalledProcessError(returncode, ["pip", "install"], output)
+
+
+class FlakyRun:
+    """`run(cmd, cwd)` que lanza los errores dados en orden y después devuelve "ok" """
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self, cmd, cwd=None):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+class IsTransientTests(unittest.TestCase):
+    def test_network_errors_are_transient(self):
+        for output in ("ReadTimeoutError: HTTPSConnectionPool(...): Read timed out.",
+                       "Temporary failure in name resolution",
+                       "HTTP error 503 while getting https://files.pythonhosted.org/..."):
+            self.assertTrue(is_transient(_failure(output)), output)
+
+    def test_other_failures_are_not(self):
+        self.assertFalse(is_transient(_failure("No matching distribution found for nope")))
+        self.assertFalse(is_transient(_failure(None)))
+        self.assertFalse(is_transient(OSError("ConnectionError")))
+
+    def test_timeouts_are_not_transient(self):
+        self.assertFalse(is_transient(CommandTimeout(["pip"], 5, "Read timed out")))
+
+
+class WithRetriesTests(unittest.TestCase):
+    def test_transient_errors_are_retried_until_success(self):
+        run = FlakyRun(_failure("Connection reset by peer"), _failure("SSLError"))
+        retries = []
+        wrapped = with_retries(run, attempts=3, backoff=0.01, on_retry=lambda e, n, d: retries.append(n))
+        self.assertEqual(wrapped(["pip"]), "ok")
+        self.assertEqual(run.calls, 3)
+        self.assertEqual(retries, [1, 2])
+
+    def test_gives_up_after_the_last_attempt(self):
+        run = FlakyRun(*[_failure("Connection refused")] * 3)
+        with self.assertRaises(subprocess.CalledProcessError):
+            with_retries(run, attempts=2, backoff=0.01)(["pip"])
+        self.assertEqual(run.calls, 2)
+
+    def test_permanent_errors_and_timeouts_fail_at_once(self):
+        for error in (_failure("No matching distribution"), CommandTimeout(["pip"], 1, "timed out")):
+            run = FlakyRun(error)
+            with self.assertRaises(type(error)):
+                with_retries(run, attempts=5, backoff=0.01)(["pip"])
+            self.assertEqual(run.calls, 1)
+
+    def test_should_stop_interrupts_the_wait(self):
+        run = FlakyRun(_failure("Connection reset"))
+        start = time.monotonic()
+        with self.assertRaises(subprocess.CalledProcessError):
+            with_retries(run, attempts=3, backoff=30, should_stop=lambda: run.calls > 0)(["pip"])
+        self.assertLess(time.monotonic() - start, 5)
+
+
+class RunCommandTests(unittest.TestCase):
+    def test_streams_lines_and_returns_the_exit_code(self):
+        lines = []
+        code = "import sys; print('out'); print('err', file=sys.stderr); sys.exit(3)"
+        returncode, tail, counts = run_command([sys.executable, "-c", code],
+                                               on_line=lambda stream, line: lines.append((stream, line)))
+        self.assertEqual(returncode, 3)
+        self.assertEqual(sorted(lines), [("stderr", "err"), ("stdout", "out")])
+        self.assertEqual(counts, {"stdout": 1, "stderr": 1})
+        self.assertEqual(sorted(tail), ["err", "out"])
+
+    def test_input_chunks_are_written_to_stdin(self):
+        lines = []
+        run_command([sys.executable, "-c", "import sys; print(sys.stdin.read().upper())"],
+                    on_line=lambda stream, line: lines.append(line), input=[b"ab", b"cd"])
+        self.assertEqual(lines, ["ABCD"])
+
+    @unittest.skipIf(os.name == 'nt', "grupos de procesos POSIX")
+    def test_timeout_kills_the_whole_process_tree(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            pid_file = os.path.join(tmp, "child.pid")
+            child = "import time; time.sleep(60)"
+            parent = (f"import subprocess, sys, time; p = subprocess.Popen([sys.executable, '-c', {child!r}]); "
+                      f"open({pid_file!r}, 'w').write(str(p.pid)); print('started', flush=True); time.sleep(60)")
+            start = time.monotonic()
+            with self.assertRaises(CommandTimeout) as ctx:
+                run_command([sys.executable, "-c", parent], timeout=1)
+            self.assertLess(time.monotonic() - start, 10)
+            self.assertEqual(ctx.exception.timeout, 1)
+            self.assertIn("started", ctx.exception.output)
+            with open(pid_file) as f:
+                child_pid = int(f.read())
+            deadline = time.monotonic() + 5
+            while pid_alive(child_pid) and time.monotonic() < deadline:
+                time.sleep(0.05)
+            self.assertFalse(pid_alive(child_pid))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+
+from scaffolder.templates import plan_project_structure
+from scaffolder.writer import write_plan
+
+
+def _installed(*modules):
+    return all(importlib.util.find_spec(module) is not None for module in modules)
+
+
+class GeneratedProjectTestCase(unittest.TestCase):
+    """Genera la plantilla con el perfil y ejecuta código dentro del proyecto con el intérprete actual"""
+    project_type = None
+    profile = None
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self._tmp.name, "demo")
+        write_plan(self.root, plan_project_structure(self.project_type, "demo", profile=self.profile))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def run_code(self, code, **env):
+        environ = {key: value for key, value in os.environ.items()
+                   if key not in ("SECRET_KEY", "DATABASE_URL", "FLASK_DEBUG")}
+        environ.update(env)
+        return subprocess.run([sys.executable, "-c", textwrap.dedent(code)], cwd=self.root, env=environ,
+                              capture_output=True, text=True, timeout=120)
+
+
+@unittest.skipUnless(_installed("flask_sqlalchemy"), "requiere flask_sqlalchemy")
+class FlaskProductionTests(GeneratedProjectTestCase):
+    project_type = "flask_sqlalchemy"
+    profile = "production"
+
+    def test_refuses_to_start_without_secret_key(self):
+        result = self.run_code("""
+            from src.app import create_app
+            try:
+                create_app()
+            except RuntimeError as exc:
+                print("refused:", exc)
+        """)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("refused: SECRET_KEY", result.stdout)
+
+    def test_debug_uses_a_throwaway_key(self):
+        result = self.run_code("""
+            from src.app import create_app
+            print(len(create_app().config["SECRET_KEY"]))
+        """, FLASK_DEBUG="1")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "64")
+
+    def test_health_and_sqlite_pragmas(self):
+        result = self.run_code("""
+            from src.app import create_app
+            from src.extensions import db
+            app = create_app()
+            response = app.test_client().get("/health")
+            print(response.status_code, response.get_json()["status"])
+            with app.app_context():
+                print(db.session.execute(db.text("PRAGMA journal_mode")).scalar())
+                print(db.session.execute(db.text("PRAGMA foreign_keys")).scalar())
+        """, SECRET_KEY="x" * 32, DATABASE_URL="sqlite:///health.db")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.split("\n")[:3], ["200 ok", "wal", "1"])
+        self.assertTrue(os.path.exists(os.path.join(self.root, "instance", "health.db")))
+
+    def test_engine_options_size_the_pool_for_servers_only(self):
+        result = self.run_code("""
+            from src.config import engine_options
+            print(sorted(engine_options("sqlite:///x.db")))
+            print(engine_options("postgresql://db/app")["pool_size"])
+        """, DB_POOL_SIZE="3")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.split("\n")[:2], ["['connect_args', 'pool_pre_ping']", "3"])
+
+
+@unittest.skipUnless(_installed("numpy", "pandas", "sklearn"), "requiere numpy, pandas y scikit-learn")
+class SklearnParallelTests(GeneratedProjectTestCase):
+    project_type = "ml_sklearn"
+    profile = "parallel"
+
+    def test_dataset_is_cached_as_memory_maps(self):
+        code = """
+            from src.data import load_dataset, load_labels
+            X, y = load_dataset()
+            print(type(X).__name__, X.dtype, X.shape, X.flags.writeable, load_labels())
+        """
+        first = self.run_code(code, SYNTHETIC_SAMPLES="200")
+        self.assertEqual(first.returncode, 0, first.stderr)
+        self.assertEqual(first.stdout.strip(), "memmap float32 (200, 40) False None")
+        # Otro tamaño es otra fuente: se crea una segunda entrada en la caché
+        second = self.run_code(code, SYNTHETIC_SAMPLES="100")
+        self.assertIn("(100, 40)", second.stdout)
+        self.assertEqual(len(os.listdir(os.path.join(self.root, "cache", "data"))), 2)
+
+    def test_string_targets_are_stored_as_codes_with_their_labels(self):
+        os.makedirs(os.path.join(self.root, "data"), exist_ok=True)
+        with open(os.path.join(self.root, "data", "dataset.csv"), "w") as f:
+            f.write("a,b,target\n1,2,cat\n3,4,dog\n5,6,cat\n")
+        code = """
+            from src.data import load_dataset, load_labels
+            X, y = load_dataset()
+            print(y.tolist(), load_labels())
+        """
+        for _ in range(2):
+            result = self.run_code(code)
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertEqual(result.stdout.strip(), "[0, 1, 0] ['cat', 'dog']")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from scaffolder.server import MAX_BODY, GenerationService, HTTPError, _read_request, make_handler
+
+
+def _reader(data):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+class ReadRequestTests(unittest.IsolatedAsyncioTestCase):
+    async def test_reads_method_target_and_body(self):
+        body = b'{"name": "svc"}'
+        request = await _read_request(_reader(
+            b"post /projects?wait=1 HTTP/1.1\r\nHost: x\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)))
+        self.assertEqual(request, ("POST", "/projects?wait=1", body))
+
+    async def test_request_without_body(self):
+        self.assertEqual(await _read_request(_reader(b"GET /status HTTP/1.1\r\n\r\n")), ("GET", "/status", b""))
+
+    async def test_closed_connection_returns_none(self):
+        self.assertIsNone(await _read_request(_reader(b"")))
+
+    async def test_invalid_requests_are_rejected(self):
+        cases = [
+            (b"garbage\r\n\r\n", 400),
+            (b"POST /projects HTTP/1.1\r\nContent-Length: abc\r\n\r\n", 400),
+            (b"POST /projects HTTP/1.1\r\nContent-Length: -5\r\n\r\n", 400),
+            (b"POST /projects HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % (MAX_BODY + 1), 413),
+        ]
+        for data, status in cases:
+            with self.subTest(data=data):
+                with self.assertRaises(HTTPError) as ctx:
+                    await _read_request(_reader(data))
+                self.assertEqual(ctx.exception.status, status)
+
+    async def test_truncated_body_is_an_incomplete_read(self):
+        with self.assertRaises(asyncio.IncompleteReadError):
+            await _read_request(_reader(b"POST /projects HTTP/1.1\r\nContent-Length: 10\r\n\r\n{}"))
+
+
+class SubmitTests(unittest.IsolatedAsyncioTestCase):
+    """Sin llamar a start(): no hay workers, así que los pedidos se quedan en la cola"""
+
+    async def asyncSetUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.service = GenerationService(self.root, workers=1, queue_size=2)
+
+    async def asyncTearDown(self):
+        self.service.executor.shutdown()
+        self._tmp.cleanup()
+
+    def assertStatus(self, status, spec):
+        with self.assertRaises(HTTPError) as ctx:
+            self.service.submit(spec)
+        self.assertEqual(ctx.exception.status, status)
+        return ctx.exception
+
+    async def test_full_queue_answers_503_with_retry_after(self):
+        first = self.service.submit({"name": "a"})
+        self.service.submit({"name": "b"})
+        error = self.assertStatus(503, {"name": "c"})
+        self.assertGreaterEqual(int(error.headers["Retry-After"]), 1)
+        self.assertEqual(self.service.counters, {"accepted": 2, "rejected": 1})
+        self.assertEqual(first["state"], "queued")
+        self.assertEqual(first["target_path"], os.path.join(self.root, "a"))
+        self.assertEqual(len(self.service.jobs), 2)
+
+    async def test_invalid_specs_are_rejected_before_queueing(self):
+        self.assertStatus(400, ["not", "an", "object"])
+        self.assertStatus(400, {"type": "fastapi"})
+        self.assertStatus(400, {"name": "a", "type": "nope"})
+        self.assertStatus(400, {"name": "a", "libs": 5})
+        self.assertStatus(400, {"name": "a", "dest": "../outside"})
+        self.assertStatus(400, {"name": "../escape"})
+        os.mkdir(os.path.join(self.root, "taken"))
+        self.assertStatus(409, {"name": "taken"})
+        self.assertEqual(self.service.queue.qsize(), 0)
+
+
+class HandlerTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.service = GenerationService(self._tmp.name, workers=1, queue_size=1)
+        self.server = await asyncio.start_server(make_handler(self.service), "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.service.executor.shutdown()
+        self._tmp.cleanup()
+
+    async def request(self, raw):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(raw)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        head, _, body = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), head.decode("latin-1"), json.loads(body)
+
+    async def test_status_and_errors_are_json(self):
+        status, _, payload = await self.request(b"GET /status HTTP/1.1\r\n\r\n")
+        self.assertEqual((status, payload["queue_capacity"]), (200, 1))
+        status, _, payload = await self.request(b"POST /projects HTTP/1.1\r\nContent-Length: 3\r\n\r\n{x}")
+        self.assertEqual(status, 400)
+        self.assertIn("JSON", payload["error"])
+        status, _, _ = await self.request(b"DELETE /projects HTTP/1.1\r\n\r\n")
+        self.assertEqual(status, 405)
+
+    async def test_accepted_then_full(self):
+        body = b'{"name": "svc"}'
+        request = b"POST /projects HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+        status, head, job = await self.request(request)
+        self.assertEqual(status, 202)
+        self.assertIn(f"Location: /projects/{job['id']}", head)
+        status, head, _ = await self.request(request.replace(b"svc", b"svd"))
+        self.assertEqual(status, 503)
+        self.assertIn("Retry-After:", head)
+
+
+if __name__ == "__main__":
+    unittest.main()
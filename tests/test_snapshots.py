@@ -0,0 +1,146 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from scaffolder.engine import ProjectGenerator, project_options, wait_for_cleanups
+from scaffolder.snapshots import SnapshotCache, snapshot_key
+from scaffolder.templates import REGISTRY, Template
+
+
+def _project(root):
+    Path(root, "src").mkdir(parents=True)
+    Path(root, "src", "main.py").write_text("print('hi')\n")
+    Path(root, ".git").mkdir()
+    Path(root, ".git", "HEAD").write_text("ref: refs/heads/main\n")
+    Path(root, "venv", "bin").mkdir(parents=True)
+    Path(root, "venv", "pyvenv.cfg").write_text(f"command = python -m venv {root}/venv\n")
+    return root
+
+
+class SnapshotCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.project = _project(os.path.join(self.root, "project"))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def cache(self, fmt, max_bytes=1024 * 1024):
+        path = os.path.join(self.root, f"snapshots-{fmt}")
+        os.makedirs(path, exist_ok=True)
+        return SnapshotCache(path, max_bytes=max_bytes, fmt=fmt)
+
+    def restore(self, cache, key):
+        dst = os.path.join(self.root, f"restored-{cache.format}-{key}")
+        os.mkdir(dst)
+        return dst, cache.restore(key, dst)
+
+    def test_round_trip_without_git_or_venv(self):
+        for fmt in ("tree", "archive"):
+            with self.subTest(fmt=fmt):
+                cache = self.cache(fmt)
+                cache.store("k", self.project)
+                self.assertTrue(cache.has("k"))
+                dst, meta = self.restore(cache, "k")
+                self.assertEqual((meta["format"], meta["venv"]), (fmt, False))
+                self.assertEqual(Path(dst, "src", "main.py").read_text(), "print('hi')\n")
+                self.assertFalse(os.path.exists(os.path.join(dst, ".git")))
+                self.assertFalse(os.path.exists(os.path.join(dst, "venv")))
+
+    def test_venv_is_restored_with_its_paths_rewritten(self):
+        for fmt in ("tree", "archive"):
+            with self.subTest(fmt=fmt):
+                cache = self.cache(fmt)
+                cache.store("v", self.project, include_venv=True)
+                dst, meta = self.restore(cache, "v")
+                self.assertTrue(meta["venv"])
+                self.assertEqual(Path(dst, "venv", "pyvenv.cfg").read_text(),
+                                 f"command = python -m venv {dst}/venv\n")
+
+    def test_restore_of_a_missing_key_raises(self):
+        with self.assertRaises(KeyError):
+            self.cache("tree").restore("nope", self.root)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = self.cache("tree")
+        for n, key in enumerate(("old", "used", "new")):
+            cache.store(key, self.project)
+            # mtime del meta.json = último uso
+            os.utime(os.path.join(cache.path, key, "meta.json"), (time.time() - 100 + n, time.time() - 100 + n))
+        self.restore(cache, "old")
+        cache.max_bytes = 2 * cache.entries()[0][1]["bytes"]
+        cache.evict()
+        self.assertEqual([key for key, _, _ in cache.entries()], ["old", "new"])
+
+    def test_hit_rate_counters(self):
+        cache = self.cache("tree")
+        for hit in (True, False, True, True):
+            cache.record(hit)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["hit_rate"]), (3, 1, 0.75))
+        cache.clear()
+        self.assertEqual(cache.stats()["hits"], 0)
+
+
+class SnapshotKeyTests(unittest.TestCase):
+    def options(self, **overrides):
+        return project_options("demo", "/tmp", "python_script", **overrides)
+
+    def test_project_name_does_not_change_the_key(self):
+        key = snapshot_key(self.options(libs=["six"]))
+        self.assertEqual(key, snapshot_key(dict(self.options(libs=["six"]), name="other")))
+
+    def test_spec_changes_change_the_key(self):
+        key = snapshot_key(self.options())
+        self.assertNotEqual(key, snapshot_key(self.options(libs=["six"])))
+        self.assertNotEqual(key, snapshot_key(self.options(extra_files=["LICENSE"])))
+        self.assertNotEqual(key, snapshot_key(self.options(), include_venv=True))
+
+
+class BrokenTemplateTests(unittest.TestCase):
+    """Armar el grafo renderiza el plan para la clave del snapshot: el error tiene que salir de run()"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dest = os.path.join(self._tmp.name, "dest")
+        template = Template(id="broken", label="Broken", inline_files={"src/main.py": "@{nope}\n"})
+        patches = [
+            mock.patch.dict(os.environ, {"SCAFFOLDER_CACHE_DIR": os.path.join(self._tmp.name, "cache")}),
+            mock.patch.dict(REGISTRY._by_id, {"broken": template}),
+            mock.patch.dict(REGISTRY._by_label, {"Broken": template}),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def generate(self, project_type):
+        options = project_options("demo", self.dest, project_type, create_venv=False, init_git=False,
+                                  create_req=False, trace=False)
+        plans = []
+        generator = ProjectGenerator(options, on_plan=plans.append)
+        try:
+            generator.run()
+        finally:
+            wait_for_cleanups()
+        return generator, plans
+
+    def test_unknown_placeholder_fails_inside_run_and_leaves_nothing(self):
+        with self.assertRaises(KeyError):
+            self.generate("broken")
+        self.assertEqual(os.listdir(self.dest), [])
+
+    def test_step_count_is_reported_once_the_graph_is_built(self):
+        generator, plans = self.generate("python_script")
+        self.assertEqual(plans, [len(generator.graph)])
+        self.assertTrue(os.path.isfile(os.path.join(self.dest, "demo", "README.md")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from scaffolder.engine import (
+    STALE_STAGING_SECONDS, ProjectGenerator, _sibling_path, project_options, sweep_leftovers, wait_for_cleanups,
+)
+
+
+def _dead_pid():
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+class SweepLeftoversTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.parent = self._tmp.name
+        self.target = os.path.join(self.parent, "demo")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def folder(self, name, age=0):
+        path = os.path.join(self.parent, name)
+        os.mkdir(path)
+        if age:
+            mtime = time.time() - age
+            os.utime(path, (mtime, mtime))
+        return name
+
+    def sweep(self):
+        sweep_leftovers(self.target)
+        wait_for_cleanups()
+        return sorted(os.listdir(self.parent))
+
+    def test_sibling_path_carries_the_owner_pid(self):
+        name = os.path.basename(_sibling_path(self.target, "staging"))
+        self.assertTrue(name.startswith(f".demo.staging-{os.getpid()}-"))
+
+    def test_old_copies_and_staging_of_dead_processes_are_removed(self):
+        self.folder(".demo.old-1234abcd")
+        self.folder(f".demo.staging-{_dead_pid()}-1234abcd")
+        self.assertEqual(self.sweep(), [])
+
+    def test_staging_of_live_processes_is_kept(self):
+        mine = self.folder(os.path.basename(_sibling_path(self.target, "staging")))
+        self.assertEqual(self.sweep(), [mine])
+
+    def test_legacy_staging_is_removed_only_when_stale(self):
+        fresh = self.folder(".demo.staging-1234abcd")
+        self.folder(".demo.staging-5678abcd", age=STALE_STAGING_SECONDS + 60)
+        self.assertEqual(self.sweep(), [fresh])
+
+    def test_other_projects_and_names_with_glob_characters_are_left_alone(self):
+        self.target = os.path.join(self.parent, "demo[1]")
+        kept = [self.folder(".demo.old-1234abcd"), self.folder("demo[1]"), self.folder(".demo1.old-1234abcd")]
+        self.folder(".demo[1].old-1234abcd")
+        self.assertEqual(self.sweep(), sorted(kept))
+
+    def test_run_sweeps_before_staging(self):
+        self.folder(".demo.old-1234abcd")
+        options = project_options("demo", self.parent, "python_script", create_venv=False, init_git=False,
+                                  create_req=False, trace=False, use_snapshots=False)
+        ProjectGenerator(options).run()
+        wait_for_cleanups()
+        self.assertEqual(sorted(os.listdir(self.parent)), ["demo"])
+
+
+if __name__ == "__main__":
+    unittest.main()
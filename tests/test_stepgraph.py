@@ -0,0 +1,103 @@
+import threading
+import time
+import unittest
+
+from scaffolder.engine import StepGraph
+
+
+class StepGraphTests(unittest.TestCase):
+    def test_runs_steps_after_their_dependencies(self):
+        order = []
+        lock = threading.Lock()
+
+        def step(name):
+            def run():
+                with lock:
+                    order.append(name)
+            return run
+
+        graph = StepGraph()
+        graph.add("a", "A", step("a"))
+        graph.add("b", "B", step("b"), ("a",))
+        graph.add("c", "C", step("c"), ("a",))
+        graph.add("d", "D", step("d"), ("b", "c"))
+        graph.run()
+        self.assertEqual(order[0], "a")
+        self.assertEqual(order[-1], "d")
+        self.assertEqual(set(order), {"a", "b", "c", "d"})
+
+    def test_independent_steps_run_in_parallel(self):
+        barrier = threading.Barrier(2, timeout=5)
+        graph = StepGraph()
+        graph.add("a", "A", barrier.wait)
+        graph.add("b", "B", barrier.wait)
+        # Con pasos en serie la barrera vencería y lanzaría BrokenBarrierError
+        graph.run()
+
+    def test_unknown_dependency_is_rejected(self):
+        graph = StepGraph()
+        with self.assertRaises(ValueError):
+            graph.add("a", "A", lambda: None, ("missing",))
+
+    def test_error_stops_dependents_and_is_reraised(self):
+        ran = []
+        errors = []
+
+        def fail():
+            raise RuntimeError("boom")
+
+        graph = StepGraph()
+        graph.add("a", "A", fail)
+        graph.add("b", "B", lambda: ran.append("b"), ("a",))
+        with self.assertRaisesRegex(RuntimeError, "boom"):
+            graph.run(on_error=errors.append)
+        self.assertEqual(ran, [])
+        self.assertEqual(len(errors), 1)
+        self.assertIn("a", graph.timings)
+        self.assertNotIn("b", graph.timings)
+
+    def test_only_first_error_is_reported(self):
+        errors = []
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fail(message):
+            def run():
+                barrier.wait()
+                raise RuntimeError(message)
+            return run
+
+        graph = StepGraph()
+        graph.add("a", "A", fail("a"))
+        graph.add("b", "B", fail("b"))
+        with self.assertRaises(RuntimeError):
+            graph.run(on_error=errors.append)
+        self.assertEqual(len(errors), 1)
+
+    def test_cycle_is_detected(self):
+        graph = StepGraph()
+        graph.add("a", "A", lambda: None)
+        graph.add("b", "B", lambda: None, ("a",))
+        # add() no permite ciclos; se fuerza uno editando los pasos ya registrados
+        label, func, _ = graph.steps["a"]
+        graph.steps["a"] = (label, func, ("b",))
+        with self.assertRaisesRegex(ValueError, "circulares"):
+            graph.run()
+
+    def test_critical_path_follows_the_slowest_dependency(self):
+        graph = StepGraph()
+        graph.add("files", "Files", lambda: None)
+        graph.add("venv", "Venv", lambda: time.sleep(0.15))
+        graph.add("lock", "Lock", lambda: time.sleep(0.02), ("files",))
+        graph.add("install", "Install", lambda: time.sleep(0.02), ("venv", "lock"))
+        graph.run()
+        path, total = graph.critical_path()
+        self.assertEqual(path, ["venv", "install"])
+        self.assertGreaterEqual(total, 0.17)
+        self.assertIn("Ruta crítica: Venv", graph.report())
+
+    def test_critical_path_of_a_graph_that_did_not_run(self):
+        self.assertEqual(StepGraph().critical_path(), ([], 0.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
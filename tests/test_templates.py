@@ -0,0 +1,176 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from scaffolder.templates import (
+    REGISTRY, Profile, Template, TemplateRegistry, container_context, plan_project_structure,
+)
+
+
+class ContainerContextTests(unittest.TestCase):
+    template = Template(id="web", label="Web", requirements=("flask",), container_requirements=("gunicorn", "Flask"),
+                        container_cmd=("gunicorn", "{name}.wsgi"), container_port=8000)
+
+    def context(self, requirements=True, system="Linux", libc="glibc", machine="x86_64"):
+        with mock.patch("platform.system", return_value=system), \
+                mock.patch("platform.libc_ver", return_value=(libc or "", "")), \
+                mock.patch("platform.machine", return_value=machine):
+            return container_context(self.template, requirements, name="demo")
+
+    def test_lock_is_only_used_for_the_host_platform(self):
+        dependencies = self.context(machine="aarch64")["docker_dependencies"]
+        self.assertIn("ARG TARGETPLATFORM", dependencies)
+        self.assertIn('[ "$TARGETPLATFORM" = "linux/arm64" ]', dependencies)
+        self.assertIn("pip install -r requirements.lock", dependencies)
+        self.assertIn("else pip install -r requirements.txt", dependencies)
+
+    def test_hosts_unlike_the_image_never_use_the_lock(self):
+        for host in ({"system": "Darwin", "libc": None, "machine": "arm64"},
+                     {"system": "Windows", "libc": None, "machine": "AMD64"},
+                     {"libc": None},
+                     {"machine": "riscv64"}):
+            dependencies = self.context(**host)["docker_dependencies"]
+            self.assertNotIn("requirements.lock*", dependencies, host)
+            self.assertIn("pip install -r requirements.txt", dependencies, host)
+
+    def test_image_only_packages_skip_declared_requirements(self):
+        dependencies = self.context()["docker_dependencies"]
+        self.assertTrue(dependencies.endswith("pip install gunicorn"))
+        self.assertIn("pip install gunicorn Flask", self.context(requirements=False)["docker_dependencies"])
+
+    def test_command_and_port(self):
+        context = self.context()
+        self.assertEqual(context["docker_command"], 'CMD ["gunicorn", "demo.wsgi"]')
+        self.assertEqual(context["docker_expose"], "EXPOSE 8000\n")
+
+
+class LoadPluginsTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.registry = TemplateRegistry()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def plugin(self, template_id, manifest, files=None):
+        plugin_dir = Path(self.root, template_id)
+        plugin_dir.mkdir()
+        Path(plugin_dir, "template.json").write_text(json.dumps(manifest))
+        for rel, content in (files or {}).items():
+            path = Path(plugin_dir, "files", rel)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if isinstance(content, bytes):
+                path.write_bytes(content)
+            else:
+                path.write_text(content)
+        return plugin_dir
+
+    def test_plugin_files_are_rendered_or_copied_verbatim(self):
+        logo = b"\x89PNG\r\n\x00@{project_name}"
+        self.plugin("mine", {"label": "Mine", "requirements": ["rich"], "entry": "src/app.py",
+                             "files": {"NOTES.md": "# @{project_name}\n"}, "gitignore": ["*.db"]},
+                    {"src/app.py.tmpl": "print('@{project_name}')\n", "static/logo.png": logo,
+                     "raw/config.txt": "keep @{project_name}\n"})
+        self.registry.load_plugins(self.root)
+        template = self.registry.get("Mine")
+        self.assertIs(template, self.registry.get("mine"))
+        self.assertEqual((template.requirements, template.entry, template.gitignore),
+                         (("rich",), "src/app.py", ("*.db",)))
+        files = template.render_files({"project_name": "demo"})
+        self.assertEqual(files["src/app.py"], "print('demo')\n")
+        self.assertEqual(files["static/logo.png"], logo)
+        self.assertEqual(files["raw/config.txt"], b"keep @{project_name}\n")
+        self.assertEqual(files["NOTES.md"], "# demo\n")
+
+    def test_broken_plugins_are_reported_and_skipped(self):
+        self.plugin("nolabel", {"requirements": []})
+        Path(self.root, "invalid").mkdir()
+        Path(self.root, "invalid", "template.json").write_text("{not json")
+        Path(self.root, "no-manifest").mkdir()
+        self.plugin("good", {"label": "Good"})
+        self.registry.load_plugins(self.root)
+        self.assertEqual([t.id for t in self.registry], ["good"])
+        self.assertEqual(len(self.registry.errors), 2)
+
+    def test_duplicate_ids_or_labels_are_rejected(self):
+        self.registry.register(Template(id="good", label="Good"))
+        self.plugin("good", {"label": "Other"})
+        self.plugin("other", {"label": "Good"})
+        self.registry.load_plugins(self.root)
+        self.assertEqual(len(self.registry), 1)
+        self.assertEqual(len(self.registry.errors), 2)
+
+    def test_missing_directory_is_ignored(self):
+        self.registry.load_plugins(os.path.join(self.root, "missing"))
+        self.assertEqual((len(self.registry), self.registry.errors), (0, []))
+
+
+class WithProfileTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self._tmp.name, "base")
+        self.overlay_dir = Path(self._tmp.name, "overlay")
+        for folder, files in ((self.base_dir, {"src/main.py": "base", "src/util.py": "util"}),
+                              (self.overlay_dir, {"src/main.py": "fast", "gunicorn.conf.py": "conf"})):
+            for rel, content in files.items():
+                Path(folder, rel).parent.mkdir(parents=True, exist_ok=True)
+                Path(folder, rel).write_text(content)
+        self.template = Template(
+            id="web", label="Web", requirements=("flask",), run="flask run", source_dir=str(self.base_dir),
+            inline_files={"a.txt": "base a", "b.txt": "base b"}, container_cmd=("python", "src/main.py"),
+            container_port=5000, gitignore=("*.db",),
+            profiles=(Profile(id="fast", label="Rápido", requirements=("gunicorn",), source_dir=str(self.overlay_dir),
+                              inline_files={"b.txt": "fast b"}, entry="wsgi.py", container_cmd=("gunicorn", "wsgi"),
+                              container_port=8000, gitignore=("cache/",)),
+                      Profile(id="plain", label="Plain")),
+        )
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_profile_fields_extend_or_replace_the_template(self):
+        fast = self.template.with_profile("fast")
+        self.assertEqual(fast.profile, "fast")
+        self.assertEqual(fast.requirements, ("gunicorn", "flask"))
+        self.assertEqual(fast.entry, "wsgi.py")
+        # Un entry propio sin run: el comando se arma con el nuevo entry
+        self.assertEqual(fast.run_command, "python wsgi.py")
+        self.assertEqual((fast.container_cmd, fast.container_port), (("gunicorn", "wsgi"), 8000))
+        self.assertEqual(fast.gitignore, ("*.db", "cache/"))
+        self.assertEqual(fast.profiles, ())
+
+    def test_profile_files_overlay_the_template_files(self):
+        files = self.template.with_profile("fast").render_files({})
+        self.assertEqual(files["src/main.py"], b"fast")
+        self.assertEqual(files["src/util.py"], b"util")
+        self.assertEqual(files["gunicorn.conf.py"], b"conf")
+        self.assertEqual((files["a.txt"], files["b.txt"]), ("base a", "fast b"))
+        # La plantilla base no cambia
+        self.assertEqual(self.template.render_files({})["src/main.py"], b"base")
+
+    def test_empty_profile_keeps_the_template_fields(self):
+        plain = self.template.with_profile("plain")
+        self.assertEqual((plain.requirements, plain.run_command, plain.container_cmd, plain.container_port),
+                         (("flask",), "flask run", ("python", "src/main.py"), 5000))
+
+    def test_lookup_by_id_or_label_is_cached(self):
+        self.assertIs(self.template.with_profile(None), self.template)
+        self.assertIs(self.template.with_profile("fast"), self.template.with_profile("fast"))
+        self.assertEqual(self.template.get_profile("Rápido").id, "fast")
+        with self.assertRaises(KeyError):
+            self.template.with_profile("nope")
+
+    def test_builtin_profiles_plan_their_files(self):
+        for template in REGISTRY:
+            for profile in template.profiles:
+                with self.subTest(template=template.id, profile=profile.id):
+                    plan = plan_project_structure(template.id, "demo", profile=profile.id)
+                    self.assertIn(template.with_profile(profile.id).entry, plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from scaffolder.installers import outdated_requirements
+from scaffolder.venvpool import VenvPool, clone_venv, installed_distributions, relocate_venv, venv_python
+
+
+def _fake_venv(path):
+    """Estructura mínima con las rutas absolutas que escribe `python -m venv`"""
+    bin_dir = Path(path, "Scripts" if os.name == 'nt' else "bin")
+    bin_dir.mkdir(parents=True)
+    Path(path, "lib", "site-packages").mkdir(parents=True)
+    Path(path, "pyvenv.cfg").write_text(f"home = /usr/bin\ncommand = python -m venv {path}\n")
+    Path(bin_dir, "activate").write_text(f'VIRTUAL_ENV="{path}"\n')
+    Path(bin_dir, "tool").write_text(f"#!{path}/bin/python\nprint('tool')\n")
+    os.chmod(Path(bin_dir, "tool"), 0o755)
+    Path(path, "lib", "site-packages", "module.py").write_text(f"# mentions {path} but is not rewritten\n")
+    return bin_dir
+
+
+class CloneVenvTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self._tmp.name, "pool", "venv")
+        self.bin_dir = _fake_venv(self.src)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_paths_are_rewritten_only_in_launchers_and_config(self):
+        dst = os.path.join(self._tmp.name, "project", "venv")
+        clone_venv(self.src, dst)
+        bin_name = self.bin_dir.name
+        self.assertIn(f"command = python -m venv {dst}", Path(dst, "pyvenv.cfg").read_text())
+        self.assertEqual(Path(dst, bin_name, "activate").read_text(), f'VIRTUAL_ENV="{dst}"\n')
+        self.assertTrue(Path(dst, bin_name, "tool").read_text().startswith(f"#!{dst}/bin/python\n"))
+        self.assertIn(self.src, Path(dst, "lib", "site-packages", "module.py").read_text())
+        # El original no cambia
+        self.assertEqual(Path(self.bin_dir, "activate").read_text(), f'VIRTUAL_ENV="{self.src}"\n')
+
+    def test_rewritten_launchers_keep_their_mode(self):
+        dst = os.path.join(self._tmp.name, "project", "venv")
+        clone_venv(self.src, dst)
+        if os.name != 'nt':
+            self.assertTrue(os.access(Path(dst, self.bin_dir.name, "tool"), os.X_OK))
+
+    def test_prefix_is_used_when_the_clone_will_be_moved(self):
+        staging = os.path.join(self._tmp.name, ".project.staging", "venv")
+        final = os.path.join(self._tmp.name, "project", "venv")
+        clone_venv(self.src, staging, prefix=final)
+        self.assertEqual(Path(staging, self.bin_dir.name, "activate").read_text(), f'VIRTUAL_ENV="{final}"\n')
+
+    @unittest.skipIf(os.name == 'nt', "enlaces simbólicos")
+    def test_symlinks_are_recreated(self):
+        os.symlink("tool", Path(self.bin_dir, "tool-link"))
+        dst = os.path.join(self._tmp.name, "project", "venv")
+        clone_venv(self.src, dst)
+        self.assertEqual(os.readlink(Path(dst, "bin", "tool-link")), "tool")
+
+    def test_relocate_in_place_after_a_move(self):
+        moved = os.path.join(self._tmp.name, "moved")
+        os.rename(self.src, moved)
+        relocate_venv(moved, self.src)
+        self.assertEqual(Path(moved, self.bin_dir.name, "activate").read_text(), f'VIRTUAL_ENV="{moved}"\n')
+        self.assertIn(f"venv {moved}", Path(moved, "pyvenv.cfg").read_text())
+
+
+class PoolSyncTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.venv = os.path.join(self._tmp.name, "venv")
+        _fake_venv(self.venv)
+        site_packages = Path(self.venv, "lib", "python3.11", "site-packages")
+        site_packages.mkdir(parents=True)
+        for entry in ("six-1.15.0.dist-info", "Flask_SQLAlchemy-3.1.1.dist-info", "legacy.egg-info"):
+            Path(site_packages, entry).mkdir()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def lock(self, text):
+        path = os.path.join(self._tmp.name, "requirements.lock")
+        Path(path).write_text(text)
+        return path
+
+    @unittest.skipIf(os.name == 'nt', "site-packages de Windows")
+    def test_installed_distributions_reads_versions(self):
+        self.assertEqual(installed_distributions(self.venv),
+                         {"six": "1.15.0", "flask-sqlalchemy": "3.1.1", "legacy": ""})
+
+    def test_outdated_requirements_compares_pins(self):
+        installed = {"six": "1.15.0", "flask-sqlalchemy": "3.1.1"}
+        lock = self.lock("# header\nsix==1.17.0 \\\n    --hash=sha256:abc\nflask-sqlalchemy==3.1.1\nrequests==2.32.3\n")
+        self.assertEqual([line.split()[0] for line in outdated_requirements(lock, installed)],
+                         ["six==1.17.0", "requests==2.32.3"])
+        self.assertEqual(outdated_requirements(self.lock("six\nflask-sqlalchemy>=3\n"), installed), [])
+
+    @unittest.skipIf(os.name == 'nt', "el pool no se usa en Windows")
+    def test_store_replaces_an_existing_entry_only_when_asked(self):
+        pool = VenvPool(os.path.join(self._tmp.name, "pool"), max_entries=5)
+        os.makedirs(pool.path)
+        pool.store("key", self.venv)
+        # Como pip, se reemplaza el archivo en lugar de editarlo: el pool comparte los inodos
+        module = Path(self.venv, "lib", "site-packages", "module.py")
+        module.unlink()
+        module.write_text("# updated\n")
+        pool.store("key", self.venv)
+        entry = os.path.join(pool.path, "key", "lib", "site-packages", "module.py")
+        self.assertNotEqual(Path(entry).read_text(), "# updated\n")
+        pool.store("key", self.venv, replace=True)
+        self.assertEqual(Path(entry).read_text(), "# updated\n")
+        self.assertTrue(pool.has("key"))
+        self.assertEqual(os.listdir(pool.path), ["key"])
+
+
+@unittest.skipIf(os.name == 'nt', "los lanzadores .exe de Windows no se pueden reubicar")
+class RealVenvTests(unittest.TestCase):
+    def test_cloned_venv_runs_with_its_own_prefix(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, "base")
+            subprocess.run([sys.executable, "-m", "venv", "--without-pip", src], check=True)
+            dst = os.path.join(tmp, "clone")
+            clone_venv(src, dst)
+            result = subprocess.run([venv_python(dst), "-c", "import sys; print(sys.prefix)"],
+                                    capture_output=True, text=True, check=True)
+            self.assertEqual(os.path.realpath(result.stdout.strip()), os.path.realpath(dst))
+
+
+if __name__ == "__main__":
+    unittest.main()
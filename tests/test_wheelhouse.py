@@ -0,0 +1,59 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from scaffolder.wheelhouse import Wheelhouse
+
+
+class WheelhouseTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.wheelhouse = Wheelhouse(self._tmp.name, max_bytes=250)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def wheel(self, name, size, age):
+        path = os.path.join(self.wheelhouse.path, name)
+        Path(path).write_bytes(b"x" * size)
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def names(self):
+        return sorted(os.path.basename(path) for path, _, _ in self.wheelhouse.wheels())
+
+    def test_least_recently_used_wheels_are_evicted_first(self):
+        self.wheel("old-1.0-py3-none-any.whl", 100, age=300)
+        self.wheel("mid-1.0-py3-none-any.whl", 100, age=200)
+        self.wheel("new-1.0-py3-none-any.whl", 100, age=100)
+        Path(self.wheelhouse.path, "notes.txt").write_text("not a wheel" * 100)
+        self.assertEqual(self.wheelhouse.evict(), 1)
+        self.assertEqual(self.names(), ["mid-1.0-py3-none-any.whl", "new-1.0-py3-none-any.whl"])
+        self.assertTrue(os.path.exists(os.path.join(self.wheelhouse.path, "notes.txt")))
+
+    def test_nothing_is_evicted_under_the_limit(self):
+        self.wheel("a-1.0-py3-none-any.whl", 100, age=10)
+        self.wheel("b-1.0-py3-none-any.whl", 150, age=20)
+        self.assertEqual(self.wheelhouse.evict(), 0)
+        self.assertEqual(self.wheelhouse.stats()["wheels"], 2)
+        self.assertEqual(self.wheelhouse.stats()["bytes"], 250)
+
+    def test_installed_wheels_count_as_recently_used(self):
+        used = self.wheel("used-1.0-py3-none-any.whl", 100, age=300)
+        self.wheel("idle-1.0-py3-none-any.whl", 100, age=200)
+        self.wheel("new-1.0-py3-none-any.whl", 100, age=100)
+        report = os.path.join(self._tmp.name, "report.json")
+        with open(report, "w") as f:
+            json.dump({"install": [{"download_info": {"url": Path(used).as_uri()}},
+                                   {"download_info": {"url": "https://files.example/other.whl"}}]}, f)
+        self.wheelhouse._touch_used(report)
+        self.wheelhouse.evict()
+        self.assertEqual(self.names(), ["new-1.0-py3-none-any.whl", "used-1.0-py3-none-any.whl"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+
+from scaffolder.writer import FilePlan, encode_content, plan_hashes, update_plan, write_plan
+
+
+def _plan(**files):
+    plan = FilePlan()
+    for rel, content in files.items():
+        plan.add_file(rel.replace("__", "/"), content)
+    return plan
+
+
+class UpdatePlanTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.previous = update_plan(self.root, _plan(a="a1\n", src__b="b1\n"))["hashes"]
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def read(self, rel):
+        with open(os.path.join(self.root, *rel.split("/"))) as f:
+            return f.read()
+
+    def edit(self, rel, text):
+        with open(os.path.join(self.root, *rel.split("/")), "a") as f:
+            f.write(text)
+
+    def test_first_run_adds_every_file(self):
+        self.assertEqual(self.read("src/b"), "b1\n")
+        self.assertEqual(self.previous, plan_hashes(_plan(a="a1\n", src__b="b1\n")))
+
+    def test_unchanged_template_writes_nothing(self):
+        result = update_plan(self.root, _plan(a="a1\n", src__b="b1\n"), self.previous)
+        self.assertEqual((result["added"], result["changed"], result["conflicts"]), ([], [], []))
+        self.assertEqual(result["unchanged"], 2)
+        self.assertEqual(result["bytes"], 0)
+
+    def test_template_change_replaces_untouched_file(self):
+        result = update_plan(self.root, _plan(a="a2\n", src__b="b1\n", c="c1\n"), self.previous)
+        self.assertEqual(result["changed"], ["a"])
+        self.assertEqual(result["added"], ["c"])
+        self.assertEqual(self.read("a"), "a2\n")
+
+    def test_hand_edit_is_kept_silently_when_template_did_not_change(self):
+        self.edit("a", "mine\n")
+        result = update_plan(self.root, _plan(a="a1\n", src__b="b1\n"), self.previous)
+        self.assertEqual(result["conflicts"], [])
+        self.assertEqual(result["unchanged"], 2)
+        self.assertEqual(self.read("a"), "a1\nmine\n")
+        self.assertEqual(result["hashes"]["a"], self.previous["a"])
+
+    def test_conflict_when_template_and_disk_both_changed(self):
+        self.edit("a", "mine\n")
+        result = update_plan(self.root, _plan(a="a2\n", src__b="b1\n"), self.previous)
+        self.assertEqual(result["conflicts"], ["a"])
+        self.assertEqual(self.read("a"), "a1\nmine\n")
+        # Se conserva el hash anterior para que el conflicto se vuelva a informar
+        self.assertEqual(result["hashes"]["a"], self.previous["a"])
+
+    def test_force_replaces_hand_edits(self):
+        self.edit("a", "mine\n")
+        result = update_plan(self.root, _plan(a="a2\n", src__b="b1\n"), self.previous, force=True)
+        self.assertEqual(result["changed"], ["a"])
+        self.assertEqual(self.read("a"), "a2\n")
+
+    def test_without_previous_hashes_any_difference_is_a_conflict(self):
+        result = update_plan(self.root, _plan(a="a2\n", src__b="b1\n"))
+        self.assertEqual(result["conflicts"], ["a"])
+        self.assertNotIn("a", result["hashes"])
+
+
+class WritePlanTests(unittest.TestCase):
+    def test_bytes_are_written_verbatim(self):
+        with tempfile.TemporaryDirectory() as root:
+            payload = b"\x89PNG\r\n\x00\xff"
+            write_plan(root, _plan(assets__logo=payload))
+            with open(os.path.join(root, "assets", "logo"), "rb") as f:
+                self.assertEqual(f.read(), payload)
+            self.assertEqual(encode_content(payload), payload)
+
+    def test_parallel_write_creates_nested_dirs(self):
+        with tempfile.TemporaryDirectory() as root:
+            plan = FilePlan()
+            for i in range(100):
+                plan.add_file(f"pkg{i % 7}/sub/f{i}.txt", f"{i}\n")
+            files, _ = write_plan(root, plan, workers=4)
+            self.assertEqual(files, 100)
+            with open(os.path.join(root, "pkg3", "sub", "f10.txt")) as f:
+                self.assertEqual(f.read(), "10\n")
+
+
+if __name__ == "__main__":
+    unittest.main()